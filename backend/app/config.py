@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    valor = os.getenv(nome)
+    return int(valor) if valor else padrao
+
+
+# Formato da base final: "auto" usa o Feather quando existir e estiver atualizado,
+# "csv" força o CSV e "feather" exige o Feather
+FORMATO_DADOS = os.getenv("IA_FUTEBOL_FORMATO_DADOS", "auto")
+
+# Modelo servido pela API: nome do artefato em app/models (sem .pkl)
+MODELO = os.getenv("IA_FUTEBOL_MODELO", "modelo_basico")
+
+# Endpoints /admin/modelos: só habilitados com um token (cabeçalho X-Admin-Token)
+ADMIN_TOKEN = os.getenv("IA_FUTEBOL_ADMIN_TOKEN", "")
+
+# Recarga automática dos .pkl alterados em app/models: intervalo em segundos (0 = desligada)
+MODELOS_OBSERVAR_S = _env_int("IA_FUTEBOL_MODELOS_OBSERVAR_S", 0)
+
+# Experimentos no /prever: modelo sombra (previsto em segundo plano) e A/B
+# (porcentagem das requisições respondida pelo candidato), com log JSONL
+MODELO_SOMBRA = os.getenv("IA_FUTEBOL_MODELO_SOMBRA", "")
+AB_MODELO = os.getenv("IA_FUTEBOL_AB_MODELO", "")
+AB_PERCENTUAL = _env_int("IA_FUTEBOL_AB_PERCENTUAL", 0)
+EXPERIMENTO_LOG = Path(os.getenv(
+    "IA_FUTEBOL_EXPERIMENTO_LOG",
+    Path(__file__).resolve().parents[2] / "logs" / "experimentos.jsonl",
+))
+EXPERIMENTO_FILA = _env_int("IA_FUTEBOL_EXPERIMENTO_FILA", 10_000)
+
+# Aquecimento (carga de dados e modelo) na subida da API
+AQUECIMENTO = os.getenv("IA_FUTEBOL_AQUECIMENTO", "1") != "0"
+
+# Previsão em lote (/prever/lote)
+LOTE_TAMANHO_MAX = _env_int("IA_FUTEBOL_LOTE_MAX", 50_000)
+LOTE_STREAMING_A_PARTIR = _env_int("IA_FUTEBOL_LOTE_STREAMING", 5_000)
+LOTE_BLOCO = _env_int("IA_FUTEBOL_LOTE_BLOCO", 2_000)
+
+# Cache de previsões do /prever (por modelo + features): itens e validade em segundos (0 itens = desligado)
+PREVISAO_CACHE_MAX = _env_int("IA_FUTEBOL_PREVISAO_CACHE", 10_000)
+PREVISAO_CACHE_TTL_S = _env_int("IA_FUTEBOL_PREVISAO_CACHE_TTL", 3_600)
+
+# Simulação de temporada: máximo de simulações por requisição, simulações por bloco
+# (cada bloco tem semente própria e é a unidade de divisão entre processos), processos
+# padrão e máximo (tamanho do pool de processos compartilhado pelas simulações)
+SIMULACAO_MAX = _env_int("IA_FUTEBOL_SIMULACAO_MAX", 5_000_000)
+SIMULACAO_BLOCO = _env_int("IA_FUTEBOL_SIMULACAO_BLOCO", 50_000)
+SIMULACAO_PROCESSOS_MAX = _env_int("IA_FUTEBOL_SIMULACAO_PROCESSOS_MAX", os.cpu_count() or 1)
+SIMULACAO_PROCESSOS = min(_env_int("IA_FUTEBOL_SIMULACAO_PROCESSOS", 1), SIMULACAO_PROCESSOS_MAX)
+
+# Cache de consultas de confronto direto (/confronto)
+CONFRONTO_CACHE_MAX = _env_int("IA_FUTEBOL_CONFRONTO_CACHE", 4_096)
+
+# Features dinâmicas (forma recente e médias móveis de gols): últimas N partidas
+FEATURES_JANELA = _env_int("IA_FUTEBOL_FEATURES_JANELA", 5)
+
+# Executor do trabalho de CPU das rotas: "thread" ou "processo", e número de workers
+EXECUTOR = os.getenv("IA_FUTEBOL_EXECUTOR", "thread")
+EXECUTOR_WORKERS = _env_int("IA_FUTEBOL_EXECUTOR_WORKERS", os.cpu_count() or 1)
+
+# Requisições simultâneas por grupo de endpoints e tamanho máximo da fila de espera de cada grupo
+LIMITES_CONCORRENCIA = {
+    "previsao": _env_int("IA_FUTEBOL_LIMITE_PREVISAO", 64),
+    "consultas": _env_int("IA_FUTEBOL_LIMITE_CONSULTAS", 16),
+    "simulacao": _env_int("IA_FUTEBOL_LIMITE_SIMULACAO", 2),
+}
+FILA_MAX = _env_int("IA_FUTEBOL_FILA_MAX", 256)
+
+# Perfil de CPU (desligado por padrão): IA_FUTEBOL_PERFIL=1 instala o middleware que roda cProfile
+# em 1 a cada PERFIL_AMOSTRA requisições (0 = só com o cabeçalho X-Perfil: 1)
+PERFIL = os.getenv("IA_FUTEBOL_PERFIL", "0") == "1"
+PERFIL_AMOSTRA = _env_int("IA_FUTEBOL_PERFIL_AMOSTRA", 0)
+PERFIL_DIR = Path(os.getenv(
+    "IA_FUTEBOL_PERFIL_DIR",
+    Path(__file__).resolve().parents[2] / "logs" / "perfis",
+))
+# duração máxima de uma sessão de amostragem do /debug/profile, em segundos
+PERFIL_DURACAO_MAX = _env_int("IA_FUTEBOL_PERFIL_DURACAO_MAX", 300)
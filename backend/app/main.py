@@ -1,48 +1,425 @@
-from fastapi import FastAPI, HTTPException
-from app.models.partida_model import PartidaEntrada
-from app.services.predict_service import prever_partida
-from app.services.times_service import listar_times, comparar_times, perfil_time
+import hmac
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Literal, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.config import (
+    ADMIN_TOKEN,
+    AQUECIMENTO,
+    LOTE_BLOCO,
+    LOTE_STREAMING_A_PARTIR,
+    LOTE_TAMANHO_MAX,
+    MODELOS_OBSERVAR_S,
+    PERFIL,
+    PERFIL_AMOSTRA,
+    PERFIL_DURACAO_MAX,
+)
+from app.services import aquecimento
+from app.models.admin_model import ExperimentoConfig
+from app.models.partida_model import (
+    PartidaEntrada,
+    PartidaLoteEntrada,
+    PlacarLoteResposta,
+    PlacarResposta,
+    PrevisaoLoteResposta,
+    PrevisaoResposta,
+)
+from app.models.simulacao_model import SimulacaoEntrada, SimulacaoResposta
+from app.models.times_model import ComparacaoResposta, ConfrontoResposta, PerfilTimeResposta, TimesResposta
+from app.services.experimentos import experimentos
+from app.services.gols_service import MAX_GOLS, prever_placar, prever_placares_lote
+from app.services.predict_service import (
+    EntradaIncompleta,
+    cache_previsoes,
+    obter_motor,
+    prever_lote,
+    prever_partida_detalhada,
+    validar_entradas,
+)
+from app.services.registro_modelos import registro
+from app.services.simulacao_service import encerrar_pool, simular_temporada
+from app.services.times_service import (
+    comparar_times,
+    confronto,
+    listar_times,
+    perfil_time,
+    resolver_temporadas,
+)
+from app.services import gols_service, times_service
+from app.utils import concorrencia, data_loader
+from app.utils.concorrencia import executar, executar_em_thread
+from app.utils.metricas import RotaInstrumentada, coletor_lru, registro_metricas
+from app.utils.perfilador import MiddlewarePerfil, sessao
+from app.utils.resposta_json import RespostaJSON, dumps_json
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # o worker só começa a aceitar requisições depois do aquecimento
+    if AQUECIMENTO:
+        aquecimento.aquecer()
+    # executor criado depois do aquecimento: com processos, os workers herdam os dados
+    concorrencia.obter_executor()
+    if MODELOS_OBSERVAR_S > 0:
+        registro.iniciar_observador(MODELOS_OBSERVAR_S)
+    experimentos.configurar_pelo_ambiente()
+    yield
+    registro.parar_observador()
+    experimentos.parar()
+    concorrencia.encerrar_executor()
+    encerrar_pool()
 
 app = FastAPI(
     title="IA Futebol Brasil",
     description="API de previsão de resultados do Brasileirão baseada em dados estatísticos.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
+# todas as rotas declaradas abaixo entram nas métricas do /metrics
+app.router.route_class = RotaInstrumentada
+# perfil por requisição só quando pedido: desligado, o middleware nem entra na pilha
+if PERFIL:
+    app.add_middleware(MiddlewarePerfil)
+
+def _coletar_caches_e_filas():
+    estatisticas = cache_previsoes.estatisticas()
+    for chave in ("acertos", "falhas", "remocoes", "expirados"):
+        yield (f"ia_futebol_cache_previsoes_{chave}_total", "counter", f"Cache do /prever: {chave}.", {},
+               estatisticas[chave])
+    yield ("ia_futebol_cache_previsoes_itens", "gauge", "Cache do /prever: itens.", {}, estatisticas["itens"])
+    for grupo, situacao in concorrencia.situacao()["grupos"].items():
+        rotulos = {"grupo": grupo}
+        yield ("ia_futebol_fila", "gauge", "Requisições esperando vaga no grupo.", rotulos, situacao["na_fila"])
+        yield ("ia_futebol_em_execucao", "gauge", "Requisições em execução no grupo.", rotulos, situacao["em_execucao"])
+        yield ("ia_futebol_rejeitadas_total", "counter", "Requisições rejeitadas com 503 (fila cheia).", rotulos,
+               situacao["rejeitadas"])
+
+registro_metricas.coletor(coletor_lru([data_loader, times_service, gols_service]))
+registro_metricas.coletor(_coletar_caches_e_filas)
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "API IA Futebol Brasil - Online"}
 
-@app.post("/prever")
-def prever(entrada: PartidaEntrada):
-    resultado = prever_partida(entrada.dict())
-    return {"probabilidades": resultado}
+@app.get("/health/ready")
+async def health_ready():
+    """
+    Indica se o worker já carregou dados e modelo (200) ou não (503),
+    com o tempo de cada etapa do aquecimento.
+    """
+    status = 200 if aquecimento.estado["pronto"] else 503
+    return JSONResponse(status_code=status, content=aquecimento.estado)
 
-@app.get("/times")
-def get_times():
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Métricas no formato texto do Prometheus: latência por rota e por fase,
+    etapas internas, acertos dos caches e filas de concorrência.
+    """
+    return PlainTextResponse(registro_metricas.exportar(), media_type="text/plain; version=0.0.4")
+
+@app.post("/prever", response_model=PrevisaoResposta, response_model_exclude_none=True)
+async def prever(entrada: PartidaEntrada, x_cliente_id: Optional[str] = Header(None)):
+    """
+    Probabilidades de cada resultado. Com time_mandante e time_visitante,
+    a resposta traz também as features dinâmicas dos times antes da data.
+    Com A/B ativo, informa qual modelo respondeu (estável por X-Cliente-Id).
+    """
+    dados = entrada.dict()
+    # fora do event loop: sem aquecimento, a primeira chamada carrega o modelo
+    nome_modelo, motor = await executar_em_thread(experimentos.escolher_modelo, x_cliente_id)
+    try:
+        resultado, features, latencia_us = await executar("previsao", prever_partida_detalhada, dados, motor)
+    except EntradaIncompleta as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    experimentos.registrar(dados, nome_modelo, resultado, latencia_us)
+
+    resposta = {"probabilidades": resultado}
+    if features:
+        resposta["features"] = features
+    if experimentos.ab_modelo:
+        resposta["modelo"] = nome_modelo
+    return resposta
+
+async def _json_lote_em_blocos(lista_dados: List[dict], motor) -> AsyncIterator[bytes]:
+    # escreve o mesmo JSON da resposta normal, bloco a bloco; cada bloco é
+    # calculado no executor, sem segurar o event loop
+    yield b'{"classes":' + dumps_json(list(motor.classes)) + b',"probabilidades":['
+    primeiro = True
+    for inicio in range(0, len(lista_dados), LOTE_BLOCO):
+        probs = await executar("previsao", prever_lote, lista_dados[inicio:inicio + LOTE_BLOCO], motor)
+        if not len(probs):
+            continue
+        linhas = dumps_json(probs)[1:-1]
+        yield linhas if primeiro else b"," + linhas
+        primeiro = False
+    yield b"]}"
+
+@app.post("/prever/lote", response_model=PrevisaoLoteResposta)
+async def prever_em_lote(entrada: PartidaLoteEntrada):
+    """
+    Prevê várias partidas de uma vez. As probabilidades voltam como uma matriz
+    (uma linha por partida, colunas na ordem de "classes").
+    Lotes grandes são respondidos em streaming.
+    """
+    total = len(entrada.partidas)
+    if total > LOTE_TAMANHO_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lote com {total} partidas excede o máximo de {LOTE_TAMANHO_MAX}.",
+        )
+
+    lista_dados = [p.dict() for p in entrada.partidas]
+    # um único motor por requisição: classes e probabilidades sempre do mesmo modelo
+    motor = await executar_em_thread(obter_motor)
+    # validado antes: no streaming o status já foi enviado quando o bloco falhar
+    try:
+        validar_entradas(lista_dados, motor)
+    except EntradaIncompleta as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if total >= LOTE_STREAMING_A_PARTIR:
+        return StreamingResponse(_json_lote_em_blocos(lista_dados, motor), media_type="application/json")
+
+    try:
+        probs = await executar("previsao", prever_lote, lista_dados, motor)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # matriz serializada direto do array (o response_model fica só na documentação)
+    return RespostaJSON({"classes": list(motor.classes), "probabilidades": probs})
+
+@app.post("/prever/placar", response_model=PlacarResposta)
+async def prever_placar_partida(entrada: PartidaEntrada, max_gols: int = Query(6, ge=0, le=MAX_GOLS)):
+    """
+    Modelo de gols (Poisson + Dixon-Coles): gols esperados de cada time,
+    probabilidades de resultado, placar mais provável e a matriz de placares
+    até max_gols (linhas: gols do mandante; colunas: gols do visitante).
+    """
+    try:
+        return await executar("previsao", prever_placar, entrada.dict(), max_gols)
+    except EntradaIncompleta as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.post("/prever/placar/lote", response_model=PlacarLoteResposta)
+async def prever_placar_em_lote(entrada: PartidaLoteEntrada, max_gols: int = Query(6, ge=0, le=MAX_GOLS)):
+    """
+    Gols esperados e matrizes de placares de várias partidas, calculados
+    numa única operação (uma matriz por partida, na ordem da entrada).
+    """
+    total = len(entrada.partidas)
+    if total > LOTE_TAMANHO_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lote com {total} partidas excede o máximo de {LOTE_TAMANHO_MAX}.",
+        )
+    try:
+        lambdas, placares = await executar("previsao", prever_placares_lote, [p.dict() for p in entrada.partidas])
+    except EntradaIncompleta as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return RespostaJSON({
+        "gols_esperados": lambdas,
+        "placares": placares[:, :max_gols + 1, :max_gols + 1],
+    })
+
+@app.post("/simular-temporada", response_model=SimulacaoResposta)
+async def simular(entrada: SimulacaoEntrada):
+    """
+    Simula o restante da temporada (Monte Carlo) a partir da tabela até
+    ate_rodada: pontos esperados e probabilidades de título, G6, Z4 e de
+    cada posição final. Com a mesma semente o resultado se repete.
+    """
+    motor = await executar_em_thread(obter_motor)
+    try:
+        return await executar(
+            "simulacao", simular_temporada,
+            entrada.ano, entrada.ate_rodada, entrada.simulacoes, entrada.semente, entrada.processos,
+            entrada.placares, motor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/times", response_model=TimesResposta)
+async def get_times():
     """
     Retorna a lista de todos os times presentes na base do Brasileirão.
     """
-    return {"times": listar_times()}
+    return {"times": await executar("consultas", listar_times)}
+
+def _filtro_temporadas(temporadas: Optional[List[int]], ultimas_temporadas: Optional[int]):
+    if temporadas and ultimas_temporadas:
+        raise HTTPException(status_code=400, detail="Informe temporadas ou ultimas_temporadas, não os dois.")
+    try:
+        return resolver_temporadas(temporadas, ultimas_temporadas)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-@app.get("/comparar-times")
-def get_comparacao_times(time_a: str, time_b: str):
+@app.get("/comparar-times", response_model=ComparacaoResposta, response_model_exclude_none=True)
+async def get_comparacao_times(
+    time_a: str,
+    time_b: str,
+    temporadas: Optional[List[int]] = Query(None),
+    ultimas_temporadas: Optional[int] = Query(None, ge=1),
+):
     """
     Compara estatísticas gerais entre dois times (gols, vitórias, empates, etc.).
+    Opcionalmente restrito a algumas temporadas (só essas partições são lidas).
     """
+    filtro = _filtro_temporadas(temporadas, ultimas_temporadas)
     try:
-        comparacao = comparar_times(time_a, time_b)
+        comparacao = await executar("consultas", comparar_times, time_a, time_b, filtro)
         return comparacao
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-@app.get("/perfil-time")
-def get_perfil_time(time: str):
+@app.get("/confronto", response_model=ConfrontoResposta)
+async def get_confronto(
+    time_a: str,
+    time_b: str,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    casa_fora: Optional[Literal["casa", "fora"]] = None,
+):
+    """
+    Retrospecto do time_a contra o time_b (vitórias, empates, derrotas e gols),
+    com filtro opcional de temporadas e de mando de campo do time_a.
+    """
+    if ano_inicio is not None and ano_fim is not None and ano_inicio > ano_fim:
+        raise HTTPException(status_code=400, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+    try:
+        return await executar("consultas", confronto, time_a, time_b, ano_inicio, ano_fim, casa_fora)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/perfil-time", response_model=PerfilTimeResposta)
+async def get_perfil_time(
+    time: str,
+    temporadas: Optional[List[int]] = Query(None),
+    ultimas_temporadas: Optional[int] = Query(None, ge=1),
+):
     """
     Retorna o perfil estatístico médio de um time (para gráfico de radar).
+    Opcionalmente restrito a algumas temporadas (só essas partições são lidas).
     """
+    filtro = _filtro_temporadas(temporadas, ultimas_temporadas)
     try:
-        perfil = perfil_time(time)
+        perfil = await executar("consultas", perfil_time, time, filtro)
         return {"time": time, "perfil": perfil}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+def _exigir_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Endpoints de admin desabilitados (defina IA_FUTEBOL_ADMIN_TOKEN).")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Token de admin inválido.")
+
+@app.get("/admin/modelos", dependencies=[Depends(_exigir_admin)])
+def get_modelos():
+    """
+    Modelos carregados (tempo de carga e memória de cada um), o ativo e os
+    artefatos disponíveis em app/models.
+    """
+    return registro.situacao()
+
+@app.post("/admin/modelos/{nome}/carregar", dependencies=[Depends(_exigir_admin)])
+def post_carregar_modelo(nome: str):
+    """
+    Carrega (ou recarrega do disco) um modelo como candidato, sem ativá-lo.
+    Se ele já for o ativo, a versão recarregada passa a valer.
+    """
+    try:
+        return registro.carregar(nome).resumo()
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.post("/admin/modelos/{nome}/ativar", dependencies=[Depends(_exigir_admin)])
+def post_ativar_modelo(nome: str):
+    """
+    Troca o modelo ativo. Requisições em andamento terminam com o modelo anterior.
+    """
+    try:
+        return registro.ativar(nome).resumo()
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.delete("/admin/modelos/{nome}", dependencies=[Depends(_exigir_admin)])
+def delete_modelo(nome: str):
+    """
+    Descarrega um modelo candidato (o ativo não pode ser descarregado).
+    """
+    try:
+        registro.descarregar(nome)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"descarregado": nome}
+
+@app.get("/admin/concorrencia", dependencies=[Depends(_exigir_admin)])
+async def get_concorrencia():
+    """
+    Executor em uso e, por grupo de endpoints, requisições em execução, fila
+    atual e pico, rejeitadas (503) e espera média.
+    """
+    return concorrencia.situacao()
+
+@app.get("/admin/cache-previsoes", dependencies=[Depends(_exigir_admin)])
+def get_cache_previsoes():
+    """
+    Tamanho e contadores (acertos, falhas, remoções, expirações) do cache do /prever.
+    """
+    return cache_previsoes.estatisticas()
+
+@app.get("/admin/experimento", dependencies=[Depends(_exigir_admin)])
+def get_experimento():
+    """
+    Configuração de sombra/A-B, estado da fila e histogramas de latência por modelo.
+    """
+    return experimentos.situacao()
+
+@app.put("/admin/experimento", dependencies=[Depends(_exigir_admin)])
+def put_experimento(config: ExperimentoConfig):
+    """
+    Liga, muda ou desliga (campos vazios) o modelo sombra e a divisão A/B.
+    """
+    try:
+        return experimentos.configurar(config.sombra, config.ab_modelo, config.ab_percentual)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/debug/profile", dependencies=[Depends(_exigir_admin)])
+def get_debug_profile():
+    """
+    Situação da sessão de amostragem e arquivos gravados (sessões e, com
+    IA_FUTEBOL_PERFIL=1, perfis agregados por rota).
+    """
+    return {"perfil_requisicoes": PERFIL, "amostra": PERFIL_AMOSTRA, **sessao.situacao()}
+
+@app.post("/debug/profile", dependencies=[Depends(_exigir_admin)])
+def post_debug_profile(
+    duracao_s: float = Query(30, gt=0, le=PERFIL_DURACAO_MAX),
+    intervalo_ms: float = Query(10, ge=1, le=1000),
+):
+    """
+    Inicia uma sessão de amostragem das pilhas de todas as threads por
+    duracao_s segundos; o resultado vai para um arquivo .collapsed (flamegraph).
+    """
+    try:
+        return sessao.iniciar(duracao_s, intervalo_ms)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.delete("/debug/profile", dependencies=[Depends(_exigir_admin)])
+def delete_debug_profile():
+    """
+    Encerra a sessão de amostragem antes do prazo e grava o arquivo.
+    """
+    try:
+        return sessao.parar()
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
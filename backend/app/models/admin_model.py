@@ -0,0 +1,7 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class ExperimentoConfig(BaseModel):
+    sombra: Optional[str] = None
+    ab_modelo: Optional[str] = None
+    ab_percentual: int = Field(0, ge=0, le=100)
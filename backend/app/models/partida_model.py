@@ -1,3 +1,5 @@
+from datetime import date
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel
 
 class PartidaEntrada(BaseModel):
@@ -10,3 +12,49 @@ class PartidaEntrada(BaseModel):
     idade_media_titular_mandante: float
     idade_media_titular_visitante: float
     publico_max: float
+    # opcionais: com os times, a previsão recebe Elo e forma recente de antes da data
+    time_mandante: Optional[str] = None
+    time_visitante: Optional[str] = None
+    data: Optional[date] = None
+
+class PartidaLoteEntrada(BaseModel):
+    partidas: List[PartidaEntrada]
+
+class PrevisaoResposta(BaseModel):
+    probabilidades: Dict[str, float]
+    # só com time_mandante e time_visitante: Elo, forma e médias recentes usadas
+    features: Optional[Dict[str, Union[int, float]]] = None
+    # só com A/B ativo: modelo que respondeu
+    modelo: Optional[str] = None
+
+class PrevisaoLoteResposta(BaseModel):
+    classes: List[str]
+    # uma linha por partida, colunas na ordem de classes
+    probabilidades: List[List[float]]
+
+class GolsEsperados(BaseModel):
+    mandante: float
+    visitante: float
+
+class ProbabilidadesResultado(BaseModel):
+    mandante: float
+    empate: float
+    visitante: float
+
+class PlacarMaisProvavel(BaseModel):
+    mandante: int
+    visitante: int
+    probabilidade: float
+
+class PlacarResposta(BaseModel):
+    gols_esperados: GolsEsperados
+    probabilidades: ProbabilidadesResultado
+    placar_mais_provavel: PlacarMaisProvavel
+    # linhas: gols do mandante; colunas: gols do visitante
+    placares: List[List[float]]
+
+class PlacarLoteResposta(BaseModel):
+    # uma linha [mandante, visitante] por partida
+    gols_esperados: List[List[float]]
+    # uma matriz de placares por partida
+    placares: List[List[List[float]]]
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.config import SIMULACAO_MAX, SIMULACAO_PROCESSOS, SIMULACAO_PROCESSOS_MAX
+
+class SimulacaoEntrada(BaseModel):
+    ano: int
+    # partidas até esta rodada contam como jogadas (padrão: todas as já disputadas)
+    ate_rodada: Optional[int] = Field(None, ge=0)
+    simulacoes: int = Field(10_000, ge=1, le=SIMULACAO_MAX)
+    semente: Optional[int] = Field(None, ge=0)
+    processos: int = Field(SIMULACAO_PROCESSOS, ge=1, le=SIMULACAO_PROCESSOS_MAX)
+    # sorteia placares do modelo de gols (saldo e gols pró no desempate) em vez de só o resultado
+    placares: bool = False
+
+class ClassificacaoSimulada(BaseModel):
+    time: str
+    colocacao_atual: int
+    jogos: int
+    pontos: int
+    vitorias: int
+    saldo_gols: int
+    pontos_esperados: float
+    prob_titulo: float
+    prob_g6: float
+    prob_z4: float
+    # probabilidade de cada posição final, da primeira à última
+    posicoes: List[float]
+
+class SimulacaoResposta(BaseModel):
+    ano: int
+    ate_rodada: int
+    simulacoes: int
+    semente: Optional[int]
+    processos: int
+    placares: bool
+    partidas_restantes: int
+    tempo_ms: float
+    classificacao: List[ClassificacaoSimulada]
@@ -0,0 +1,67 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel
+
+class TimesResposta(BaseModel):
+    times: List[str]
+
+class EstatisticasTime(BaseModel):
+    jogos: int
+    gols_pro: float
+    gols_contra: float
+    vitorias: int
+    empates: int
+    derrotas: int
+
+class ComparacaoResposta(BaseModel):
+    time_a: str
+    time_b: str
+    estatisticas: Dict[str, EstatisticasTime]
+    # empates entre os dois times
+    empates_totais: int
+    # só quando filtrado por temporadas
+    temporadas: Optional[List[int]] = None
+
+class RetrospectoConfronto(BaseModel):
+    jogos: int
+    vitorias: int
+    empates: int
+    derrotas: int
+    gols_pro: int
+    gols_contra: int
+
+class RetrospectoTemporada(BaseModel):
+    ano_campeonato: int
+    jogos: int
+    vitorias: int
+    empates: int
+    derrotas: int
+    gols_pro: int
+    gols_contra: int
+
+class ConfrontoResposta(BaseModel):
+    time_a: str
+    time_b: str
+    ano_inicio: Optional[int]
+    ano_fim: Optional[int]
+    casa_fora: Optional[Literal["casa", "fora"]]
+    # do ponto de vista de time_a
+    totais: RetrospectoConfronto
+    por_temporada: List[RetrospectoTemporada]
+
+class PerfilTime(BaseModel):
+    # jogos: total de partidas; os demais são médias por jogo
+    jogos: float
+    gols_pro: float
+    gols_contra: float
+    chutes_pro: float
+    chutes_contra: float
+    escanteios_pro: float
+    faltas_pro: float
+    defesas_pro: float
+    taxa_vitorias: float
+    taxa_empates: float
+    taxa_derrotas: float
+
+class PerfilTimeResposta(BaseModel):
+    time: str
+    perfil: PerfilTime
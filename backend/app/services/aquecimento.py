@@ -0,0 +1,76 @@
+"""
+Aquecimento da API antes de aceitar tráfego.
+
+Os loaders de data_loader são lazy (lru_cache) e o modelo só é carregado na
+primeira previsão; sem aquecimento quem paga esse custo é a primeira
+requisição depois do deploy. aquecer() roda todas as etapas na subida do
+worker e guarda o tempo de cada uma para o /health/ready.
+"""
+
+import time
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+from app.services.gols_service import carregar_modelo_gols
+from app.services.predict_service import obter_motor, prever_partida
+from app.utils.data_loader import (
+    carregar_df_brasileirao,
+    carregar_df_times,
+    carregar_features_times,
+    carregar_indice_confrontos,
+    carregar_indice_times,
+    carregar_metricas_times,
+)
+
+# partida fictícia usada só para exercitar o caminho de previsão; com os times
+# e a data, serve também para modelos treinados com features dinâmicas
+PARTIDA_TESTE = {
+    "ano_campeonato": 2024,
+    "rodada": 1,
+    "colocacao_mandante": 10.0,
+    "colocacao_visitante": 10.0,
+    "valor_equipe_titular_mandante": 20e6,
+    "valor_equipe_titular_visitante": 20e6,
+    "idade_media_titular_mandante": 27.0,
+    "idade_media_titular_visitante": 27.0,
+    "publico_max": 40000.0,
+    "time_mandante": "Flamengo",
+    "time_visitante": "Palmeiras",
+    "data": date(2024, 6, 1),
+}
+
+ESTAGIOS: List[Tuple[str, Callable[[], object]]] = [
+    ("df_brasileirao", carregar_df_brasileirao),
+    ("df_times", carregar_df_times),
+    ("indice_times", carregar_indice_times),
+    ("indice_confrontos", carregar_indice_confrontos),
+    ("metricas_times", carregar_metricas_times),
+    ("features_times", carregar_features_times),
+    ("modelo", obter_motor),
+    ("previsao_teste", lambda: prever_partida(PARTIDA_TESTE)),
+    ("modelo_gols", carregar_modelo_gols),
+]
+
+estado: Dict = {"pronto": False, "estagios_ms": {}, "total_ms": None, "erro": None}
+
+
+def aquecer() -> Dict:
+    """
+    Executa as etapas em ordem e registra o tempo de cada uma (ms).
+    Uma falha não derruba o worker: ele sobe, mas continua "não pronto".
+    """
+    estado.update(pronto=False, estagios_ms={}, total_ms=None, erro=None)
+    inicio_total = time.perf_counter()
+
+    for nome, etapa in ESTAGIOS:
+        inicio = time.perf_counter()
+        try:
+            etapa()
+        except Exception as e:
+            estado["erro"] = f"{nome}: {e}"
+            break
+        estado["estagios_ms"][nome] = (time.perf_counter() - inicio) * 1000
+    else:
+        estado["pronto"] = True
+
+    estado["total_ms"] = (time.perf_counter() - inicio_total) * 1000
+    return estado
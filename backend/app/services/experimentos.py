@@ -0,0 +1,214 @@
+"""
+Experimentos com modelos em tráfego real: modelo sombra e divisão A/B.
+
+- Sombra: o /prever responde com o modelo escolhido e, em segundo plano,
+  a mesma entrada é prevista pelo modelo sombra. A requisição só coloca a
+  entrada numa fila (sem bloquear; se a fila estiver cheia o item é
+  descartado e contado), então a latência da resposta não muda.
+- A/B: uma porcentagem das requisições é respondida pelo modelo candidato.
+  Com o cabeçalho X-Cliente-Id a divisão é estável por cliente.
+
+Uma única thread consome a fila, calcula as previsões sombra e grava tudo
+num JSONL append-only (uma linha por previsão, mais fotos periódicas dos
+histogramas de latência por modelo), para análise offline.
+"""
+
+import json
+import queue
+import random
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from app.config import (
+    AB_MODELO,
+    AB_PERCENTUAL,
+    EXPERIMENTO_FILA,
+    EXPERIMENTO_LOG,
+    MODELO,
+    MODELO_SOMBRA,
+)
+from app.services.predict_service import prever_partida
+from app.services.registro_modelos import registro
+
+# limites superiores das faixas de latência, em µs (a última faixa é o resto)
+FAIXAS_LATENCIA_US = (10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 100_000)
+
+# intervalo entre fotos dos histogramas no log
+HISTOGRAMAS_A_CADA_S = 60.0
+
+# marca de fim da fila (parar())
+_FIM = object()
+
+
+class HistogramaLatencia:
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_LATENCIA_US) + 1)
+        self.total = 0
+        self.soma_us = 0.0
+
+    def observar(self, latencia_us: float) -> None:
+        self.contagens[bisect_left(FAIXAS_LATENCIA_US, latencia_us)] += 1
+        self.total += 1
+        self.soma_us += latencia_us
+
+    def resumo(self) -> Dict:
+        faixas = [f"<={f}" for f in FAIXAS_LATENCIA_US] + [f">{FAIXAS_LATENCIA_US[-1]}"]
+        return {
+            "total": self.total,
+            "media_us": self.soma_us / self.total if self.total else None,
+            "faixas_us": dict(zip(faixas, self.contagens)),
+        }
+
+
+class Experimentos:
+    def __init__(self, caminho_log: Path, tamanho_fila: int):
+        self.caminho_log = caminho_log
+        self.sombra: Optional[str] = None
+        self.ab_modelo: Optional[str] = None
+        self.ab_percentual = 0
+        self.descartados = 0
+        self._histogramas: Dict[Tuple[str, str], HistogramaLatencia] = {}
+        self._lock = threading.Lock()
+        self._fila: "queue.Queue" = queue.Queue(maxsize=tamanho_fila)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self.sombra) or (bool(self.ab_modelo) and self.ab_percentual > 0)
+
+    def configurar(self, sombra: Optional[str], ab_modelo: Optional[str], ab_percentual: int) -> Dict:
+        """
+        Define sombra e A/B, carregando os modelos no registro se preciso.
+        """
+        if not 0 <= ab_percentual <= 100:
+            raise ValueError("ab_percentual deve estar entre 0 e 100.")
+        for nome in (sombra, ab_modelo):
+            if nome and registro.obter(nome) is None:
+                registro.carregar(nome)
+        self.sombra, self.ab_modelo, self.ab_percentual = sombra or None, ab_modelo or None, ab_percentual
+        return self.situacao()
+
+    def configurar_pelo_ambiente(self) -> None:
+        # chamado na subida da API: carrega os modelos configurados por variável de ambiente
+        if MODELO_SOMBRA or AB_MODELO:
+            self.configurar(MODELO_SOMBRA, AB_MODELO, AB_PERCENTUAL)
+
+    def escolher_modelo(self, cliente: Optional[str] = None) -> Tuple[str, object]:
+        """
+        (nome, motor) que deve responder esta requisição.
+        """
+        if self.ab_modelo and self.ab_percentual > 0:
+            faixa = zlib.crc32(cliente.encode()) % 100 if cliente else random.randrange(100)
+            if faixa < self.ab_percentual:
+                candidato = registro.obter(self.ab_modelo)
+                if candidato is not None:
+                    return candidato.nome, candidato.motor
+        ativo = registro.ativo(MODELO)
+        return ativo.nome, ativo.motor
+
+    def registrar(self, dados: dict, modelo: str, probabilidades: Dict, latencia_us: float) -> None:
+        """
+        Chamado pela requisição logo depois da previsão: atualiza o histograma
+        e, com experimento ativo, enfileira o registro (sem bloquear).
+        """
+        self._observar("principal", modelo, latencia_us)
+        if not self.ativo:
+            return
+        self._iniciar()
+        item = {
+            "instante": datetime.now().isoformat(timespec="milliseconds"),
+            "entrada": dados,
+            "modelo": modelo,
+            "probabilidades": probabilidades,
+            "latencia_us": latencia_us,
+            "sombra": self.sombra,
+        }
+        try:
+            self._fila.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.descartados += 1
+
+    def situacao(self) -> Dict:
+        with self._lock:
+            histogramas = {f"{papel}:{modelo}": h.resumo() for (papel, modelo), h in self._histogramas.items()}
+        return {
+            "sombra": self.sombra,
+            "ab_modelo": self.ab_modelo,
+            "ab_percentual": self.ab_percentual,
+            "log": str(self.caminho_log),
+            "fila": self._fila.qsize(),
+            "descartados": self.descartados,
+            "latencias": histogramas,
+        }
+
+    def _observar(self, papel: str, modelo: str, latencia_us: float) -> None:
+        with self._lock:
+            histograma = self._histogramas.get((papel, modelo))
+            if histograma is None:
+                histograma = self._histogramas[(papel, modelo)] = HistogramaLatencia()
+            histograma.observar(latencia_us)
+
+    def _iniciar(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._consumir, name="experimentos", daemon=True)
+                self._thread.start()
+
+    def parar(self) -> None:
+        """
+        Esvazia a fila, grava a última foto dos histogramas e encerra a thread.
+        """
+        if self._thread is None:
+            return
+        self._fila.put(_FIM)
+        self._thread.join()
+        self._thread = None
+
+    def _consumir(self) -> None:
+        self.caminho_log.parent.mkdir(parents=True, exist_ok=True)
+        ultima_foto = time.monotonic()
+        with open(self.caminho_log, "a", encoding="utf-8") as log:
+            while True:
+                try:
+                    item = self._fila.get(timeout=HISTOGRAMAS_A_CADA_S)
+                except queue.Empty:
+                    item = None
+                if item is _FIM:
+                    self._gravar_histogramas(log)
+                    return
+                if item is not None:
+                    self._gravar_previsao(log, item)
+                if time.monotonic() - ultima_foto >= HISTOGRAMAS_A_CADA_S:
+                    self._gravar_histogramas(log)
+                    ultima_foto = time.monotonic()
+                log.flush()
+
+    def _gravar_previsao(self, log, item: Dict) -> None:
+        nome_sombra = item.pop("sombra")
+        if nome_sombra:
+            sombra = registro.obter(nome_sombra)
+            if sombra is not None:
+                inicio = time.perf_counter()
+                try:
+                    probs = prever_partida(item["entrada"], sombra.motor, usar_cache=False)
+                    latencia_us = (time.perf_counter() - inicio) * 1e6
+                    self._observar("sombra", sombra.nome, latencia_us)
+                    item["sombra"] = {"modelo": sombra.nome, "probabilidades": probs, "latencia_us": latencia_us}
+                except Exception as e:
+                    item["sombra"] = {"modelo": sombra.nome, "erro": str(e)}
+        log.write(json.dumps({"tipo": "previsao", **item}, default=str, ensure_ascii=False) + "\n")
+
+    def _gravar_histogramas(self, log) -> None:
+        registro_hist = {"tipo": "histogramas", "instante": datetime.now().isoformat(timespec="seconds"),
+                         **{k: v for k, v in self.situacao().items() if k in ("latencias", "descartados")}}
+        log.write(json.dumps(registro_hist, ensure_ascii=False) + "\n")
+
+
+experimentos = Experimentos(EXPERIMENTO_LOG, EXPERIMENTO_FILA)
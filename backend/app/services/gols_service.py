@@ -0,0 +1,165 @@
+"""
+Modelo de gols (Poisson com correção de Dixon-Coles) e matriz de placares.
+
+- Gols do mandante e do visitante: duas regressões de Poisson sobre as
+  mesmas features básicas do /prever, ajustadas com gols_mandante e
+  gols_visitante da base final na primeira chamada (como os demais loaders).
+- Dixon-Coles: o parâmetro rho corrige a dependência nos placares baixos
+  (0x0, 1x0, 0x1, 1x1); é estimado por máxima verossimilhança com as médias
+  das regressões fixas. A correção não altera as médias de cada time.
+- A matriz de placares de N partidas é um único produto externo
+  (N x G) x (N x G) -> N x G x G, com G = MAX_GOLS + 1.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize_scalar
+from scipy.special import gammaln
+from sklearn.linear_model import PoissonRegressor
+from app.utils.data_loader import carregar_df_brasileirao
+
+FEATURES_GOLS: List[str] = [
+    "ano_campeonato",
+    "rodada",
+    "colocacao_mandante",
+    "colocacao_visitante",
+    "valor_equipe_titular_mandante",
+    "valor_equipe_titular_visitante",
+    "idade_media_titular_mandante",
+    "idade_media_titular_visitante",
+    "publico_max",
+]
+
+# placares calculados até MAX_GOLS x MAX_GOLS (a massa acima disso é desprezível e é renormalizada)
+MAX_GOLS = 10
+
+
+class ModeloGols:
+    """Médias de gols log-lineares (scaler embutido nos pesos) e rho de Dixon-Coles."""
+
+    def __init__(self, medianas: np.ndarray, pesos: np.ndarray, intercepto: np.ndarray, rho: float):
+        self.features = FEATURES_GOLS
+        self.medianas = medianas
+        # pesos (features x 2: mandante, visitante)
+        self.pesos = pesos
+        self.intercepto = intercepto
+        self.rho = rho
+
+    def matriz(self, lista_dados: List[dict]) -> np.ndarray:
+        n = len(lista_dados)
+        valores = (dados[col] for dados in lista_dados for col in self.features)
+        X = np.fromiter(valores, dtype=np.float64, count=n * len(self.features)).reshape(n, len(self.features))
+        return np.where(np.isnan(X), self.medianas, X)
+
+    def gols_esperados(self, X: np.ndarray) -> np.ndarray:
+        """Médias de gols (partidas x 2: mandante, visitante)."""
+        return np.exp(X @ self.pesos + self.intercepto)
+
+
+def _fator_dixon_coles(gols_m: np.ndarray, gols_v: np.ndarray, lambdas: np.ndarray, rho: float) -> np.ndarray:
+    # tau(i, j) de Dixon e Coles (1997) para pares de placares observados
+    lam, mu = lambdas[:, 0], lambdas[:, 1]
+    tau = np.ones(len(gols_m))
+    tau = np.where((gols_m == 0) & (gols_v == 0), 1 - lam * mu * rho, tau)
+    tau = np.where((gols_m == 0) & (gols_v == 1), 1 + lam * rho, tau)
+    tau = np.where((gols_m == 1) & (gols_v == 0), 1 + mu * rho, tau)
+    tau = np.where((gols_m == 1) & (gols_v == 1), 1 - rho, tau)
+    return tau
+
+
+def ajustar_modelo_gols(df: pd.DataFrame) -> ModeloGols:
+    validos = df["gols_mandante"].notna() & df["gols_visitante"].notna()
+    X = df.loc[validos, FEATURES_GOLS].to_numpy(dtype=np.float64)
+    gols = df.loc[validos, ["gols_mandante", "gols_visitante"]].to_numpy(dtype=np.float64)
+
+    medianas = np.nanmedian(X, axis=0)
+    X = np.where(np.isnan(X), medianas, X)
+    media, escala = X.mean(axis=0), X.std(axis=0)
+    escala[escala == 0] = 1.0
+    Z = (X - media) / escala
+
+    pesos, intercepto = [], []
+    for coluna in range(2):
+        reg = PoissonRegressor(alpha=1e-4, max_iter=1000).fit(Z, gols[:, coluna])
+        # (x - media) / escala @ w + b  ==  x @ (w / escala) + (b - media @ (w / escala))
+        w = reg.coef_ / escala
+        pesos.append(w)
+        intercepto.append(reg.intercept_ - media @ w)
+    pesos, intercepto = np.column_stack(pesos), np.array(intercepto)
+
+    lambdas = np.exp(X @ pesos + intercepto)
+    gm, gv = gols[:, 0], gols[:, 1]
+
+    def nll(rho: float) -> float:
+        return -np.log(np.clip(_fator_dixon_coles(gm, gv, lambdas, rho), 1e-12, None)).sum()
+
+    rho = float(minimize_scalar(nll, bounds=(-0.25, 0.25), method="bounded").x)
+    return ModeloGols(medianas, pesos, intercepto, rho)
+
+
+@lru_cache
+def carregar_modelo_gols() -> ModeloGols:
+    return ajustar_modelo_gols(carregar_df_brasileirao())
+
+
+def _pmf_poisson(lambdas: np.ndarray, max_gols: int) -> np.ndarray:
+    # P(k gols) para k = 0..max_gols, para cada média (N -> N x G)
+    k = np.arange(max_gols + 1)
+    return np.exp(k * np.log(lambdas)[:, None] - lambdas[:, None] - gammaln(k + 1))
+
+
+def matriz_placares(lambdas: np.ndarray, rho: float, max_gols: int = MAX_GOLS) -> np.ndarray:
+    """
+    Probabilidade de cada placar (partidas x gols mandante x gols visitante)
+    para as médias `lambdas` (partidas x 2).
+    """
+    lam, mu = lambdas[:, 0], lambdas[:, 1]
+    placares = _pmf_poisson(lam, max_gols)[:, :, None] * _pmf_poisson(mu, max_gols)[:, None, :]
+    placares[:, 0, 0] *= 1 - lam * mu * rho
+    placares[:, 0, 1] *= 1 + lam * rho
+    placares[:, 1, 0] *= 1 + mu * rho
+    placares[:, 1, 1] *= 1 - rho
+    np.clip(placares, 0, None, out=placares)
+    return placares / placares.sum(axis=(1, 2), keepdims=True)
+
+
+def resultados_placares(placares: np.ndarray) -> Dict[str, np.ndarray]:
+    """Probabilidades mandante/empate/visitante somadas da matriz de placares."""
+    g = placares.shape[-1]
+    abaixo = np.tril(np.ones((g, g), dtype=bool), k=-1)  # gols mandante > gols visitante
+    return {
+        "mandante": placares[:, abaixo].sum(axis=1),
+        "empate": np.trace(placares, axis1=1, axis2=2),
+        "visitante": placares[:, abaixo.T].sum(axis=1),
+    }
+
+
+def prever_placares_lote(lista_dados: List[dict], modelo: ModeloGols = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Médias de gols (partidas x 2) e matrizes de placares (partidas x G x G)
+    de várias partidas numa única operação.
+    """
+    modelo = modelo or carregar_modelo_gols()
+    if not lista_dados:
+        return np.empty((0, 2)), np.empty((0, MAX_GOLS + 1, MAX_GOLS + 1))
+    lambdas = modelo.gols_esperados(modelo.matriz(lista_dados))
+    return lambdas, matriz_placares(lambdas, modelo.rho)
+
+
+def prever_placar(dados: dict, max_gols: int = 6) -> Dict:
+    """
+    Gols esperados, probabilidades de resultado, placar mais provável e
+    matriz de placares até `max_gols` (linhas: gols do mandante).
+    """
+    lambdas, placares = prever_placares_lote([dados])
+    matriz = placares[0]
+    i, j = np.unravel_index(matriz.argmax(), matriz.shape)
+    resultados = resultados_placares(placares)
+    return {
+        "gols_esperados": {"mandante": float(lambdas[0, 0]), "visitante": float(lambdas[0, 1])},
+        "probabilidades": {k: float(v[0]) for k, v in resultados.items()},
+        "placar_mais_provavel": {"mandante": int(i), "visitante": int(j), "probabilidade": float(matriz[i, j])},
+        "placares": matriz[:max_gols + 1, :max_gols + 1].tolist(),
+    }
@@ -0,0 +1,99 @@
+"""
+Motores de inferência usados pelo predict_service.
+
+O modelo salvo pelo notebook 06 é um Pipeline StandardScaler + LogisticRegression.
+Para esse caso o MotorLogistico extrai média/escala do scaler e os coeficientes
+da regressão na carga, junta tudo numa única transformação linear e calcula o
+softmax direto em NumPy, sem montar DataFrame por requisição.
+Qualquer outro tipo de modelo cai no MotorPipeline, que usa predict_proba.
+"""
+
+from typing import List
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+def _features_modelo(modelo) -> List[str]:
+    return [str(f) for f in modelo.feature_names_in_]
+
+
+class MotorPipeline:
+    """Caminho genérico: monta um DataFrame e chama modelo.predict_proba."""
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.features = _features_modelo(modelo)
+        self.classes = [str(c) for c in modelo.classes_]
+
+    def vetor(self, dados: dict) -> np.ndarray:
+        return np.array([dados[col] for col in self.features], dtype=np.float64)
+
+    def prever_proba(self, X: np.ndarray) -> np.ndarray:
+        unico = X.ndim == 1
+        df = pd.DataFrame(np.atleast_2d(X), columns=self.features)
+        probs = self.modelo.predict_proba(df)
+        return probs[0] if unico else probs
+
+
+class MotorLogistico:
+    """Scaler + regressão logística multinomial avaliados como x @ W.T + b e softmax."""
+
+    def __init__(self, features: List[str], classes: List[str], pesos: np.ndarray, intercepto: np.ndarray):
+        self.features = features
+        self.classes = classes
+        # pesos já transpostos (features x classes) e contíguos para o produto
+        self.pesos = np.ascontiguousarray(pesos.T)
+        self.intercepto = intercepto
+
+    @classmethod
+    def de_pipeline(cls, modelo: Pipeline) -> "MotorLogistico":
+        if not isinstance(modelo, Pipeline) or len(modelo.steps) != 2:
+            raise ValueError("Modelo não é um Pipeline scaler + classificador.")
+
+        scaler, clf = modelo.steps[0][1], modelo.steps[1][1]
+        if not isinstance(scaler, StandardScaler) or not isinstance(clf, LogisticRegression):
+            raise ValueError("Pipeline não é StandardScaler + LogisticRegression.")
+        if getattr(clf, "multi_class", "auto") == "ovr":
+            raise ValueError("Regressão logística one-vs-rest não usa softmax.")
+
+        media = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+        escala = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+
+        coef = clf.coef_
+        intercepto = clf.intercept_
+        if coef.shape[0] == 1:
+            # caso binário: sigmoide(z) == softmax([0, z])
+            coef = np.vstack([np.zeros_like(coef), coef])
+            intercepto = np.concatenate([[0.0], intercepto])
+
+        # (x - media) / escala @ W.T + b  ==  x @ (W / escala).T + (b - (W / escala) @ media)
+        pesos = coef / escala
+        intercepto = intercepto - pesos @ media
+
+        return cls(
+            features=_features_modelo(modelo),
+            classes=[str(c) for c in clf.classes_],
+            pesos=pesos,
+            intercepto=intercepto,
+        )
+
+    def vetor(self, dados: dict) -> np.ndarray:
+        return np.array([dados[col] for col in self.features], dtype=np.float64)
+
+    def prever_proba(self, X: np.ndarray) -> np.ndarray:
+        """Aceita um vetor (uma partida) ou uma matriz (partidas x features)."""
+        logits = X @ self.pesos + self.intercepto
+        logits -= logits.max(axis=-1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=-1, keepdims=True)
+        return logits
+
+
+def criar_motor(modelo):
+    try:
+        return MotorLogistico.de_pipeline(modelo)
+    except ValueError:
+        return MotorPipeline(modelo)
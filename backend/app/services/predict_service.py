@@ -1,10 +1,122 @@
-import pandas as pd
-from app.utils.load_model import carregar_modelo
+import time
+from typing import Dict, List, Tuple
+import numpy as np
+from app.config import MODELO, PREVISAO_CACHE_MAX, PREVISAO_CACHE_TTL_S
+from app.services.registro_modelos import registro
+from app.utils.cache_lru import CacheLRU
+from app.utils.data_loader import carregar_features_times
+from app.utils.features_times import entrada_obrigatoria
+from app.utils.metricas import medir
 
-modelo = carregar_modelo()
+# o frontend repete as mesmas entradas (sliders com poucas posições): a chave
+# é a versão do modelo + o vetor de features já convertido para float, então
+# 27 e 27.0 (ou campos que o modelo não usa) caem na mesma entrada
+cache_previsoes = CacheLRU(PREVISAO_CACHE_MAX, PREVISAO_CACHE_TTL_S)
+registro.ao_mudar(cache_previsoes.limpar)
 
-def prever_partida(dados: dict):
-    df = pd.DataFrame([dados])
-    probs = modelo.predict_proba(df)[0]
-    classes = modelo.classes_
-    return dict(zip(classes, [float(p) for p in probs]))
+class EntradaIncompleta(ValueError):
+    """Partida sem os campos que o modelo ativo exige (a API responde 422)."""
+
+def obter_motor():
+    # motor do modelo ativo no registro; o padrão é carregado na primeira
+    # chamada (ou no aquecimento da API), não no import
+    return registro.ativo(MODELO).motor
+
+def features_partida(dados: dict) -> Dict:
+    """
+    Elo, forma e médias de gols recentes dos dois times antes da data da
+    partida (vazio se os times não foram informados).
+    """
+    if not dados.get("time_mandante") or not dados.get("time_visitante"):
+        return {}
+    with medir("features_dinamicas"):
+        return carregar_features_times().features_partida(
+            dados["time_mandante"], dados["time_visitante"], dados.get("data")
+        )
+
+def _campos_obrigatorios(motor):
+    # o registro grava no motor o que veio nos metadados do treino; motores
+    # criados fora dele (treino, backtest) derivam das colunas
+    campos = getattr(motor, "entrada_obrigatoria", None)
+    return entrada_obrigatoria(motor.features) if campos is None else campos
+
+def validar_entradas(lista_dados: List[dict], motor) -> None:
+    """
+    Levanta EntradaIncompleta se o motor usa features dinâmicas e alguma
+    partida veio sem os times ou a data.
+    """
+    campos = _campos_obrigatorios(motor)
+    if not campos:
+        return
+    for i, dados in enumerate(lista_dados):
+        faltantes = [campo for campo in campos if not dados.get(campo)]
+        if faltantes:
+            prefixo = f"Partida {i}: " if len(lista_dados) > 1 else ""
+            raise EntradaIncompleta(
+                f"{prefixo}o modelo ativo usa features dos times; informe {', '.join(faltantes)}."
+            )
+
+def _prever_com_features(dados: dict, motor, usar_cache: bool = True) -> Tuple[Dict, Dict]:
+    # probabilidades e as features dinâmicas calculadas para elas (vazio sem os times)
+    validar_entradas([dados], motor)
+    if _campos_obrigatorios(motor):
+        features = features_partida(dados)
+    else:
+        # o modelo não usa as features: elas só informam, e um time desconhecido não é erro
+        try:
+            features = features_partida(dados)
+        except ValueError:
+            features = {}
+    vetor = motor.vetor({**dados, **features})
+
+    # motores criados fora do registro (ex.: no treino) não têm versão e não usam o cache
+    versao = getattr(motor, "versao", None)
+    usar_cache = usar_cache and cache_previsoes.habilitado and versao is not None
+    if usar_cache:
+        chave = (versao, vetor.tobytes())
+        resultado = cache_previsoes.obter(chave)
+        if resultado is not None:
+            return dict(resultado), features
+
+    with medir("inferencia"):
+        probs = motor.prever_proba(vetor)
+    resultado = dict(zip(motor.classes, probs.tolist()))
+    if usar_cache:
+        cache_previsoes.guardar(chave, resultado)
+    return dict(resultado), features
+
+def prever_partida(dados: dict, motor=None, usar_cache: bool = True):
+    # usar_cache=False para previsões fora do tráfego servido (ex.: modelo sombra),
+    # que não devem ocupar nem contar no cache do /prever
+    return _prever_com_features(dados, motor or obter_motor(), usar_cache)[0]
+
+def prever_partida_detalhada(dados: dict, motor) -> Tuple[Dict, Dict, float]:
+    """
+    Probabilidades, features dinâmicas usadas (vazio sem os times) e latência
+    da previsão em µs; é a unidade de trabalho do /prever.
+    """
+    inicio = time.perf_counter()
+    resultado, features = _prever_com_features(dados, motor)
+    latencia_us = (time.perf_counter() - inicio) * 1e6
+    return resultado, features, latencia_us
+
+def _matriz_features(lista_dados: List[dict], features: List[str]) -> np.ndarray:
+    n = len(lista_dados)
+    valores = (dados[col] for dados in lista_dados for col in features)
+    return np.fromiter(valores, dtype=np.float64, count=n * len(features)).reshape(n, len(features))
+
+def prever_lote(lista_dados: List[dict], motor=None) -> np.ndarray:
+    """
+    Calcula as probabilidades de várias partidas numa única operação matricial.
+    Retorna uma matriz (partidas x classes) na ordem de motor.classes.
+    """
+    motor = motor or obter_motor()
+    if not lista_dados:
+        return np.empty((0, len(motor.classes)))
+    if _campos_obrigatorios(motor):
+        validar_entradas(lista_dados, motor)
+        lista_dados = [{**dados, **features_partida(dados)} for dados in lista_dados]
+    with medir("montagem_matriz"):
+        X = _matriz_features(lista_dados, motor.features)
+    with medir("inferencia"):
+        return motor.prever_proba(X)
@@ -0,0 +1,249 @@
+"""
+Registro dos modelos carregados na API.
+
+Guarda vários modelos prontos para uso (o ativo e candidatos) e troca o
+ativo de forma atômica: a carga (leitura do .pkl, criação do motor e uma
+previsão de teste) acontece fora do lock, e a troca é só a substituição de
+uma referência. Requisições em andamento continuam com o motor que já
+pegaram; as novas usam o novo.
+
+Opcionalmente, um observador verifica o mtime dos .pkl em app/models e
+recarrega os modelos cujo arquivo mudou.
+"""
+
+import itertools
+import threading
+import time
+import types
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from app.config import FEATURES_JANELA
+from app.services.motor_inferencia import criar_motor
+from app.utils.features_times import entrada_obrigatoria
+from app.utils.load_model import MODELOS_DIR, carregar_metadados, carregar_modelo, listar_modelos
+
+
+# cada carga recebe uma versão nova (também gravada em motor.versao): caches
+# indexados por ela nunca confundem um modelo com a versão recarregada
+_versoes = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class ModeloCarregado:
+    nome: str
+    versao: int
+    motor: object
+    mtime: float
+    carregado_em: str
+    carga_ms: float
+    memoria_bytes: int
+
+    def resumo(self) -> Dict:
+        return {
+            "nome": self.nome,
+            "versao": self.versao,
+            "motor": type(self.motor).__name__,
+            "features": list(self.motor.features),
+            "classes": list(self.motor.classes),
+            "entrada_obrigatoria": list(self.motor.entrada_obrigatoria),
+            "carregado_em": self.carregado_em,
+            "carga_ms": self.carga_ms,
+            "memoria_bytes": self.memoria_bytes,
+        }
+
+
+def _conferir_metadados(nome: str, motor) -> None:
+    """
+    Grava em motor.entrada_obrigatoria os campos que cada partida precisa
+    trazer (metadados do treino; sem .json, derivados das features) e recusa
+    modelos cujas features dinâmicas usaram outra janela que a da API.
+    """
+    metadados = carregar_metadados(nome)
+    campos = [*metadados.get("entrada_obrigatoria", []), *entrada_obrigatoria(motor.features)]
+    motor.entrada_obrigatoria = tuple(dict.fromkeys(campos))
+
+    janela = metadados.get("janela")
+    if janela is not None and janela != FEATURES_JANELA:
+        raise ValueError(
+            f"Modelo {nome} foi treinado com janela {janela} e a API usa {FEATURES_JANELA} "
+            "(IA_FUTEBOL_FEATURES_JANELA)."
+        )
+
+
+# tipos que não guardam arrays (ou que levariam a varrer módulos inteiros)
+_SEM_ESTADO = (str, bytes, int, float, type(None), type, types.ModuleType, types.FunctionType)
+
+
+def _bytes_arrays(objeto) -> int:
+    """
+    Soma de nbytes dos arrays NumPy alcançáveis a partir de `objeto` pelo
+    estado de cada objeto (o mesmo que o pickle grava, o que inclui as árvores
+    em Cython do scikit-learn), listas, tuplas e dicts. Cada array conta uma vez.
+    """
+    # vistos guarda os objetos, não só os ids: os dicts de __getstate__ são
+    # temporários e o id de um já liberado poderia ser reaproveitado
+    total, vistos, pendentes = 0, {}, [objeto]
+    while pendentes:
+        atual = pendentes.pop()
+        if id(atual) in vistos:
+            continue
+        vistos[id(atual)] = atual
+        if isinstance(atual, np.ndarray):
+            total += atual.nbytes
+        elif isinstance(atual, dict):
+            pendentes.extend(atual.values())
+        elif isinstance(atual, (list, tuple)):
+            pendentes.extend(atual)
+        elif hasattr(atual, "__getstate__") and not isinstance(atual, _SEM_ESTADO):
+            try:
+                estado = atual.__getstate__()
+            except TypeError:
+                # objeto que não é serializável (ex.: lock): não guarda arrays
+                continue
+            if estado is not None and estado is not atual:
+                pendentes.append(estado)
+    return total
+
+
+def _carregar(nome: str) -> ModeloCarregado:
+    # mtime lido antes da carga: se o arquivo mudar durante ela, o observador recarrega de novo
+    path = MODELOS_DIR / f"{nome}.pkl"
+    mtime = path.stat().st_mtime if path.exists() else 0.0
+
+    inicio = time.perf_counter()
+    motor = criar_motor(carregar_modelo(nome))
+    # valida antes de disponibilizar: um modelo que não prevê não entra no registro
+    motor.prever_proba(np.zeros(len(motor.features)))
+    _conferir_metadados(nome, motor)
+    carga_ms = (time.perf_counter() - inicio) * 1000
+
+    versao = next(_versoes)
+    motor.versao = versao
+    return ModeloCarregado(
+        nome=nome,
+        versao=versao,
+        motor=motor,
+        mtime=mtime,
+        carregado_em=datetime.now().isoformat(timespec="seconds"),
+        carga_ms=carga_ms,
+        # o que fica em memória enquanto o modelo está no registro: os arrays do
+        # motor (e do modelo, que o MotorPipeline mantém)
+        memoria_bytes=_bytes_arrays(motor),
+    )
+
+
+class RegistroModelos:
+    def __init__(self):
+        self._modelos: Dict[str, ModeloCarregado] = {}
+        self._ativo: Optional[ModeloCarregado] = None
+        self._lock = threading.Lock()
+        self._parar_observador = threading.Event()
+        self._observador: Optional[threading.Thread] = None
+        self._ouvintes: List[Callable[[], None]] = []
+
+    def ao_mudar(self, ouvinte: Callable[[], None]) -> None:
+        """
+        Registra uma função chamada sempre que um modelo é carregado,
+        ativado ou descarregado (ex.: limpar caches de previsão).
+        """
+        self._ouvintes.append(ouvinte)
+
+    def _avisar(self) -> None:
+        for ouvinte in self._ouvintes:
+            ouvinte()
+
+    def _guardar(self, nome: str) -> ModeloCarregado:
+        # carga sem avisar os ouvintes: quem chama avisa uma única vez
+        carregado = _carregar(nome)
+        with self._lock:
+            self._modelos[nome] = carregado
+            if self._ativo is not None and self._ativo.nome == nome:
+                self._ativo = carregado
+        return carregado
+
+    def carregar(self, nome: str) -> ModeloCarregado:
+        """
+        Carrega (ou recarrega) um modelo. Se for o ativo, a versão nova passa
+        a ser usada assim que a carga termina.
+        """
+        carregado = self._guardar(nome)
+        self._avisar()
+        return carregado
+
+    def ativar(self, nome: str) -> ModeloCarregado:
+        """
+        Torna `nome` o modelo ativo, carregando-o antes se preciso.
+        """
+        carregado = self._modelos.get(nome) or self._guardar(nome)
+        with self._lock:
+            self._ativo = carregado
+        self._avisar()
+        return carregado
+
+    def descarregar(self, nome: str) -> None:
+        with self._lock:
+            if self._ativo is not None and self._ativo.nome == nome:
+                raise ValueError(f"Modelo {nome} está ativo e não pode ser descarregado.")
+            if self._modelos.pop(nome, None) is None:
+                raise LookupError(f"Modelo não carregado: {nome}.")
+        self._avisar()
+
+    def ativo(self, padrao: str) -> ModeloCarregado:
+        """
+        Modelo ativo; na primeira chamada carrega e ativa `padrao`.
+        """
+        ativo = self._ativo
+        if ativo is None:
+            ativo = self.ativar(padrao)
+        return ativo
+
+    def obter(self, nome: str) -> Optional[ModeloCarregado]:
+        return self._modelos.get(nome)
+
+    def situacao(self) -> Dict:
+        ativo = self._ativo
+        return {
+            "ativo": ativo.nome if ativo else None,
+            "carregados": [m.resumo() for m in self._modelos.values()],
+            "disponiveis": listar_modelos(),
+        }
+
+    def recarregar_alterados(self) -> List[str]:
+        """
+        Recarrega os modelos carregados cujo .pkl mudou desde a carga.
+        """
+        recarregados = []
+        for nome, carregado in list(self._modelos.items()):
+            path = MODELOS_DIR / f"{nome}.pkl"
+            if path.exists() and path.stat().st_mtime != carregado.mtime:
+                self.carregar(nome)
+                recarregados.append(nome)
+        return recarregados
+
+    def iniciar_observador(self, intervalo_s: float) -> None:
+        if self._observador is not None:
+            return
+        self._parar_observador.clear()
+
+        def observar():
+            while not self._parar_observador.wait(intervalo_s):
+                try:
+                    self.recarregar_alterados()
+                except Exception:
+                    # arquivo ainda sendo escrito ou inválido: tenta de novo no próximo ciclo
+                    pass
+
+        self._observador = threading.Thread(target=observar, name="observador-modelos", daemon=True)
+        self._observador.start()
+
+    def parar_observador(self) -> None:
+        if self._observador is None:
+            return
+        self._parar_observador.set()
+        self._observador.join()
+        self._observador = None
+
+
+registro = RegistroModelos()
@@ -0,0 +1,349 @@
+"""
+Simulação de Monte Carlo do restante de uma temporada.
+
+- A tabela de partida é a da temporada até `ate_rodada` (padrão: tudo que já
+  foi jogado). As partidas restantes são os confrontos mandante x visitante
+  do turno e returno que ainda não aconteceram.
+- Cada partida restante é prevista uma única vez (prever_lote), com as
+  features que o modelo usa montadas a partir da tabela atual.
+- Os resultados são sorteados em matrizes simulações x partidas com NumPy;
+  pontos e vitórias de cada time saem de um produto com a matriz de
+  incidência partidas x times.
+- As simulações são divididas em blocos de tamanho fixo, cada um com sua
+  semente derivada (SeedSequence.spawn). Com `processos` > 1 os blocos rodam
+  no pool de processos compartilhado (até IA_FUTEBOL_SIMULACAO_PROCESSOS_MAX
+  workers, iniciados por forkserver); o resultado para a mesma semente é o
+  mesmo com qualquer número de processos.
+
+Critérios de desempate: pontos, vitórias, saldo de gols, gols pró e sorteio.
+Por padrão só o resultado é sorteado (saldo e gols pró ficam os atuais);
+com `placares` os placares vêm do modelo de gols (gols_service).
+"""
+
+import math
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.config import SIMULACAO_BLOCO, SIMULACAO_PROCESSOS_MAX
+from app.services.gols_service import prever_placares_lote
+from app.services.predict_service import obter_motor, prever_lote
+from app.utils.concorrencia import no_worker_de_processo
+from app.utils.data_loader import carregar_df_brasileirao, carregar_particao_brasileirao, listar_temporadas
+
+# faixas da tabela reportadas na resposta
+VAGAS_LIBERTADORES = 6
+REBAIXADOS = 4
+
+# pool único para todas as simulações, criado na primeira que usar processos
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _tabela_atual(jogadas: pd.DataFrame, times: List[str]) -> pd.DataFrame:
+    """
+    Pontos, vitórias, saldo e gols pró de cada time nas partidas já jogadas,
+    com a colocação (1 = líder).
+    """
+    lados = []
+    for lado, outro in (("mandante", "visitante"), ("visitante", "mandante")):
+        gols = jogadas[f"gols_{lado}"].astype(float)
+        sofridos = jogadas[f"gols_{outro}"].astype(float)
+        lados.append(pd.DataFrame({
+            "time": jogadas[f"time_{lado}"].astype(str).to_numpy(),
+            "jogos": 1,
+            "pontos": np.where(gols > sofridos, 3, np.where(gols == sofridos, 1, 0)),
+            "vitorias": (gols > sofridos).to_numpy(dtype=int),
+            "gols_pro": gols.to_numpy(),
+            "saldo_gols": (gols - sofridos).to_numpy(),
+        }))
+    tabela = (
+        pd.concat(lados, ignore_index=True)
+        .groupby("time")
+        .sum()
+        .reindex(times, fill_value=0)
+        .astype(int)
+    )
+    tabela = tabela.sort_values(["pontos", "vitorias", "saldo_gols", "gols_pro"], ascending=False, kind="stable")
+    tabela["colocacao"] = np.arange(1, len(tabela) + 1)
+    return tabela.reindex(times)
+
+
+def _ultimo_valor(temporada: pd.DataFrame, coluna: str) -> Dict[str, float]:
+    # valor mais recente de cada time (mandante ou visitante) numa coluna *_mandante/_visitante
+    lados = [
+        pd.DataFrame({
+            "data": temporada["data"],
+            "time": temporada[f"time_{lado}"].astype(str),
+            "valor": temporada[f"{coluna}_{lado}"].astype(float),
+        })
+        for lado in ("mandante", "visitante")
+    ]
+    longo = pd.concat(lados, ignore_index=True).dropna(subset=["valor"]).sort_values("data", kind="stable")
+    return longo.groupby("time")["valor"].last().to_dict()
+
+
+def montar_cenario(ano: int, ate_rodada: Optional[int] = None) -> Dict:
+    """
+    Tabela atual e partidas restantes (já no formato de entrada do modelo)
+    da temporada `ano`, considerando jogadas as partidas até `ate_rodada`.
+    """
+    if ano not in listar_temporadas():
+        raise ValueError(f"Temporada não encontrada: {ano}.")
+    temporada = carregar_particao_brasileirao(ano)
+    temporada = temporada[temporada["gols_mandante"].notna() & temporada["gols_visitante"].notna()]
+
+    jogadas = temporada if ate_rodada is None else temporada[temporada["rodada"] <= ate_rodada]
+    times = sorted(set(temporada["time_mandante"].astype(str)) | set(temporada["time_visitante"].astype(str)))
+    tabela = _tabela_atual(jogadas, times)
+
+    feitos = set(zip(jogadas["time_mandante"].astype(str), jogadas["time_visitante"].astype(str)))
+    restantes = [(m, v) for m in times for v in times if m != v and (m, v) not in feitos]
+
+    # features das partidas restantes: colocação atual, último valor/idade
+    # conhecido de cada time (sem olhar o que vem depois de ate_rodada) e a
+    # lotação máxima mediana do mandante na temporada
+    base = jogadas if len(jogadas) else temporada
+    valores = {}
+    for coluna in ("valor_equipe_titular", "idade_media_titular"):
+        por_time = _ultimo_valor(base, coluna)
+        faltante = np.nanmedian(list(por_time.values())) if por_time else np.nan
+        if np.isnan(faltante):
+            # temporadas sem essa informação: mediana do histórico
+            df = carregar_df_brasileirao()
+            faltante = float(np.nanmedian(df[[f"{coluna}_mandante", f"{coluna}_visitante"]].to_numpy(dtype=float)))
+        valores[coluna] = {t: por_time.get(t, faltante) for t in times}
+    publico = temporada.groupby(temporada["time_mandante"].astype(str))["publico_max"].median().to_dict()
+    publico_padrao = float(temporada["publico_max"].median())
+
+    ultima_rodada = int(jogadas["rodada"].max()) if len(jogadas) else 0
+    rodada = min(ultima_rodada + 1, 2 * (len(times) - 1))
+    data = (jogadas["data"].max() + timedelta(days=1)) if len(jogadas) else temporada["data"].min()
+
+    partidas = [
+        {
+            "ano_campeonato": ano,
+            "rodada": rodada,
+            "colocacao_mandante": float(tabela.at[m, "colocacao"]),
+            "colocacao_visitante": float(tabela.at[v, "colocacao"]),
+            "valor_equipe_titular_mandante": valores["valor_equipe_titular"][m],
+            "valor_equipe_titular_visitante": valores["valor_equipe_titular"][v],
+            "idade_media_titular_mandante": valores["idade_media_titular"][m],
+            "idade_media_titular_visitante": valores["idade_media_titular"][v],
+            "publico_max": float(np.nan_to_num(publico.get(m, publico_padrao), nan=publico_padrao)),
+            "time_mandante": m,
+            "time_visitante": v,
+            "data": pd.Timestamp(data).date(),
+        }
+        for m, v in restantes
+    ]
+
+    posicao = {t: i for i, t in enumerate(times)}
+    return {
+        "ano": ano,
+        "ate_rodada": ultima_rodada,
+        "times": times,
+        "tabela": tabela,
+        "partidas": partidas,
+        "mandantes": np.array([posicao[m] for m, _ in restantes], dtype=np.intp),
+        "visitantes": np.array([posicao[v] for _, v in restantes], dtype=np.intp),
+    }
+
+
+def simular_bloco(
+    limites: Optional[np.ndarray],
+    placares_acumulados: Optional[np.ndarray],
+    mandantes: np.ndarray,
+    visitantes: np.ndarray,
+    tabela: np.ndarray,
+    semente: np.random.SeedSequence,
+    simulacoes: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simula `simulacoes` finais de temporada a partir de `tabela` (times x
+    pontos, vitórias, saldo, gols pró). Sorteia só o resultado, com
+    `limites` (partidas x 2: probabilidades acumuladas de vitória do
+    mandante e de empate), ou o placar, com `placares_acumulados`
+    (partidas x G², acumulada da matriz de placares achatada).
+    Retorna a contagem times x posições e a soma dos pontos finais por time.
+    """
+    n_times, n_partidas = len(tabela), len(mandantes)
+    rng = np.random.default_rng(semente)
+
+    # incidência partidas x times, para somar os pontos com um produto de matrizes
+    inc_mandante = np.zeros((n_partidas, n_times), dtype=np.float32)
+    inc_mandante[np.arange(n_partidas), mandantes] = 1
+    inc_visitante = np.zeros((n_partidas, n_times), dtype=np.float32)
+    inc_visitante[np.arange(n_partidas), visitantes] = 1
+
+    pontos, vitorias, saldo, gols_pro = (tabela[:, k] for k in range(4))
+    sorteio = rng.random((simulacoes, n_partidas), dtype=np.float32)
+    if placares_acumulados is None:
+        venceu_mandante = sorteio < limites[:, 0]
+        empate = ~venceu_mandante & (sorteio < limites[:, 1])
+        saldo_finais, gols_pro_finais = saldo, gols_pro
+    else:
+        # inversão da acumulada partida a partida (cada chamada cobre todas as simulações)
+        n_placares = placares_acumulados.shape[1]
+        indices = np.empty((simulacoes, n_partidas), dtype=np.int16)
+        for j in range(n_partidas):
+            indices[:, j] = np.searchsorted(placares_acumulados[j], sorteio[:, j], side="right")
+        gols_m, gols_v = np.divmod(np.minimum(indices, n_placares - 1), int(math.isqrt(n_placares)))
+        venceu_mandante = gols_m > gols_v
+        empate = gols_m == gols_v
+        gols_m, gols_v = gols_m.astype(np.float32), gols_v.astype(np.float32)
+        saldo_finais = saldo + (gols_m - gols_v) @ inc_mandante + (gols_v - gols_m) @ inc_visitante
+        gols_pro_finais = gols_pro + gols_m @ inc_mandante + gols_v @ inc_visitante
+    venceu_visitante = ~venceu_mandante & ~empate
+    del sorteio
+
+    pts_mandante = 3 * venceu_mandante.astype(np.float32) + empate
+    pts_visitante = 3 * venceu_visitante.astype(np.float32) + empate
+    pontos_finais = pontos + pts_mandante @ inc_mandante + pts_visitante @ inc_visitante
+    vitorias_finais = (
+        vitorias
+        + venceu_mandante.astype(np.float32) @ inc_mandante
+        + venceu_visitante.astype(np.float32) @ inc_visitante
+    )
+
+    # critérios inteiros compostos numa única chave (pontos, vitórias, saldo,
+    # gols pró); a parte fracionária sorteada só decide empates completos
+    chave = pontos_finais.astype(np.float64) * 64 + vitorias_finais
+    chave = chave * 512 + np.clip(saldo_finais + 256, 0, 511)
+    chave = chave * 512 + np.clip(gols_pro_finais, 0, 511)
+    chave = chave + rng.random((simulacoes, n_times))
+    ordem = np.argsort(-chave, axis=1)  # ordem[s, p] = time na posição p
+    contagem = np.bincount(
+        (ordem * n_times + np.arange(n_times)).ravel(), minlength=n_times * n_times
+    ).reshape(n_times, n_times)
+    return contagem, pontos_finais.sum(axis=0, dtype=np.float64)
+
+
+def _obter_pool() -> ProcessPoolExecutor:
+    """
+    Pool de processos compartilhado, com SIMULACAO_PROCESSOS_MAX workers. Os
+    workers saem de um forkserver (spawn onde ele não existe), não de um fork
+    do processo da API, que tem várias threads.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(
+                    max_workers=SIMULACAO_PROCESSOS_MAX, mp_context=multiprocessing.get_context(metodo)
+                )
+    return _pool
+
+
+def encerrar_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _simular_blocos(argumentos: tuple, blocos: List[tuple]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    # uma tarefa do pool: vários blocos (semente, simulações) em sequência
+    return [simular_bloco(*argumentos, semente, n) for semente, n in blocos]
+
+
+def _tamanhos_blocos(simulacoes: int, bloco: int) -> List[int]:
+    n_blocos = math.ceil(simulacoes / bloco)
+    return [min(bloco, simulacoes - i * bloco) for i in range(n_blocos)]
+
+
+def simular_temporada(
+    ano: int,
+    ate_rodada: Optional[int] = None,
+    simulacoes: int = 10_000,
+    semente: Optional[int] = None,
+    processos: int = 1,
+    placares: bool = False,
+    motor=None,
+) -> Dict:
+    """
+    Probabilidades de título, G6, Z4 e de cada posição final para os times
+    da temporada `ano`, a partir da tabela até `ate_rodada`. Com `placares`,
+    sorteia placares do modelo de gols (saldo e gols pró entram no desempate)
+    em vez de só o resultado do modelo ativo.
+    """
+    inicio = time.perf_counter()
+    motor = motor or obter_motor()
+    cenario = montar_cenario(ano, ate_rodada)
+    tabela = cenario["tabela"]
+    n_times = len(cenario["times"])
+
+    if placares:
+        _, matrizes = prever_placares_lote(cenario["partidas"])
+        limites, acumulados = None, np.cumsum(matrizes.reshape(len(matrizes), -1), axis=1)
+    else:
+        probs = prever_lote(cenario["partidas"], motor).reshape(-1, len(motor.classes))
+        classes = list(motor.classes)
+        p_mandante, p_empate = probs[:, classes.index("mandante")], probs[:, classes.index("empate")]
+        limites = np.column_stack([p_mandante, p_mandante + p_empate]).astype(np.float32)
+        acumulados = None
+
+    if semente is None:
+        semente = secrets.randbits(32)
+    tamanhos = _tamanhos_blocos(simulacoes, SIMULACAO_BLOCO)
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    argumentos = (
+        limites,
+        acumulados,
+        cenario["mandantes"],
+        cenario["visitantes"],
+        tabela[["pontos", "vitorias", "saldo_gols", "gols_pro"]].to_numpy(dtype=np.float32),
+    )
+
+    blocos = list(zip(sementes, tamanhos))
+    processos = max(1, min(processos, SIMULACAO_PROCESSOS_MAX, len(blocos)))
+    if processos > 1 and not no_worker_de_processo():
+        # blocos contíguos por tarefa, juntados na ordem: as somas são as mesmas do caminho sequencial
+        fatias = np.array_split(np.arange(len(blocos)), processos)
+        pool = _obter_pool()
+        futuros = [pool.submit(_simular_blocos, argumentos, [blocos[i] for i in fatia]) for fatia in fatias]
+        resultados = [r for f in futuros for r in f.result()]
+    else:
+        # com o executor de processos a simulação já roda num worker: sem pool aninhado
+        resultados = _simular_blocos(argumentos, blocos)
+
+    contagem = sum(r[0] for r in resultados)
+    soma_pontos = sum(r[1] for r in resultados)
+    distribuicao = contagem / simulacoes
+
+    classificacao = [
+        {
+            "time": t,
+            "colocacao_atual": int(tabela.at[t, "colocacao"]),
+            "jogos": int(tabela.at[t, "jogos"]),
+            "pontos": int(tabela.at[t, "pontos"]),
+            "vitorias": int(tabela.at[t, "vitorias"]),
+            "saldo_gols": int(tabela.at[t, "saldo_gols"]),
+            "pontos_esperados": float(soma_pontos[i] / simulacoes),
+            "prob_titulo": float(distribuicao[i, 0]),
+            "prob_g6": float(distribuicao[i, :VAGAS_LIBERTADORES].sum()),
+            "prob_z4": float(distribuicao[i, n_times - REBAIXADOS:].sum()),
+            "posicoes": distribuicao[i].tolist(),
+        }
+        for i, t in enumerate(cenario["times"])
+    ]
+    classificacao.sort(key=lambda linha: (-linha["pontos_esperados"], linha["colocacao_atual"]))
+
+    return {
+        "ano": ano,
+        "ate_rodada": cenario["ate_rodada"],
+        "simulacoes": simulacoes,
+        "semente": semente,
+        "processos": processos,
+        "placares": placares,
+        "partidas_restantes": len(cenario["partidas"]),
+        "tempo_ms": (time.perf_counter() - inicio) * 1000,
+        "classificacao": classificacao,
+    }
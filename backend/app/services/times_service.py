@@ -1,53 +1,116 @@
-from typing import List, Dict
-import numpy as np
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from app.config import CONFRONTO_CACHE_MAX
+from app.utils.metricas import medir
 from app.utils.data_loader import (
-    carregar_df_times,
+    carregar_indice_confrontos,
+    carregar_indice_confrontos_temporadas,
+    carregar_indice_times,
+    carregar_indice_times_temporadas,
     carregar_metricas_times,
+    carregar_metricas_times_temporadas,
+    listar_temporadas,
 )
 
 def listar_times() -> List[str]:
-    df_times = carregar_df_times()
-    times = sorted(df_times["time"].unique())
-    return times
+    return list(carregar_indice_times().nomes)
 
-def comparar_times(time_a: str, time_b: str) -> Dict:
-    df_times = carregar_df_times()
+def resolver_temporadas(
+    temporadas: Optional[List[int]] = None,
+    ultimas_temporadas: Optional[int] = None,
+) -> Optional[Tuple[int, ...]]:
+    """
+    Converte os filtros de temporada da API numa tupla ordenada de anos
+    (None = histórico completo).
+    """
+    disponiveis = listar_temporadas()
+    if temporadas:
+        ausentes = sorted(set(temporadas) - set(disponiveis))
+        if ausentes:
+            raise ValueError(f"Temporada não encontrada: {ausentes[0]}.")
+        return tuple(sorted(set(temporadas)))
+    if ultimas_temporadas:
+        return disponiveis[-ultimas_temporadas:]
+    return None
 
-    subset = df_times[df_times["time"].isin([time_a, time_b])]
+def comparar_times(time_a: str, time_b: str, temporadas: Optional[Tuple[int, ...]] = None) -> Dict:
+    with medir("carga_dados"):
+        if temporadas is None:
+            indice = carregar_indice_times()
+            indice_confrontos = carregar_indice_confrontos()
+        else:
+            indice = carregar_indice_times_temporadas(temporadas)
+            indice_confrontos = carregar_indice_confrontos_temporadas(temporadas)
 
-    if subset.empty:
-        raise ValueError("Nenhum dado encontrado para esses times.")
+    with medir("consulta_indice"):
+        ids = {t: indice.id_time(t) for t in [time_a, time_b]}
+        ausentes = [t for t, i in ids.items() if i is None]
 
-    stats = {}
+        if len(ausentes) == len(ids):
+            raise ValueError("Nenhum dado encontrado para esses times.")
+        if ausentes:
+            raise ValueError(f"Time não encontrado: {ausentes[0]}.")
 
-    for t in [time_a, time_b]:
-        jogos_time = subset[subset["time"] == t]
-        stats[t] = {
-            "jogos": int(jogos_time.shape[0]),
-            "gols_pro": float(jogos_time["gols_pro"].mean()),
-            "gols_contra": float(jogos_time["gols_contra"].mean()),
-            "vitorias": int(jogos_time["vitoria"].sum()),
-            "empates": int(jogos_time["empate"].sum()),
-            "derrotas": int(jogos_time["derrota"].sum()),
-        }
+        stats = {t: indice.estatisticas(i) for t, i in ids.items()}
 
-    total_empates = int(subset["empate"].sum())
+        # empates entre os dois times, não a soma dos empates de cada um
+        totais, _ = indice_confrontos.consultar(time_a, time_b)
+        total_empates = totais["empates"]
 
-    return {
+    resposta = {
         "time_a": time_a,
         "time_b": time_b,
         "estatisticas": stats,
         "empates_totais": total_empates,
     }
+    if temporadas is not None:
+        resposta["temporadas"] = list(temporadas)
+    return resposta
+
+@lru_cache(maxsize=CONFRONTO_CACHE_MAX)
+def confronto(
+    time_a: str,
+    time_b: str,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    casa_fora: Optional[str] = None,
+) -> Dict:
+    """
+    Retrospecto de time_a contra time_b, opcionalmente filtrado por intervalo de
+    temporadas e mando de campo (casa/fora do ponto de vista de time_a).
+    """
+    with medir("carga_dados"):
+        indice = carregar_indice_confrontos()
+
+    with medir("consulta_indice"):
+        for t in [time_a, time_b]:
+            if t not in indice.times:
+                raise ValueError(f"Time não encontrado: {t}.")
+
+        totais, por_temporada = indice.consultar(time_a, time_b, ano_inicio, ano_fim, casa_fora)
+
+    return {
+        "time_a": time_a,
+        "time_b": time_b,
+        "ano_inicio": ano_inicio,
+        "ano_fim": ano_fim,
+        "casa_fora": casa_fora,
+        "totais": totais,
+        "por_temporada": por_temporada,
+    }
 
-def perfil_time(time: str) -> Dict:
-    metricas = carregar_metricas_times()
+def perfil_time(time: str, temporadas: Optional[Tuple[int, ...]] = None) -> Dict:
+    with medir("carga_dados"):
+        if temporadas is None:
+            metricas = carregar_metricas_times()
+        else:
+            metricas = carregar_metricas_times_temporadas(temporadas)
 
-    if time not in metricas.index:
-        raise ValueError("Time não encontrado.")
+    with medir("consulta_indice"):
+        if time not in metricas.index:
+            raise ValueError("Time não encontrado.")
 
-    linha = metricas.loc[time]
+        linha = metricas.loc[time]
 
-    # transforma em dict com floats
-    perfil = {k: float(v) for k, v in linha.to_dict().items()}
-    return perfil
+    # to_dict já devolve int/float nativos; a rota tipa a resposta (PerfilTimeResposta)
+    return linha.to_dict()
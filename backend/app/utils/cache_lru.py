@@ -0,0 +1,72 @@
+"""
+Cache LRU com tempo de vida (TTL) e contadores, seguro entre threads.
+
+Diferente do functools.lru_cache, permite limpar de fora (troca de modelo),
+expirar entradas antigas e expõe acertos, falhas, remoções por limite e
+expirações.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheLRU:
+    def __init__(self, tamanho_max: int, ttl_s: float):
+        self.tamanho_max = tamanho_max
+        self.ttl_s = ttl_s
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.expirados = 0
+
+    @property
+    def habilitado(self) -> bool:
+        return self.tamanho_max > 0
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            valor, expira_em = item
+            if expira_em <= agora:
+                del self._itens[chave]
+                self.expirados += 1
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        expira_em = time.monotonic() + self.ttl_s
+        with self._lock:
+            self._itens[chave] = (valor, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_max:
+                self._itens.popitem(last=False)
+                self.remocoes += 1
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "tamanho_max": self.tamanho_max,
+                "ttl_s": self.ttl_s,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "expirados": self.expirados,
+                "taxa_acerto": self.acertos / consultas if consultas else None,
+            }
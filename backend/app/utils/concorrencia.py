@@ -0,0 +1,166 @@
+"""
+Execução do trabalho pesado das rotas fora do event loop, com limites de
+concorrência por grupo de endpoints.
+
+- Os handlers são async e mandam o trabalho de CPU (pandas, inferência,
+  simulação) para um executor dedicado, de threads ou de processos
+  (IA_FUTEBOL_EXECUTOR), com IA_FUTEBOL_EXECUTOR_WORKERS workers.
+- Cada grupo (previsao, consultas, simulacao) tem um semáforo: no máximo N
+  requisições do grupo executam ao mesmo tempo; as demais esperam numa fila
+  de tamanho limitado e, com a fila cheia, a requisição recebe 503 na hora
+  em vez de acumular latência.
+- Cada grupo mede em execução, fila atual e máxima, rejeitadas e tempo
+  médio de espera, expostos em GET /admin/concorrencia.
+
+Com executor de processos, o trabalho roda em outra cópia dos dados (os
+loaders lazy de cada processo) e os argumentos e o resultado são
+serializados; o motor do modelo vai como argumento, então a troca de
+modelo no registro continua valendo para as próximas requisições.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from fastapi import HTTPException
+from app.config import AQUECIMENTO, EXECUTOR, EXECUTOR_WORKERS, FILA_MAX, LIMITES_CONCORRENCIA, PERFIL
+from app.utils.perfilador import executar_perfilado, perfil_da_requisicao
+
+
+class LimiteConcorrencia:
+    def __init__(self, nome: str, maximo: int, fila_max: int):
+        self.nome = nome
+        self.maximo = maximo
+        self.fila_max = fila_max
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.em_execucao = 0
+        self.na_fila = 0
+        self.fila_pico = 0
+        self.concluidas = 0
+        self.rejeitadas = 0
+        self.espera_total_s = 0.0
+
+    async def __aenter__(self):
+        # o semáforo pertence ao event loop em que foi criado (um novo loop, ex.: em testes, cria outro)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaforo, self._loop = asyncio.Semaphore(self.maximo), loop
+        if self._semaforo.locked() and self.na_fila >= self.fila_max:
+            self.rejeitadas += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Servidor ocupado ({self.nome}): tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+        self.na_fila += 1
+        self.fila_pico = max(self.fila_pico, self.na_fila)
+        inicio = time.perf_counter()
+        try:
+            await self._semaforo.acquire()
+        finally:
+            self.na_fila -= 1
+        self.espera_total_s += time.perf_counter() - inicio
+        self.em_execucao += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.em_execucao -= 1
+        self.concluidas += 1
+        self._semaforo.release()
+
+    def situacao(self) -> Dict:
+        atendidas = self.concluidas + self.em_execucao
+        return {
+            "maximo": self.maximo,
+            "fila_max": self.fila_max,
+            "em_execucao": self.em_execucao,
+            "na_fila": self.na_fila,
+            "fila_pico": self.fila_pico,
+            "concluidas": self.concluidas,
+            "rejeitadas": self.rejeitadas,
+            "espera_media_ms": self.espera_total_s / atendidas * 1000 if atendidas else None,
+        }
+
+
+limites: Dict[str, LimiteConcorrencia] = {
+    nome: LimiteConcorrencia(nome, maximo, FILA_MAX) for nome, maximo in LIMITES_CONCORRENCIA.items()
+}
+
+_executor: Optional[Executor] = None
+_lock = threading.Lock()
+# True nos processos do executor de processos (ver no_worker_de_processo)
+_worker_de_processo = False
+
+
+def _iniciar_worker() -> None:
+    global _worker_de_processo
+    _worker_de_processo = True
+    if AQUECIMENTO:
+        from app.services.aquecimento import aquecer
+        aquecer()
+
+
+def no_worker_de_processo() -> bool:
+    """
+    Indica se o código roda num worker do executor de processos (onde não se
+    deve abrir outro pool de processos).
+    """
+    return _worker_de_processo
+
+
+def obter_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                if EXECUTOR == "processo":
+                    # com fork os dados já aquecidos no processo principal são herdados
+                    # e o aquecimento no worker é imediato; com spawn ele carrega tudo
+                    _executor = ProcessPoolExecutor(max_workers=EXECUTOR_WORKERS, initializer=_iniciar_worker)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="cpu")
+    return _executor
+
+
+def encerrar_executor() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def executar(grupo: str, func: Callable, *args, **kwargs):
+    """
+    Executa func(*args, **kwargs) no executor, respeitando o limite do grupo.
+    """
+    chamada = functools.partial(func, *args, **kwargs)
+    # requisição sorteada pelo MiddlewarePerfil: o trabalho no executor (threads) entra no perfil dela
+    perfil = perfil_da_requisicao() if PERFIL and EXECUTOR != "processo" else None
+    if perfil is not None:
+        chamada = functools.partial(executar_perfilado, perfil, func, *args, **kwargs)
+    async with limites[grupo]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(obter_executor(), chamada)
+
+
+async def executar_em_thread(func: Callable, *args, **kwargs):
+    """
+    Executa func numa thread deste processo (executor padrão do event loop),
+    fora dos limites dos grupos: para consultas rápidas ao estado do processo
+    principal (ex.: escolher o modelo no registro, que só na primeira vez o
+    carrega), antes da requisição ocupar sua vaga com executar().
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def situacao() -> Dict:
+    return {
+        "executor": EXECUTOR,
+        "workers": EXECUTOR_WORKERS,
+        "grupos": {nome: limite.situacao() for nome, limite in limites.items()},
+    }
@@ -1,6 +1,19 @@
+import json
 from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 import pandas as pd
+import numpy as np
+from app.config import FEATURES_JANELA, FORMATO_DADOS
+from app.utils.esquema import aplicar_esquema, assinatura_arquivo
+from app.utils.features_times import FeaturesTimes, construir_features_times
+from app.utils.indice_confrontos import IndiceConfrontos, construir_indice_confrontos
+from app.utils.indice_times import IndiceTimes, construir_indice_times
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow é opcional: sem ele a base é lida do CSV
+    feather = None
 
 def _get_root_dir() -> Path:
     # este arquivo está em backend/app/utils
@@ -8,19 +21,104 @@ def _get_root_dir() -> Path:
     root_dir = backend_dir.parent                      # .../ia-futebol-brasil
     return root_dir
 
+def _csv_base_final() -> Path:
+    return _get_root_dir() / "data" / "final" / "brasileirao_final.csv"
+
+@lru_cache
+def _assinatura_base_final() -> Optional[Dict]:
+    # tamanho + SHA-1 do CSV, comparados com os gravados pelo ETL no Feather e
+    # no manifesto das partições (mtime não serve: git checkout e cópias o mudam)
+    csv_path = _csv_base_final()
+    return assinatura_arquivo(csv_path) if csv_path.exists() else None
+
+def _origem_feather(path: Path) -> Optional[Dict]:
+    # só o esquema é lido: com memory_map, os dados ficam no arquivo
+    metadados = feather.read_table(path, memory_map=True).schema.metadata or {}
+    origem = metadados.get(b"origem")
+    return json.loads(origem) if origem is not None else None
+
+def _usar_feather(csv_path: Path, feather_path: Path) -> bool:
+    if FORMATO_DADOS == "csv":
+        return False
+    if FORMATO_DADOS == "feather":
+        if feather is None:
+            raise RuntimeError("IA_FUTEBOL_FORMATO_DADOS=feather exige o pacote pyarrow.")
+        return True
+    if feather is None or not feather_path.exists():
+        return False
+    # Feather gerado de outro CSV: base foi regerada e o export não
+    return not csv_path.exists() or _origem_feather(feather_path) == _assinatura_base_final()
+
+def _ler_feather(path: Path) -> pd.DataFrame:
+    # memory_map + split_blocks: colunas numéricas sem nulos apontam direto para
+    # as páginas do arquivo, compartilhadas entre os workers pelo page cache
+    tabela = feather.read_table(path, memory_map=True)
+    return tabela.to_pandas(split_blocks=True)
+
 @lru_cache
 def carregar_df_brasileirao() -> pd.DataFrame:
-    root_dir = _get_root_dir()
-    data_path = root_dir / "data" / "final" / "brasileirao_final.csv"
-    df = pd.read_csv(data_path)
-    return df
+    csv_path = _csv_base_final()
+    feather_path = csv_path.with_suffix(".feather")
+
+    if _usar_feather(csv_path, feather_path):
+        return aplicar_esquema(_ler_feather(feather_path))
+
+    df = pd.read_csv(csv_path)
+    return aplicar_esquema(df)
+
+def _dir_particoes() -> Path:
+    return _get_root_dir() / "data" / "partitioned" / "brasileirao_final"
+
+@lru_cache
+def _manifesto_particoes() -> Optional[Dict]:
+    """
+    Manifesto das partições por temporada gravadas por etl/etl_particionamento.py,
+    ou None se não existirem, estiverem desatualizadas ou não puderem ser lidas.
+    """
+    if FORMATO_DADOS == "csv":
+        return None
+    path = _dir_particoes() / "_manifesto.json"
+    if not path.exists():
+        return None
+    manifesto = json.loads(path.read_text(encoding="utf-8"))
+    if _csv_base_final().exists() and manifesto.get("origem") != _assinatura_base_final():
+        return None
+    if manifesto.get("formato") == "feather" and feather is None:
+        return None
+    return manifesto
+
+@lru_cache
+def listar_temporadas() -> Tuple[int, ...]:
+    manifesto = _manifesto_particoes()
+    if manifesto is not None:
+        return tuple(sorted(int(ano) for ano in manifesto["particoes"]))
+    anos = carregar_df_brasileirao()["ano_campeonato"].dropna().unique()
+    return tuple(sorted(int(ano) for ano in anos))
+
+@lru_cache(maxsize=None)
+def carregar_particao_brasileirao(ano: int) -> pd.DataFrame:
+    """
+    Partidas de uma única temporada. Com partições em disco só o arquivo da
+    temporada é lido; sem elas, recorta a base completa.
+    """
+    manifesto = _manifesto_particoes()
+    if manifesto is None:
+        df = carregar_df_brasileirao()
+        return df[df["ano_campeonato"] == ano].reset_index(drop=True)
+
+    info = manifesto["particoes"].get(str(ano))
+    if info is None:
+        raise ValueError(f"Temporada não encontrada: {ano}.")
+    path = _dir_particoes() / info["arquivo"]
+    if manifesto["formato"] == "feather":
+        return aplicar_esquema(_ler_feather(path))
+    return aplicar_esquema(pd.read_csv(path))
 
 def _construir_base_times(df: pd.DataFrame) -> pd.DataFrame:
     # mesma lógica do notebook 05
     mandante = pd.DataFrame({
         "time": df["time_mandante"],
         "adversario": df["time_visitante"],
-        "casa_fora": "casa",
         "ano_campeonato": df["ano_campeonato"],
         "gols_pro": df["gols_mandante"],
         "gols_contra": df["gols_visitante"],
@@ -32,15 +130,14 @@ def _construir_base_times(df: pd.DataFrame) -> pd.DataFrame:
         "faltas_contra": df["faltas_visitante"],
         "defesas_pro": df["defesas_mandante"],
         "defesas_contra": df["defesas_visitante"],
-        "vitoria": (df["mandante_venceu"] == 1).astype(int),
-        "empate": (df["empate_flag"] == 1).astype(int),
-        "derrota": (df["visitante_venceu"] == 1).astype(int),
+        "vitoria": df["mandante_venceu"] == 1,
+        "empate": df["empate_flag"] == 1,
+        "derrota": df["visitante_venceu"] == 1,
     })
 
     visitante = pd.DataFrame({
         "time": df["time_visitante"],
         "adversario": df["time_mandante"],
-        "casa_fora": "fora",
         "ano_campeonato": df["ano_campeonato"],
         "gols_pro": df["gols_visitante"],
         "gols_contra": df["gols_mandante"],
@@ -52,12 +149,16 @@ def _construir_base_times(df: pd.DataFrame) -> pd.DataFrame:
         "faltas_contra": df["faltas_mandante"],
         "defesas_pro": df["defesas_visitante"],
         "defesas_contra": df["defesas_mandante"],
-        "vitoria": (df["visitante_venceu"] == 1).astype(int),
-        "empate": (df["empate_flag"] == 1).astype(int),
-        "derrota": (df["mandante_venceu"] == 1).astype(int),
+        "vitoria": df["visitante_venceu"] == 1,
+        "empate": df["empate_flag"] == 1,
+        "derrota": df["mandante_venceu"] == 1,
     })
 
+    # time/adversario herdam as categorias da base; casa_fora vira categoria
+    # em vez de uma string repetida por linha
     df_times = pd.concat([mandante, visitante], ignore_index=True)
+    codigos_mando = np.repeat(np.array([0, 1], dtype=np.int8), [len(mandante), len(visitante)])
+    df_times.insert(2, "casa_fora", pd.Categorical.from_codes(codigos_mando, categories=["casa", "fora"]))
     return df_times
 
 @lru_cache
@@ -66,9 +167,18 @@ def carregar_df_times() -> pd.DataFrame:
     return _construir_base_times(df)
 
 @lru_cache
-def carregar_metricas_times() -> pd.DataFrame:
-    df_times = carregar_df_times()
-    agrupado = df_times.groupby("time").agg(
+def carregar_indice_times() -> IndiceTimes:
+    return construir_indice_times(carregar_df_times())
+
+@lru_cache
+def carregar_indice_confrontos() -> IndiceConfrontos:
+    return construir_indice_confrontos(carregar_df_times())
+
+def _agregar_metricas(df_times: pd.DataFrame) -> pd.DataFrame:
+    # médias em float64, como antes da tipagem compacta (float32/Int8/bool)
+    numericas = df_times.columns.drop(["time", "adversario", "casa_fora", "ano_campeonato"])
+    df_times = df_times.astype({col: "float64" for col in numericas})
+    agrupado = df_times.groupby("time", observed=True).agg(
         jogos=("time", "count"),
         gols_pro=("gols_pro", "mean"),
         gols_contra=("gols_contra", "mean"),
@@ -82,3 +192,33 @@ def carregar_metricas_times() -> pd.DataFrame:
         taxa_derrotas=("derrota", "mean"),
     )
     return agrupado
+
+@lru_cache
+def carregar_metricas_times() -> pd.DataFrame:
+    return _agregar_metricas(carregar_df_times())
+
+@lru_cache
+def carregar_features_times() -> FeaturesTimes:
+    return construir_features_times(carregar_df_brasileirao(), FEATURES_JANELA)
+
+# Versões por conjunto de temporadas: carregam só as partições pedidas.
+# `temporadas` é uma tupla ordenada (hashable, para o lru_cache).
+
+@lru_cache(maxsize=None)
+def carregar_df_times_temporada(ano: int) -> pd.DataFrame:
+    return _construir_base_times(carregar_particao_brasileirao(ano))
+
+def carregar_df_times_temporadas(temporadas: Tuple[int, ...]) -> pd.DataFrame:
+    return pd.concat([carregar_df_times_temporada(ano) for ano in temporadas], ignore_index=True)
+
+@lru_cache(maxsize=64)
+def carregar_indice_times_temporadas(temporadas: Tuple[int, ...]) -> IndiceTimes:
+    return construir_indice_times(carregar_df_times_temporadas(temporadas))
+
+@lru_cache(maxsize=64)
+def carregar_indice_confrontos_temporadas(temporadas: Tuple[int, ...]) -> IndiceConfrontos:
+    return construir_indice_confrontos(carregar_df_times_temporadas(temporadas))
+
+@lru_cache(maxsize=64)
+def carregar_metricas_times_temporadas(temporadas: Tuple[int, ...]) -> pd.DataFrame:
+    return _agregar_metricas(carregar_df_times_temporadas(temporadas))
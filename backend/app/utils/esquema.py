@@ -0,0 +1,16 @@
+"""
+Esquema de tipos da base final, definido em etl/esquema.py e usado tanto
+pelo ETL quanto pelo backend.
+"""
+
+import sys
+from pathlib import Path
+
+# etl/ fica na raiz do repositório, fora do pacote do backend
+_ROOT_DIR = str(Path(__file__).resolve().parents[3])
+if _ROOT_DIR not in sys.path:
+    sys.path.append(_ROOT_DIR)
+
+from etl.esquema import aplicar_esquema, assinatura_arquivo, memoria_bytes  # noqa: E402
+
+__all__ = ["aplicar_esquema", "assinatura_arquivo", "memoria_bytes"]
@@ -0,0 +1,150 @@
+"""
+Features dinâmicas por time: rating Elo, forma recente (pontos por jogo nas
+últimas N partidas) e médias móveis de gols pró/contra.
+
+Tudo é calculado numa única passagem cronológica pela base: para cada time
+guardamos a data de cada partida e o estado logo depois dela. A consulta
+(time, data) é uma busca binária nessas datas e devolve o estado com as
+partidas estritamente anteriores à data, ou seja, o que se sabia antes do
+jogo. Partidas novas entram com atualizar(), sem recalcular o histórico.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+FEATURES = ("elo", "forma", "gols_pro_recentes", "gols_contra_recentes", "jogos")
+
+# campos da partida sem os quais as features não podem ser calculadas
+CAMPOS_PARTIDA = ("time_mandante", "time_visitante", "data")
+
+ELO_INICIAL = 1500.0
+ELO_K = 20.0
+# vantagem do mandante, em pontos de Elo
+ELO_VANTAGEM_CASA = 60.0
+
+Estado = Tuple[float, float, float, float, int]
+
+
+def _instante(data) -> int:
+    # datas comparadas como inteiros (ns desde a época)
+    if isinstance(data, (int, np.integer)):
+        return int(data)
+    return pd.Timestamp(data).value
+
+
+class FeaturesTimes:
+    def __init__(self, janela: int = 5):
+        self.janela = janela
+        self._datas: Dict[str, List[int]] = {}
+        self._estados: Dict[str, List[Estado]] = {}
+        self._recentes: Dict[str, Deque[Tuple[int, float, float]]] = {}
+        self._somas: Dict[str, List[float]] = {}
+        self._elo: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, time: str, instante: int, pontos: int, gols_pro: float, gols_contra: float) -> None:
+        # somas da janela mantidas incrementalmente: sai a partida mais antiga, entra a nova
+        recentes = self._recentes.setdefault(time, deque(maxlen=self.janela))
+        somas = self._somas.setdefault(time, [0.0, 0.0, 0.0])
+        if len(recentes) == self.janela:
+            antiga = recentes[0]
+            somas[0] -= antiga[0]
+            somas[1] -= antiga[1]
+            somas[2] -= antiga[2]
+        recentes.append((pontos, gols_pro, gols_contra))
+        somas[0] += pontos
+        somas[1] += gols_pro
+        somas[2] += gols_contra
+        n = len(recentes)
+        estado = (self._elo[time], somas[0] / n, somas[1] / n, somas[2] / n, len(self._datas.get(time, ())) + 1)
+        # estado primeiro, data depois: consultar() usa len(datas) e nunca vê
+        # uma data sem o estado correspondente
+        self._estados.setdefault(time, []).append(estado)
+        self._datas.setdefault(time, []).append(instante)
+
+    def atualizar(self, time_mandante: str, time_visitante: str, data, gols_mandante: float, gols_visitante: float) -> None:
+        """
+        Incorpora uma partida nova. As partidas precisam chegar em ordem
+        cronológica para cada time.
+        """
+        instante = _instante(data)
+        with self._lock:
+            for time in (time_mandante, time_visitante):
+                datas = self._datas.get(time)
+                if datas and instante < datas[-1]:
+                    raise ValueError(f"Partida de {time} anterior à última já registrada.")
+
+            elo_m = self._elo.setdefault(time_mandante, ELO_INICIAL)
+            elo_v = self._elo.setdefault(time_visitante, ELO_INICIAL)
+            esperado_m = 1.0 / (1.0 + 10 ** ((elo_v - elo_m - ELO_VANTAGEM_CASA) / 400))
+            if gols_mandante > gols_visitante:
+                resultado_m, pontos_m, pontos_v = 1.0, 3, 0
+            elif gols_mandante < gols_visitante:
+                resultado_m, pontos_m, pontos_v = 0.0, 0, 3
+            else:
+                resultado_m, pontos_m, pontos_v = 0.5, 1, 1
+            delta = ELO_K * (resultado_m - esperado_m)
+            self._elo[time_mandante] = elo_m + delta
+            self._elo[time_visitante] = elo_v - delta
+
+            self._registrar(time_mandante, instante, pontos_m, gols_mandante, gols_visitante)
+            self._registrar(time_visitante, instante, pontos_v, gols_visitante, gols_mandante)
+
+    def consultar(self, time: str, data=None) -> Dict:
+        """
+        Features do time antes da data (sem data: depois da última partida).
+        """
+        datas = self._datas.get(time)
+        if datas is None:
+            raise ValueError(f"Time não encontrado: {time}.")
+        n = len(datas) if data is None else bisect_left(datas, _instante(data))
+        estado = self._estados[time][n - 1] if n else (ELO_INICIAL, 0.0, 0.0, 0.0, 0)
+        return dict(zip(FEATURES, estado))
+
+    def features_partida(self, time_mandante: str, time_visitante: str, data=None) -> Dict:
+        """
+        Features dos dois times, com sufixo _mandante/_visitante (mesma
+        convenção das colunas da base).
+        """
+        features = {}
+        for time, lado in ((time_mandante, "mandante"), (time_visitante, "visitante")):
+            for nome, valor in self.consultar(time, data).items():
+                features[f"{nome}_{lado}"] = valor
+        return features
+
+
+def entrada_obrigatoria(colunas: List[str]) -> Tuple[str, ...]:
+    """
+    Campos da partida exigidos por um modelo com estas colunas: os times e a
+    data se alguma delas for uma feature dinâmica, senão nenhum.
+    """
+    sufixos = ("_mandante", "_visitante")
+    dinamica = any(col.endswith(sufixos) and col.rsplit("_", 1)[0] in FEATURES for col in colunas)
+    return CAMPOS_PARTIDA if dinamica else ()
+
+
+def construir_features_times(df: pd.DataFrame, janela: int = 5) -> FeaturesTimes:
+    """
+    Uma passagem pela base em ordem de data (empates na data mantêm a ordem
+    original). Partidas sem placar são ignoradas.
+    """
+    features = FeaturesTimes(janela)
+    instantes = pd.to_datetime(df["data"]).to_numpy(dtype="datetime64[ns]")
+    ordem = np.argsort(instantes, kind="stable")
+    validos = ~np.isnat(instantes[ordem])
+    datas = instantes[ordem].view(np.int64)
+    mandantes = df["time_mandante"].to_numpy(dtype=object)[ordem]
+    visitantes = df["time_visitante"].to_numpy(dtype=object)[ordem]
+    gols_m = df["gols_mandante"].to_numpy(dtype=np.float64, na_value=np.nan)[ordem]
+    gols_v = df["gols_visitante"].to_numpy(dtype=np.float64, na_value=np.nan)[ordem]
+
+    for data, valido, mandante, visitante, gm, gv in zip(datas, validos, mandantes, visitantes, gols_m, gols_v):
+        if not valido or np.isnan(gm) or np.isnan(gv):
+            continue
+        features.atualizar(mandante, visitante, data, float(gm), float(gv))
+    return features
+
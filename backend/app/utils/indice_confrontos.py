@@ -0,0 +1,112 @@
+"""
+Índice de confrontos diretos por (time, adversário, temporada, mando).
+
+Para cada par (time, adversário) guardamos as temporadas em que se enfrentaram
+e somas acumuladas (prefix sums) das métricas por mando de campo. Qualquer
+recorte "A contra B, em casa/fora, entre as temporadas X e Y" vira duas buscas
+binárias e uma subtração, sem varrer a tabela de partidas.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+METRICAS = ["jogos", "vitorias", "empates", "derrotas", "gols_pro", "gols_contra"]
+MANDOS = ["casa", "fora"]
+
+
+@dataclass(frozen=True)
+class SerieConfronto:
+    temporadas: np.ndarray
+    # shape (mandos, temporadas, métricas): valores por temporada
+    valores: np.ndarray
+    # shape (mandos, temporadas + 1, métricas): somas acumuladas de `valores`
+    acumulado: np.ndarray
+
+
+class IndiceConfrontos:
+    def __init__(self, series: Dict[Tuple[str, str], SerieConfronto], times: set):
+        self.series = series
+        self.times = times
+
+    def consultar(
+        self,
+        time: str,
+        adversario: str,
+        ano_inicio: Optional[int] = None,
+        ano_fim: Optional[int] = None,
+        casa_fora: Optional[str] = None,
+    ) -> Tuple[Dict[str, int], List[Dict[str, int]]]:
+        """
+        Retorna (totais, por_temporada) das partidas de `time` contra `adversario`,
+        do ponto de vista de `time`. casa_fora=None soma os dois mandos.
+        """
+        serie = self.series.get((time, adversario))
+        if serie is None:
+            return dict.fromkeys(METRICAS, 0), []
+
+        mandos = slice(None) if casa_fora is None else slice(MANDOS.index(casa_fora), MANDOS.index(casa_fora) + 1)
+
+        inicio = 0 if ano_inicio is None else int(np.searchsorted(serie.temporadas, ano_inicio, side="left"))
+        fim = len(serie.temporadas) if ano_fim is None else int(np.searchsorted(serie.temporadas, ano_fim, side="right"))
+        if fim <= inicio:
+            return dict.fromkeys(METRICAS, 0), []
+
+        acumulado = serie.acumulado[mandos]
+        totais = (acumulado[:, fim] - acumulado[:, inicio]).sum(axis=0)
+
+        por_temporada = []
+        valores = serie.valores[mandos, inicio:fim].sum(axis=0)
+        for ano, linha in zip(serie.temporadas[inicio:fim], valores):
+            if linha[0] == 0:
+                continue
+            por_temporada.append({"ano_campeonato": int(ano), **_metricas_dict(linha)})
+
+        return _metricas_dict(totais), por_temporada
+
+
+def _metricas_dict(linha: np.ndarray) -> Dict[str, int]:
+    return {m: int(v) for m, v in zip(METRICAS, linha)}
+
+
+def construir_indice_confrontos(df_times: pd.DataFrame) -> IndiceConfrontos:
+    agrupado = (
+        df_times.assign(jogos=1)
+        .groupby(["time", "adversario", "ano_campeonato", "casa_fora"], observed=True)
+        .agg(
+            jogos=("jogos", "sum"),
+            vitorias=("vitoria", "sum"),
+            empates=("empate", "sum"),
+            derrotas=("derrota", "sum"),
+            gols_pro=("gols_pro", "sum"),
+            gols_contra=("gols_contra", "sum"),
+        )
+    )
+
+    # uma linha por (time, adversario, temporada), colunas (métrica, mando)
+    tabela = (
+        agrupado.unstack("casa_fora", fill_value=0)
+        .reindex(columns=pd.MultiIndex.from_product([METRICAS, MANDOS]), fill_value=0)
+        .sort_index()
+    )
+    n_linhas = len(tabela)
+    valores = tabela.to_numpy(dtype=np.int64).reshape(n_linhas, len(METRICAS), len(MANDOS))
+    valores = np.ascontiguousarray(valores.transpose(2, 0, 1))
+    temporadas = tabela.index.get_level_values("ano_campeonato").to_numpy(dtype=np.int64)
+
+    # linhas do mesmo par são contíguas: basta achar onde o par muda
+    pares = tabela.index.droplevel("ano_campeonato")
+    codigos, _ = pd.factorize(pares)
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    fins = np.r_[inicios[1:], n_linhas]
+
+    series = {}
+    for inicio, fim in zip(inicios, fins):
+        time, adversario = pares[inicio]
+        bloco = valores[:, inicio:fim]
+        acumulado = np.zeros((len(MANDOS), fim - inicio + 1, len(METRICAS)), dtype=np.int64)
+        np.cumsum(bloco, axis=1, out=acumulado[:, 1:])
+        series[(str(time), str(adversario))] = SerieConfronto(temporadas[inicio:fim], bloco, acumulado)
+
+    return IndiceConfrontos(series, set(str(t) for t in df_times["time"].unique()))
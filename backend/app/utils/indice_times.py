@@ -0,0 +1,69 @@
+"""
+Índice em memória das estatísticas por time.
+
+Construído uma vez a partir da base de times (uma linha por time por partida):
+cada time recebe um id inteiro (posição na lista ordenada de nomes) e os
+agregados ficam em arrays NumPy indexados por esse id. Assim /times e
+/comparar-times viram consultas O(1), sem filtrar o DataFrame a cada requisição.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class IndiceTimes:
+    nomes: Tuple[str, ...]
+    id_por_nome: Dict[str, int]
+    jogos: np.ndarray
+    gols_pro: np.ndarray
+    gols_contra: np.ndarray
+    vitorias: np.ndarray
+    empates: np.ndarray
+    derrotas: np.ndarray
+
+    def id_time(self, nome: str) -> Optional[int]:
+        return self.id_por_nome.get(nome)
+
+    def estatisticas(self, id_time: int) -> Dict:
+        return {
+            "jogos": int(self.jogos[id_time]),
+            "gols_pro": float(self.gols_pro[id_time]),
+            "gols_contra": float(self.gols_contra[id_time]),
+            "vitorias": int(self.vitorias[id_time]),
+            "empates": int(self.empates[id_time]),
+            "derrotas": int(self.derrotas[id_time]),
+        }
+
+
+def _media_por_time(codigos: np.ndarray, valores: pd.Series, n_times: int) -> np.ndarray:
+    # equivalente a groupby().mean(): ignora NaN no numerador e no denominador
+    valores = valores.to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = ~np.isnan(valores)
+    soma = np.bincount(codigos[validos], weights=valores[validos], minlength=n_times)
+    contagem = np.bincount(codigos[validos], minlength=n_times)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return soma / contagem
+
+
+def _soma_por_time(codigos: np.ndarray, valores: pd.Series, n_times: int) -> np.ndarray:
+    return np.bincount(codigos, weights=valores.to_numpy(dtype=np.float64, na_value=np.nan), minlength=n_times).astype(np.int64)
+
+
+def construir_indice_times(df_times: pd.DataFrame) -> IndiceTimes:
+    codigos, nomes = pd.factorize(df_times["time"], sort=True)
+    nomes = tuple(str(n) for n in nomes)
+    n_times = len(nomes)
+
+    return IndiceTimes(
+        nomes=nomes,
+        id_por_nome={nome: i for i, nome in enumerate(nomes)},
+        jogos=np.bincount(codigos, minlength=n_times),
+        gols_pro=_media_por_time(codigos, df_times["gols_pro"], n_times),
+        gols_contra=_media_por_time(codigos, df_times["gols_contra"], n_times),
+        vitorias=_soma_por_time(codigos, df_times["vitoria"], n_times),
+        empates=_soma_por_time(codigos, df_times["empate"], n_times),
+        derrotas=_soma_por_time(codigos, df_times["derrota"], n_times),
+    )
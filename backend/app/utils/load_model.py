@@ -1,8 +1,27 @@
+import json
 import joblib
 from pathlib import Path
+from typing import Dict, List
 
-def carregar_modelo():
-    base_dir = Path(__file__).resolve().parents[2]
-    modelo_path = base_dir / "app" / "models" / "modelo_basico.pkl"
+# modelos versionados ficam aqui como <nome>.pkl (+ <nome>.json com as métricas
+# quando gerados por training/treinar.py)
+MODELOS_DIR = Path(__file__).resolve().parents[1] / "models"
+
+def listar_modelos() -> List[str]:
+    return sorted(path.stem for path in MODELOS_DIR.glob("*.pkl"))
+
+def carregar_modelo(nome: str = "modelo_basico"):
+    if Path(nome).name != nome:
+        raise ValueError(f"Nome de modelo inválido: {nome}.")
+    modelo_path = MODELOS_DIR / f"{nome}.pkl"
+    if not modelo_path.exists():
+        raise FileNotFoundError(f"Modelo não encontrado: {nome} (disponíveis: {', '.join(listar_modelos())}).")
     modelo = joblib.load(modelo_path)
     return modelo
+
+def carregar_metadados(nome: str) -> Dict:
+    # <nome>.json gravado por training/treinar.py; vazio para modelos sem ele
+    metadados_path = MODELOS_DIR / f"{nome}.json"
+    if not metadados_path.exists():
+        return {}
+    return json.loads(metadados_path.read_text(encoding="utf-8"))
@@ -0,0 +1,287 @@
+"""
+Métricas em memória do processo, exportadas em GET /metrics no formato texto
+do Prometheus.
+
+- Por rota: latência total e de cada fase do handler do FastAPI
+  (validacao: leitura do corpo e validação da entrada; execucao: a função da
+  rota; codificacao: conversão e serialização da resposta), medidas pela
+  RotaInstrumentada, mais o total de respostas por status.
+- Por etapa interna (carga_dados, consulta_indice, features_dinamicas,
+  montagem_matriz, inferencia): `with medir("etapa"):` nos services.
+- Coletores chamados só na leitura do /metrics (acertos dos lru_cache, cache
+  de previsões, filas de concorrência).
+
+Cada observação custa duas leituras do relógio, uma busca binária nas faixas
+e um lock (da ordem de 1 µs). Com executor de processos, as etapas internas
+executadas nos workers ficam nos workers e não aparecem aqui; as métricas
+por rota continuam completas.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+# limites superiores das faixas dos histogramas, em segundos
+FAIXAS_S = (
+    25e-6, 50e-6, 100e-6, 250e-6, 500e-6,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# (nome, tipo, ajuda, rótulos, valor) produzido por um coletor
+Amostra = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(rotulos: Dict[str, str]) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in rotulos.items()) + "}"
+
+
+class Histograma:
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_S) + 1)
+        self.soma = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, segundos: float) -> None:
+        faixa = bisect_left(FAIXAS_S, segundos)
+        # acquire/release explícitos: metade do custo do `with` no caminho de cada requisição
+        self._lock.acquire()
+        self.contagens[faixa] += 1
+        self.soma += segundos
+        self._lock.release()
+
+    def linhas(self, nome: str, rotulos: Dict[str, str]) -> List[str]:
+        with self._lock:
+            contagens, soma = list(self.contagens), self.soma
+        linhas, acumulado = [], 0
+        for limite, contagem in zip(FAIXAS_S + (float("inf"),), contagens):
+            acumulado += contagem
+            le = "+Inf" if limite == float("inf") else repr(limite)
+            linhas.append(f"{nome}_bucket{_rotulos({**rotulos, 'le': le})} {acumulado}")
+        linhas.append(f"{nome}_sum{_rotulos(rotulos)} {soma!r}")
+        linhas.append(f"{nome}_count{_rotulos(rotulos)} {acumulado}")
+        return linhas
+
+
+class Contador:
+    def __init__(self):
+        self.valor = 0
+        self._lock = threading.Lock()
+
+    def incrementar(self, n: int = 1) -> None:
+        self._lock.acquire()
+        self.valor += n
+        self._lock.release()
+
+
+class RegistroMetricas:
+    def __init__(self):
+        # nome -> (tipo, ajuda, {rótulos ordenados: métrica})
+        self._metricas: Dict[str, Tuple[str, str, Dict[Tuple, object]]] = {}
+        self._coletores: List[Callable[[], Iterable[Amostra]]] = []
+        self._lock = threading.Lock()
+
+    def _obter(self, tipo: str, classe, nome: str, ajuda: str, rotulos: Dict[str, str]):
+        chave = tuple(sorted(rotulos.items()))
+        familia = self._metricas.get(nome)
+        if familia is not None:
+            metrica = familia[2].get(chave)
+            if metrica is not None:
+                return metrica
+        with self._lock:
+            familia = self._metricas.setdefault(nome, (tipo, ajuda, {}))
+            return familia[2].setdefault(chave, classe())
+
+    def histograma(self, nome: str, ajuda: str, **rotulos: str) -> Histograma:
+        return self._obter("histogram", Histograma, nome, ajuda, rotulos)
+
+    def contador(self, nome: str, ajuda: str, **rotulos: str) -> Contador:
+        return self._obter("counter", Contador, nome, ajuda, rotulos)
+
+    def coletor(self, func: Callable[[], Iterable[Amostra]]) -> None:
+        """Registra uma função lida a cada exportação (gauges e contadores externos)."""
+        self._coletores.append(func)
+
+    def exportar(self) -> str:
+        linhas: List[str] = []
+        for nome, (tipo, ajuda, series) in sorted(self._metricas.items()):
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}"]
+            for chave, metrica in list(series.items()):
+                rotulos = dict(chave)
+                if isinstance(metrica, Histograma):
+                    linhas += metrica.linhas(nome, rotulos)
+                else:
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {metrica.valor}")
+
+        familias: Dict[str, Tuple[str, str, List[str]]] = {}
+        for coletor in self._coletores:
+            for nome, tipo, ajuda, rotulos, valor in coletor():
+                familias.setdefault(nome, (tipo, ajuda, []))[2].append(f"{nome}{_rotulos(rotulos)} {valor!r}")
+        for nome, (tipo, ajuda, amostras) in familias.items():
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", *amostras]
+        return "\n".join(linhas) + "\n"
+
+
+registro_metricas = RegistroMetricas()
+
+
+class _Cronometro:
+    __slots__ = ("histograma", "inicio")
+
+    def __init__(self, histograma: Histograma):
+        self.histograma = histograma
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histograma.observar(time.perf_counter() - self.inicio)
+
+
+@functools.lru_cache(maxsize=None)
+def _histograma_etapa(etapa: str) -> Histograma:
+    return registro_metricas.histograma(
+        "ia_futebol_etapa_segundos", "Duração das etapas internas (carga, índices, inferência).", etapa=etapa
+    )
+
+
+def medir(etapa: str) -> _Cronometro:
+    """Uso: `with medir("inferencia"): ...`"""
+    return _Cronometro(_histograma_etapa(etapa))
+
+
+# instantes (início do handler, início e fim da função da rota) da requisição atual
+_linha_do_tempo: ContextVar[Optional[List[float]]] = ContextVar("linha_do_tempo", default=None)
+
+
+def _cronometrar_rota(endpoint: Callable) -> Callable:
+    # marca início e fim da função da rota na linha do tempo da requisição
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def envolvida(*args, **kwargs):
+            marcas = _linha_do_tempo.get()
+            if marcas is not None:
+                marcas[1] = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if marcas is not None:
+                    marcas[2] = time.perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def envolvida(*args, **kwargs):
+            marcas = _linha_do_tempo.get()
+            if marcas is not None:
+                marcas[1] = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if marcas is not None:
+                    marcas[2] = time.perf_counter()
+    return envolvida
+
+
+class RotaInstrumentada(APIRoute):
+    """
+    APIRoute que mede a latência total da rota e a divide em validação,
+    execução e codificação da resposta. Uso: app.router.route_class = RotaInstrumentada
+    (antes de declarar as rotas).
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _cronometrar_rota(endpoint), **kwargs)
+        metodo = ",".join(sorted(self.methods or []))
+        self._rotulos = {"rota": self.path, "metodo": metodo}
+        self._total = registro_metricas.histograma(
+            "ia_futebol_requisicao_segundos", "Latência das requisições por rota.", **self._rotulos
+        )
+        self._fases = {
+            fase: registro_metricas.histograma(
+                "ia_futebol_rota_fase_segundos",
+                "Latência por fase do handler (validacao, execucao, codificacao).",
+                fase=fase,
+                **self._rotulos,
+            )
+            for fase in ("validacao", "execucao", "codificacao")
+        }
+        self._status: Dict[int, Contador] = {}
+
+    def _contar_status(self, status: int) -> None:
+        contador = self._status.get(status)
+        if contador is None:
+            contador = self._status[status] = registro_metricas.contador(
+                "ia_futebol_requisicoes_total", "Requisições respondidas por rota e status.",
+                status=str(status), **self._rotulos,
+            )
+        contador.incrementar()
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def handler_instrumentado(request):
+            marcas = [time.perf_counter(), 0.0, 0.0]
+            token = _linha_do_tempo.set(marcas)
+            status = 500
+            try:
+                resposta = await handler(request)
+                status = resposta.status_code
+                return resposta
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                fim = time.perf_counter()
+                _linha_do_tempo.reset(token)
+                self._total.observar(fim - marcas[0])
+                if marcas[1]:
+                    self._fases["validacao"].observar(marcas[1] - marcas[0])
+                    self._fases["execucao"].observar(marcas[2] - marcas[1])
+                    self._fases["codificacao"].observar(fim - marcas[2])
+                else:
+                    # a função da rota nem chegou a rodar (entrada inválida)
+                    self._fases["validacao"].observar(fim - marcas[0])
+                self._contar_status(status)
+
+        return handler_instrumentado
+
+
+def coletor_lru(modulos) -> Callable[[], Iterable[Amostra]]:
+    """
+    Coletor com acertos, falhas, itens e taxa de acerto das funções com
+    functools.lru_cache definidas nos `modulos`.
+    """
+    funcoes = [
+        (f"{modulo.__name__.rsplit('.', 1)[-1]}.{nome}", func)
+        for modulo in modulos
+        for nome, func in vars(modulo).items()
+        if hasattr(func, "cache_info") and getattr(func, "__module__", None) == modulo.__name__
+    ]
+
+    def coletar():
+        for nome, func in funcoes:
+            info = func.cache_info()
+            consultas = info.hits + info.misses
+            rotulos = {"cache": nome}
+            yield ("ia_futebol_cache_acertos_total", "counter", "Acertos dos caches.", rotulos, info.hits)
+            yield ("ia_futebol_cache_falhas_total", "counter", "Falhas dos caches.", rotulos, info.misses)
+            yield ("ia_futebol_cache_itens", "gauge", "Itens guardados nos caches.", rotulos, info.currsize)
+            yield ("ia_futebol_cache_taxa_acerto", "gauge", "Acertos / consultas dos caches.", rotulos,
+                   info.hits / consultas if consultas else 0.0)
+
+    return coletar
@@ -0,0 +1,192 @@
+"""
+Perfil de CPU da API em produção, desligado por padrão.
+
+Dois modos:
+- Por requisição (IA_FUTEBOL_PERFIL=1): o MiddlewarePerfil roda cProfile em
+  uma a cada IA_FUTEBOL_PERFIL_AMOSTRA requisições e nas que trazem o
+  cabeçalho X-Perfil: 1. O perfil cobre o event loop e o trabalho enviado ao
+  executor de threads (concorrencia.executar), e é somado por rota em
+  <IA_FUTEBOL_PERFIL_DIR>/requisicoes/<rota>.prof (pstats; abre com
+  `python -m pstats` ou snakeviz).
+- Sessão por amostragem (POST /debug/profile): uma thread lê a pilha de
+  todas as threads a cada intervalo, por um tempo limitado, e grava as
+  pilhas no formato "collapsed" (flamegraph.pl, speedscope) em
+  <IA_FUTEBOL_PERFIL_DIR>/sessao_<instante>.collapsed. Não instrumenta as
+  requisições: só custa enquanto a sessão está ativa.
+
+Com IA_FUTEBOL_PERFIL=0 o middleware nem é instalado.
+"""
+
+import cProfile
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from app.config import PERFIL_AMOSTRA, PERFIL_DIR
+
+# perfil do trabalho que a requisição atual manda ao executor (None = não perfilada)
+_perfil_executor: ContextVar[Optional[cProfile.Profile]] = ContextVar("perfil_executor", default=None)
+
+
+def perfil_da_requisicao() -> Optional[cProfile.Profile]:
+    return _perfil_executor.get()
+
+
+def executar_perfilado(perfil: cProfile.Profile, func: Callable, *args, **kwargs):
+    # roda na thread do executor: até o Python 3.11 o cProfile só enxerga a
+    # thread em que foi ligado. A partir do 3.12 o perfil do event loop já
+    # cobre todas as threads e um segundo perfil ativo é recusado.
+    try:
+        perfil.enable()
+    except ValueError:
+        return func(*args, **kwargs)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        perfil.disable()
+
+
+def _nome_arquivo(metodo: str, rota: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", f"{metodo}{rota}").strip("_") or "raiz"
+
+
+class MiddlewarePerfil:
+    """Middleware ASGI do modo por requisição."""
+
+    def __init__(self, app, amostra: int = PERFIL_AMOSTRA, diretorio: Path = PERFIL_DIR):
+        self.app = app
+        self.amostra = amostra
+        self.diretorio = diretorio / "requisicoes"
+        self._contador = count(1)
+        self._agregados: Dict[str, pstats.Stats] = {}
+        self._lock = threading.Lock()
+        # cProfile do event loop: um por vez, para não misturar requisições perfiladas
+        self._loop_ocupado = False
+
+    def _selecionar(self, scope) -> bool:
+        if (b"x-perfil", b"1") in scope.get("headers", ()):
+            return True
+        return self.amostra > 0 and next(self._contador) % self.amostra == 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selecionar(scope):
+            await self.app(scope, receive, send)
+            return
+
+        perfil_loop = None
+        if not self._loop_ocupado:
+            self._loop_ocupado = True
+            perfil_loop = cProfile.Profile()
+        perfil_executor = cProfile.Profile()
+        token = _perfil_executor.set(perfil_executor)
+        try:
+            if perfil_loop is not None:
+                perfil_loop.enable()
+            await self.app(scope, receive, send)
+        finally:
+            if perfil_loop is not None:
+                perfil_loop.disable()
+                self._loop_ocupado = False
+            _perfil_executor.reset(token)
+            rota = scope.get("route")
+            nome = _nome_arquivo(scope["method"], getattr(rota, "path", scope["path"]))
+            self._somar(nome, [p for p in (perfil_loop, perfil_executor) if p is not None])
+
+    def _somar(self, nome: str, perfis: List[cProfile.Profile]) -> None:
+        perfis = [p for p in perfis if p.getstats()]
+        if not perfis:
+            return
+        with self._lock:
+            agregado = self._agregados.get(nome)
+            if agregado is None:
+                agregado = self._agregados[nome] = pstats.Stats(perfis[0])
+                perfis = perfis[1:]
+            for perfil in perfis:
+                agregado.add(perfil)
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            agregado.dump_stats(self.diretorio / f"{nome}.prof")
+
+
+def _pilha(frame) -> str:
+    nomes = []
+    while frame is not None:
+        codigo = frame.f_code
+        modulo = frame.f_globals.get("__name__", "?")
+        nomes.append(f"{modulo}:{codigo.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(nomes))
+
+
+class SessaoAmostragem:
+    """Amostragem de pilhas de todas as threads por tempo limitado."""
+
+    def __init__(self, diretorio: Path = PERFIL_DIR):
+        self.diretorio = diretorio
+        self._thread: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self.situacao_atual: Dict = {"ativa": False}
+
+    def iniciar(self, duracao_s: float, intervalo_ms: float) -> Dict:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise ValueError("Já existe uma sessão de perfil ativa.")
+            self._parar.clear()
+            caminho = self.diretorio / f"sessao_{datetime.now():%Y%m%d_%H%M%S}.collapsed"
+            self.situacao_atual = {
+                "ativa": True,
+                "inicio": datetime.now().isoformat(timespec="seconds"),
+                "duracao_s": duracao_s,
+                "intervalo_ms": intervalo_ms,
+                "arquivo": str(caminho),
+                "amostras": 0,
+            }
+            self._thread = threading.Thread(
+                target=self._amostrar, args=(duracao_s, intervalo_ms / 1000, caminho),
+                name="perfil-amostragem", daemon=True,
+            )
+            self._thread.start()
+            return dict(self.situacao_atual)
+
+    def parar(self) -> Dict:
+        """Encerra a sessão antes do prazo e espera o arquivo ser gravado."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            raise LookupError("Nenhuma sessão de perfil ativa.")
+        self._parar.set()
+        thread.join()
+        return self.situacao()
+
+    def situacao(self) -> Dict:
+        arquivos = sorted(str(p) for p in self.diretorio.glob("sessao_*.collapsed")) if self.diretorio.exists() else []
+        return {**self.situacao_atual, "arquivos": arquivos}
+
+    def _amostrar(self, duracao_s: float, intervalo_s: float, caminho: Path) -> None:
+        pilhas: Counter = Counter()
+        propria = threading.get_ident()
+        nomes = {}
+        fim = time.monotonic() + duracao_s
+        amostras = 0
+        while time.monotonic() < fim and not self._parar.wait(intervalo_s):
+            nomes.update({t.ident: t.name for t in threading.enumerate()})
+            for ident, frame in sys._current_frames().items():
+                if ident != propria:
+                    pilhas[f"{nomes.get(ident, ident)};{_pilha(frame)}"] += 1
+            amostras += 1
+            self.situacao_atual["amostras"] = amostras
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            for pilha, n in pilhas.most_common():
+                f.write(f"{pilha} {n}\n")
+        self.situacao_atual.update(ativa=False, fim=datetime.now().isoformat(timespec="seconds"))
+
+
+sessao = SessaoAmostragem()
@@ -0,0 +1,57 @@
+"""
+Relatório de memória das bases carregadas pela API, antes e depois do
+esquema de tipos (etl/esquema.py).
+
+"Antes" é a base lida do CSV sem tipagem (strings como object, números como
+int64/float64) e a base por time montada a partir dela; "depois" são os
+mesmos frames como a API os mantém em cache.
+
+Uso (a partir de backend/): python -m app.utils.relatorio_memoria
+"""
+
+import pandas as pd
+
+from app.utils.data_loader import (
+    _construir_base_times,
+    _get_root_dir,
+    carregar_df_brasileirao,
+    carregar_df_times,
+)
+from app.utils.esquema import memoria_bytes
+
+
+def _mb(n_bytes: int) -> str:
+    return f"{n_bytes / 2**20:.2f} MB"
+
+
+def relatorio_memoria() -> list:
+    """
+    Retorna uma linha por frame com os bytes antes e depois do esquema.
+    """
+    bruto = pd.read_csv(_get_root_dir() / "data" / "final" / "brasileirao_final.csv")
+    # base por time com os tipos de antes do esquema: casa_fora como string
+    # repetida por linha e flags de resultado em int64
+    times_bruto = _construir_base_times(bruto).astype(
+        {"casa_fora": object, "vitoria": "int64", "empate": "int64", "derrota": "int64"}
+    )
+
+    pares = [
+        ("df_brasileirao", bruto, carregar_df_brasileirao()),
+        ("df_times", times_bruto, carregar_df_times()),
+    ]
+    return [
+        {"frame": nome, "linhas": len(depois), "antes": memoria_bytes(antes), "depois": memoria_bytes(depois)}
+        for nome, antes, depois in pares
+    ]
+
+
+if __name__ == "__main__":
+    linhas = relatorio_memoria()
+    print(f"{'frame':<16}{'linhas':>8}{'antes':>12}{'depois':>12}{'redução':>10}")
+    for linha in linhas:
+        reducao = 1 - linha["depois"] / linha["antes"]
+        print(f"{linha['frame']:<16}{linha['linhas']:>8}{_mb(linha['antes']):>12}"
+              f"{_mb(linha['depois']):>12}{reducao:>10.0%}")
+    total_antes = sum(linha["antes"] for linha in linhas)
+    total_depois = sum(linha["depois"] for linha in linhas)
+    print(f"{'total':<16}{'':>8}{_mb(total_antes):>12}{_mb(total_depois):>12}{1 - total_depois / total_antes:>10.0%}")
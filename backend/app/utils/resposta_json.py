@@ -0,0 +1,49 @@
+"""
+Resposta JSON com orjson para os payloads grandes (lotes de previsões e de
+placares), que serializa arrays NumPy direto do buffer, sem passar por
+.tolist() e pelo jsonable_encoder do FastAPI elemento a elemento.
+
+As rotas com response_model comuns não precisam dela: o FastAPI já gera o
+JSON com o pydantic (sem dict intermediário). RespostaJSON é para as rotas
+que devolvem arrays; elas declaram o response_model só para a documentação
+e retornam a resposta pronta.
+
+Sem orjson instalado, cai no json da biblioteca padrão (arrays convertidos
+com .tolist()), com a mesma saída.
+"""
+
+import json
+from typing import Any
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele a serialização usa o json padrão
+    orjson = None
+
+
+def _converter(valor: Any) -> Any:
+    # chamado pelo serializador só para o que ele não conhece
+    if isinstance(valor, np.ndarray):
+        # o orjson lê direto só arrays contíguos: recortes (ex.: placares[:, :7, :7]) são copiados
+        if orjson is not None and not valor.flags.c_contiguous:
+            return np.ascontiguousarray(valor)
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+
+def dumps_json(conteudo: Any) -> bytes:
+    """JSON compacto em UTF-8; arrays NumPy viram listas aninhadas."""
+    if orjson is not None:
+        return orjson.dumps(conteudo, default=_converter, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        conteudo, default=_converter, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class RespostaJSON(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
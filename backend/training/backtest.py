@@ -0,0 +1,291 @@
+"""
+Backtest walk-forward: treina com as temporadas <= Y e prevê a temporada Y+1
+(ou, com --por-rodada, treina com tudo antes da rodada R e prevê a rodada R).
+Diferente do train_test_split do notebook 06, nenhum jogo futuro entra no treino.
+
+Reaproveitamento entre folds:
+- Scaler: para cada (temporada, rodada) guardamos contagem, média e soma dos
+  quadrados dos desvios (M2) de cada feature, uma única vez. O scaler de um
+  fold é a combinação dessas estatísticas (fórmula de Chan), sem reler as
+  linhas de treino. Nulos são preenchidos com a média do treino, o que
+  também sai das mesmas estatísticas.
+- Cache: a matriz de features fica em disco uma vez (.npy, aberta via
+  memory-map pelos workers) e cada fold guarda os índices de treino/teste e
+  as previsões, com chave pelo hash das temporadas que o fold usa (e pela
+  configuração do modelo). Ao rodar de novo, só os folds com dados
+  alterados são recalculados.
+
+Os folds independentes rodam em paralelo (joblib, um processo por fold).
+
+Uso (a partir de backend/):
+    python -m training.backtest [--desde 2008] [--por-rodada] [--workers 4]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+
+from app.config import FEATURES_JANELA
+from app.utils.data_loader import _get_root_dir, carregar_df_brasileirao
+from training.matriz import montar_matriz
+
+CLASSES = ["empate", "mandante", "visitante"]
+FAIXAS_CALIBRACAO = 10
+
+
+def _dir_cache() -> Path:
+    return _get_root_dir() / "data" / "cache" / "backtest"
+
+
+def _sha1(*partes) -> str:
+    h = hashlib.sha1()
+    for parte in partes:
+        h.update(str(parte).encode())
+    return h.hexdigest()
+
+
+def estatisticas_por_unidade(X: np.ndarray, unidades: np.ndarray) -> Dict[Tuple[int, int], Tuple]:
+    """
+    Para cada unidade (temporada, rodada): (linhas, válidos, média, M2) por
+    feature, ignorando nulos.
+    """
+    estatisticas = {}
+    for unidade in np.unique(unidades, axis=0):
+        bloco = X[(unidades == unidade).all(axis=1)]
+        validos = (~np.isnan(bloco)).sum(axis=0)
+        with np.errstate(invalid="ignore"):
+            media = np.where(validos > 0, np.nansum(bloco, axis=0) / np.maximum(validos, 1), 0.0)
+            m2 = np.nansum((bloco - media) ** 2, axis=0)
+        estatisticas[tuple(int(u) for u in unidade)] = (len(bloco), validos, media, m2)
+    return estatisticas
+
+
+def combinar_estatisticas(partes: List[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Média e escala do StandardScaler ajustado nas linhas das unidades, depois
+    de preencher os nulos com a média (os nulos entram com desvio zero).
+    """
+    linhas = sum(p[0] for p in partes)
+    validos = np.sum([p[1] for p in partes], axis=0)
+    soma = np.sum([p[1] * p[2] for p in partes], axis=0)
+    media = np.where(validos > 0, soma / np.maximum(validos, 1), 0.0)
+    m2 = np.sum([p[3] + p[1] * (p[2] - media) ** 2 for p in partes], axis=0)
+    escala = np.sqrt(m2 / linhas)
+    # mesma convenção do StandardScaler para variância zero
+    escala[escala == 0] = 1.0
+    return media, escala
+
+
+def definir_folds(unidades: np.ndarray, desde: int, por_rodada: bool) -> List[Tuple[int, int]]:
+    """
+    Lista de (temporada, rodada) de teste; rodada 0 quer dizer temporada inteira.
+    """
+    if por_rodada:
+        pares = sorted({(int(a), int(r)) for a, r in unidades if a >= desde})
+        return pares
+    return [(int(a), 0) for a in sorted(set(unidades[:, 0])) if a >= desde]
+
+
+def _mascaras(unidades: np.ndarray, fold: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    ano, rodada = fold
+    if rodada == 0:
+        return unidades[:, 0] < ano, unidades[:, 0] == ano
+    antes = (unidades[:, 0] < ano) | ((unidades[:, 0] == ano) & (unidades[:, 1] < rodada))
+    return antes, (unidades[:, 0] == ano) & (unidades[:, 1] == rodada)
+
+
+def _na_janela(unidade: Tuple[int, int], fold: Tuple[int, int]) -> bool:
+    ano, rodada = fold
+    return unidade[0] < ano or (rodada > 0 and unidade[0] == ano and unidade[1] < rodada)
+
+
+def _avaliar_fold(caminho_X: str, caminho_y: str, caminho_indices: str,
+                  media: np.ndarray, escala: np.ndarray, C: float) -> np.ndarray:
+    # roda num processo separado: a matriz é aberta via memory-map (páginas
+    # compartilhadas entre os workers) em vez de ir por pickle
+    X = np.load(caminho_X, mmap_mode="r")
+    y = np.load(caminho_y, mmap_mode="r")
+    with np.load(caminho_indices) as indices:
+        treino, teste = indices["treino"], indices["teste"]
+
+    def escalar(linhas):
+        return np.nan_to_num((X[linhas] - media) / escala, nan=0.0)
+
+    clf = LogisticRegression(C=C, max_iter=1000)
+    clf.fit(escalar(treino), y[treino])
+    probs = clf.predict_proba(escalar(teste))
+    # colunas sempre na ordem de CLASSES, mesmo se o treino não tiver alguma classe
+    saida = np.zeros((len(teste), len(CLASSES)))
+    saida[:, clf.classes_] = probs
+    return saida
+
+
+def _onehot(y: np.ndarray) -> np.ndarray:
+    return (y[:, None] == np.array(CLASSES)[None, :]).astype(np.float64)
+
+
+def calibracao(probs: np.ndarray, y: np.ndarray, faixas: int = FAIXAS_CALIBRACAO) -> Tuple[float, List[Dict]]:
+    """
+    Curva de confiabilidade com todas as classes juntas: em cada faixa de
+    probabilidade prevista, a média prevista contra a frequência observada.
+    Retorna também o erro de calibração esperado (ECE).
+    """
+    previsto = probs.ravel()
+    observado = _onehot(y).ravel()
+    faixa = np.minimum((previsto * faixas).astype(int), faixas - 1)
+    contagem = np.bincount(faixa, minlength=faixas)
+    soma_prev = np.bincount(faixa, weights=previsto, minlength=faixas)
+    soma_obs = np.bincount(faixa, weights=observado, minlength=faixas)
+
+    curva, ece = [], 0.0
+    for i in range(faixas):
+        if contagem[i] == 0:
+            continue
+        media_prev, freq = soma_prev[i] / contagem[i], soma_obs[i] / contagem[i]
+        ece += contagem[i] / len(previsto) * abs(media_prev - freq)
+        curva.append({"faixa": f"{i / faixas:.1f}-{(i + 1) / faixas:.1f}", "previsto": media_prev,
+                      "observado": freq, "n": int(contagem[i])})
+    return ece, curva
+
+
+def metricas(probs: np.ndarray, y: np.ndarray) -> Dict:
+    alvo = _onehot(y)
+    p_real = np.clip((probs * alvo).sum(axis=1), 1e-15, 1.0)
+    ece, _ = calibracao(probs, y)
+    return {
+        "partidas": int(len(y)),
+        "log_loss": float(-np.log(p_real).mean()),
+        "brier": float(((probs - alvo) ** 2).sum(axis=1).mean()),
+        "acuracia": float((np.array(CLASSES)[probs.argmax(axis=1)] == y).mean()),
+        "ece": float(ece),
+    }
+
+
+def backtest(
+    desde: int = 2008,
+    por_rodada: bool = False,
+    workers: int = 1,
+    C: float = 1.0,
+    dinamicas: bool = False,
+    janela: int = FEATURES_JANELA,
+    dir_cache: Optional[Path] = None,
+) -> Dict:
+    dir_cache = dir_cache or _dir_cache()
+    dir_cache.mkdir(parents=True, exist_ok=True)
+
+    df = carregar_df_brasileirao()
+    X_df, y_sr = montar_matriz(df, dinamicas=dinamicas, janela=janela, preencher=False)
+    X = X_df.to_numpy(dtype=np.float64)
+    y = y_sr.to_numpy(dtype=str)
+    unidades = df.loc[X_df.index, ["ano_campeonato", "rodada"]].to_numpy(dtype=np.int64)
+
+    # hash de cada temporada (features já calculadas + rótulo): muda se a temporada mudar
+    hash_temporada = {
+        int(ano): _sha1(pd.util.hash_pandas_object(X_df[unidades[:, 0] == ano]).sum(),
+                        "".join(y[unidades[:, 0] == ano]))
+        for ano in np.unique(unidades[:, 0])
+    }
+    config_dados = json.dumps({"features": list(X_df.columns), "janela": janela if dinamicas else None})
+    config_modelo = json.dumps({"modelo": "LogisticRegression", "C": C})
+
+    estatisticas = estatisticas_por_unidade(X, unidades)
+    folds = definir_folds(unidades, desde, por_rodada)
+
+    # matriz completa gravada uma vez por versão dos dados; cada fold é um
+    # conjunto de índices de linhas nela
+    chave_base = _sha1(config_dados, *hash_temporada.values())
+    caminho_X = dir_cache / f"matriz_{chave_base}.npy"
+    caminho_y = dir_cache / f"rotulos_{chave_base}.npy"
+    if not caminho_X.exists() or not caminho_y.exists():
+        np.save(caminho_X, X)
+        np.save(caminho_y, np.array([CLASSES.index(c) for c in y], dtype=np.int8))
+
+    previsoes: Dict[Tuple[int, int], np.ndarray] = {}
+    pendentes = []
+    for fold in folds:
+        treino, teste = _mascaras(unidades, fold)
+        if not treino.any() or not teste.any():
+            continue
+        anos_usados = [a for a in hash_temporada if a <= fold[0]]
+        chave = _sha1(config_dados, fold, *(hash_temporada[a] for a in anos_usados))
+        resultado = dir_cache / f"previsao_{chave}_{_sha1(config_modelo)[:12]}.npy"
+        if resultado.exists():
+            previsoes[fold] = np.load(resultado)
+            continue
+
+        indices = dir_cache / f"fold_{chave}.npz"
+        if not indices.exists():
+            np.savez(indices, treino=np.flatnonzero(treino).astype(np.int32), teste=np.flatnonzero(teste).astype(np.int32))
+        media, escala = combinar_estatisticas([e for u, e in estatisticas.items() if _na_janela(u, fold)])
+        pendentes.append((fold, resultado, str(indices), media, escala))
+
+    print(f"{len(folds)} folds: {len(previsoes)} do cache, {len(pendentes)} para calcular em {workers} workers")
+    inicio = time.perf_counter()
+    calculados = Parallel(n_jobs=workers)(
+        delayed(_avaliar_fold)(str(caminho_X), str(caminho_y), indices, media, escala, C)
+        for _, _, indices, media, escala in pendentes
+    )
+    for (fold, resultado, *_), probs in zip(pendentes, calculados):
+        np.save(resultado, probs)
+        previsoes[fold] = probs
+    tempo = time.perf_counter() - inicio
+
+    # métricas por temporada (no modo por rodada, juntando as rodadas da temporada)
+    por_temporada = {}
+    todas_probs, todos_y = [], []
+    for ano in sorted({f[0] for f in previsoes}):
+        folds_ano = [f for f in sorted(previsoes) if f[0] == ano]
+        probs = np.vstack([previsoes[f] for f in folds_ano])
+        y_ano = np.concatenate([y[_mascaras(unidades, f)[1]] for f in folds_ano])
+        por_temporada[ano] = metricas(probs, y_ano)
+        todas_probs.append(probs)
+        todos_y.append(y_ano)
+
+    probs, y_total = np.vstack(todas_probs), np.concatenate(todos_y)
+    _, curva = calibracao(probs, y_total)
+    return {
+        "modo": "rodada" if por_rodada else "temporada",
+        "modelo": json.loads(config_modelo),
+        "features": list(X_df.columns),
+        "folds": {"total": len(folds), "do_cache": len(folds) - len(pendentes), "calculados": len(pendentes),
+                  "tempo_s": tempo},
+        "por_temporada": por_temporada,
+        "geral": metricas(probs, y_total),
+        "calibracao": curva,
+    }
+
+
+def imprimir_resultado(resultado: Dict) -> None:
+    print(f"{'temporada':<10}{'partidas':>9}{'log_loss':>10}{'brier':>8}{'acurácia':>10}{'ece':>8}")
+    linhas = list(resultado["por_temporada"].items()) + [("geral", resultado["geral"])]
+    for ano, m in linhas:
+        print(f"{ano:<10}{m['partidas']:>9}{m['log_loss']:>10.4f}{m['brier']:>8.4f}{m['acuracia']:>10.3f}{m['ece']:>8.4f}")
+    print()
+    print("Calibração (todas as classes):")
+    for faixa in resultado["calibracao"]:
+        print(f"  {faixa['faixa']}: previsto {faixa['previsto']:.3f} | observado {faixa['observado']:.3f} | n={faixa['n']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest walk-forward por temporada ou por rodada.")
+    parser.add_argument("--desde", type=int, default=2008, help="primeira temporada prevista")
+    parser.add_argument("--por-rodada", action="store_true", help="um fold por rodada em vez de por temporada")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--C", type=float, default=1.0, help="regularização da regressão logística")
+    parser.add_argument("--dinamicas", action="store_true", help="inclui Elo, forma e gols recentes")
+    parser.add_argument("--janela", type=int, default=FEATURES_JANELA)
+    parser.add_argument("--saida", type=Path, help="grava o resultado completo em JSON")
+    args = parser.parse_args()
+
+    resultado = backtest(args.desde, args.por_rodada, args.workers, args.C, args.dinamicas, args.janela)
+    imprimir_resultado(resultado)
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
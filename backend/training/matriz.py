@@ -0,0 +1,60 @@
+"""
+Matriz de features e rótulo para treino, a partir da base final.
+
+As features básicas são as do notebook 06 (campos conhecidos antes do jogo),
+com nulos preenchidos pela mediana da coluna. Opcionalmente entram as
+features dinâmicas de app/utils/features_times.py (Elo, forma e gols
+recentes), sempre consultadas com as partidas anteriores à data do jogo.
+"""
+
+from typing import List, Tuple
+import pandas as pd
+
+from app.utils.features_times import FEATURES, construir_features_times
+
+FEATURES_BASICAS: List[str] = [
+    "ano_campeonato",
+    "rodada",
+    "colocacao_mandante",
+    "colocacao_visitante",
+    "valor_equipe_titular_mandante",
+    "valor_equipe_titular_visitante",
+    "idade_media_titular_mandante",
+    "idade_media_titular_visitante",
+    "publico_max",
+]
+
+FEATURES_DINAMICAS: List[str] = [f"{nome}_{lado}" for lado in ("mandante", "visitante") for nome in FEATURES]
+
+ROTULO = "resultado"
+
+
+def features_dinamicas(df: pd.DataFrame, janela: int) -> pd.DataFrame:
+    """
+    Features dinâmicas de cada partida de `df`, com o estado dos times antes da data.
+    """
+    motor = construir_features_times(df, janela)
+    linhas = [
+        motor.features_partida(mandante, visitante, data)
+        for mandante, visitante, data in zip(df["time_mandante"], df["time_visitante"], df["data"])
+    ]
+    return pd.DataFrame(linhas, index=df.index, columns=FEATURES_DINAMICAS)
+
+
+def montar_matriz(
+    df: pd.DataFrame, dinamicas: bool = False, janela: int = 5, preencher: bool = True
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Retorna (X, y) sem as partidas sem resultado, como no notebook 06.
+    Com preencher=False os nulos ficam em X (o backtest preenche só com
+    dados das temporadas de treino).
+    """
+    X = df[FEATURES_BASICAS].astype("float64")
+    if preencher:
+        X = X.fillna(X.median())
+    if dinamicas:
+        X = pd.concat([X, features_dinamicas(df, janela).astype("float64")], axis=1)
+
+    y = df[ROTULO].astype(object)
+    validos = y.notna()
+    return X[validos], y[validos]
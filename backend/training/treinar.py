@@ -0,0 +1,171 @@
+"""
+Treino reprodutível do modelo de resultado (substitui o export manual do
+notebook 06).
+
+Fluxo:
+- Monta a matriz de features a partir da base final (training/matriz.py)
+- Separa 20% para teste (estratificado, semente fixa)
+- Busca de hiperparâmetros com validação cruzada em paralelo (GridSearchCV,
+  um processo por combinação/fold via joblib)
+- Salva o modelo versionado em app/models/modelo_<versao>.pkl e as métricas
+  (log loss, acurácia, tempos de ajuste e latência de inferência) em
+  app/models/modelo_<versao>.json, junto com os campos que a API precisa
+  receber (com --dinamicas: times e data) e a janela das features
+
+O backend carrega qualquer versão pelo nome: IA_FUTEBOL_MODELO=modelo_<versao>.
+
+Uso (a partir de backend/):
+    python -m training.treinar [--versao v2] [--workers 4] [--dinamicas]
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import GridSearchCV, ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.config import FEATURES_JANELA
+from app.services.motor_inferencia import criar_motor
+from app.utils.data_loader import _csv_base_final, carregar_df_brasileirao
+from app.utils.esquema import assinatura_arquivo
+from app.utils.features_times import entrada_obrigatoria
+from app.utils.load_model import MODELOS_DIR
+from training.matriz import montar_matriz
+
+SEMENTE = 42
+
+GRADE: Dict[str, List] = {
+    "clf__C": [0.01, 0.1, 1.0, 10.0],
+    "clf__class_weight": [None, "balanced"],
+}
+
+
+def criar_pipeline() -> Pipeline:
+    # mesmo pipeline do notebook 06
+    return Pipeline(
+        steps=[
+            ("scaler", StandardScaler()),
+            ("clf", LogisticRegression(max_iter=1000)),
+        ]
+    )
+
+
+def medir_inferencia(modelo, X: pd.DataFrame, repeticoes: int = 1000) -> Dict:
+    """
+    Latência do motor que a API usa: uma partida por chamada (p50/p99) e o
+    lote inteiro numa chamada (µs por partida).
+    """
+    motor = criar_motor(modelo)
+    matriz = X[motor.features].to_numpy(dtype=np.float64)
+    linhas = matriz[np.arange(repeticoes) % len(matriz)]
+
+    tempos = np.empty(repeticoes)
+    for i, linha in enumerate(linhas):
+        inicio = time.perf_counter()
+        motor.prever_proba(linha)
+        tempos[i] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    motor.prever_proba(matriz)
+    lote = time.perf_counter() - inicio
+
+    return {
+        "motor": type(motor).__name__,
+        "unitaria_p50_us": float(np.percentile(tempos, 50) * 1e6),
+        "unitaria_p99_us": float(np.percentile(tempos, 99) * 1e6),
+        "lote_us_por_partida": lote / len(matriz) * 1e6,
+    }
+
+
+def treinar(versao: str, workers: int, folds: int = 5, dinamicas: bool = False, janela: int = FEATURES_JANELA) -> Dict:
+    df = carregar_df_brasileirao()
+    X, y = montar_matriz(df, dinamicas=dinamicas, janela=janela)
+    X_treino, X_teste, y_treino, y_teste = train_test_split(
+        X, y, test_size=0.2, random_state=SEMENTE, stratify=y
+    )
+
+    busca = GridSearchCV(
+        criar_pipeline(),
+        GRADE,
+        scoring="neg_log_loss",
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=SEMENTE),
+        n_jobs=workers,
+        refit=True,
+    )
+    print(f"Buscando {len(ParameterGrid(GRADE))} combinações x {folds} folds em {workers} workers...")
+    inicio = time.perf_counter()
+    busca.fit(X_treino, y_treino)
+    tempo_busca = time.perf_counter() - inicio
+
+    modelo = busca.best_estimator_
+    probs = modelo.predict_proba(X_teste)
+    resultados_cv = [
+        {"parametros": params, "log_loss": -float(media), "desvio": float(desvio)}
+        for params, media, desvio in zip(
+            busca.cv_results_["params"],
+            busca.cv_results_["mean_test_score"],
+            busca.cv_results_["std_test_score"],
+        )
+    ]
+
+    metricas = {
+        "versao": versao,
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "sklearn": sklearn.__version__,
+        # mesma assinatura (tamanho + SHA-1) que o ETL grava no Feather e nas partições
+        "base": assinatura_arquivo(_csv_base_final()),
+        "features": list(X.columns),
+        # conferidos pelo registro de modelos na carga
+        "entrada_obrigatoria": list(entrada_obrigatoria(list(X.columns))),
+        "janela": janela if dinamicas else None,
+        "classes": [str(c) for c in modelo.classes_],
+        "partidas": {"treino": len(X_treino), "teste": len(X_teste)},
+        "melhores_parametros": busca.best_params_,
+        "cv": {"folds": folds, "log_loss": -float(busca.best_score_), "resultados": resultados_cv},
+        "teste": {
+            "log_loss": float(log_loss(y_teste, probs, labels=modelo.classes_)),
+            "acuracia": float(accuracy_score(y_teste, modelo.classes_[probs.argmax(axis=1)])),
+        },
+        "tempos": {
+            "busca_s": tempo_busca,
+            "ajuste_final_s": float(busca.refit_time_),
+            "ajuste_medio_fold_s": float(np.mean(busca.cv_results_["mean_fit_time"])),
+        },
+        "inferencia": medir_inferencia(modelo, X_teste),
+    }
+
+    nome = f"modelo_{versao}"
+    MODELOS_DIR.mkdir(parents=True, exist_ok=True)
+    joblib.dump(modelo, MODELOS_DIR / f"{nome}.pkl")
+    with open(MODELOS_DIR / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump(metricas, f, indent=2, ensure_ascii=False, default=str)
+
+    print(f"Modelo salvo em {MODELOS_DIR / f'{nome}.pkl'}")
+    print(f"Log loss (teste): {metricas['teste']['log_loss']:.4f} | "
+          f"acurácia: {metricas['teste']['acuracia']:.3f} | "
+          f"melhores parâmetros: {busca.best_params_}")
+    return metricas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treina e versiona o modelo de resultado.")
+    parser.add_argument("--versao", default=datetime.now().strftime("%Y%m%d_%H%M%S"),
+                        help="sufixo do artefato (modelo_<versao>.pkl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processos da busca de hiperparâmetros (-1: todos os núcleos)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--dinamicas", action="store_true",
+                        help="inclui Elo, forma e gols recentes (app/utils/features_times.py)")
+    parser.add_argument("--janela", type=int, default=FEATURES_JANELA)
+    args = parser.parse_args()
+    treinar(args.versao, args.workers, args.folds, args.dinamicas, args.janela)
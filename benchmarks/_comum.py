@@ -0,0 +1,57 @@
+"""
+Utilitários compartilhados pelos scripts de benchmark.
+
+Os scripts rodam a partir da raiz do repositório (python benchmarks/<script>.py);
+aqui o diretório backend/ entra no sys.path para que `import app...` funcione
+como no uvicorn.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+
+for caminho in (str(BACKEND_DIR), str(ROOT_DIR)):
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
+
+
+def medir_latencias(func: Callable[[], object], repeticoes: int, aquecimento: int = 50) -> np.ndarray:
+    """Executa func repetidas vezes e devolve a latência de cada chamada em microssegundos."""
+    for _ in range(aquecimento):
+        func()
+
+    tempos = np.empty(repeticoes)
+    relogio = time.perf_counter_ns
+    for i in range(repeticoes):
+        inicio = relogio()
+        func()
+        tempos[i] = relogio() - inicio
+    return tempos / 1_000
+
+
+def resumo_latencias(tempos_us: np.ndarray) -> Dict[str, float]:
+    return {
+        "p50_us": float(np.percentile(tempos_us, 50)),
+        "p99_us": float(np.percentile(tempos_us, 99)),
+        "media_us": float(tempos_us.mean()),
+    }
+
+
+def imprimir_tabela(linhas: List[Dict[str, object]]) -> None:
+    if not linhas:
+        return
+    colunas = list(linhas[0].keys())
+    larguras = {c: max(len(c), *(len(_formatar(l[c])) for l in linhas)) for c in colunas}
+    print("  ".join(c.ljust(larguras[c]) for c in colunas))
+    for linha in linhas:
+        print("  ".join(_formatar(linha[c]).ljust(larguras[c]) for c in colunas))
+
+
+def _formatar(valor: object) -> str:
+    return f"{valor:.2f}" if isinstance(valor, float) else str(valor)
@@ -0,0 +1,141 @@
+"""
+Teste de carga da API: vazão e latência com diferentes números de workers
+do executor (IA_FUTEBOL_EXECUTOR_WORKERS).
+
+Para cada número de workers, sobe um uvicorn num subprocesso, espera o
+/health/ready, dispara requisições concorrentes (mistura de /prever,
+/comparar-times, /perfil-time e /confronto) por alguns segundos e, no fim,
+lê as filas de cada grupo em /admin/concorrencia.
+
+Uso: python benchmarks/bench_carga.py [--workers 1,2,4] [--executor thread|processo]
+                                      [--concorrencia 32] [--duracao 10]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import BACKEND_DIR, imprimir_tabela
+
+import httpx
+import numpy as np
+
+TOKEN = "bench-carga"
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+
+
+def requisicoes(times: List[str]):
+    # ciclo infinito de (método, caminho, parâmetros, corpo) variando os times
+    pares = itertools.cycle(zip(times, times[1:] + times[:1]))
+    for i in itertools.count():
+        a, b = next(pares)
+        tipo = i % 4
+        if tipo == 0:
+            yield "POST", "/prever", None, {**PARTIDA, "rodada": 1 + i % 38}
+        elif tipo == 1:
+            yield "GET", "/comparar-times", {"time_a": a, "time_b": b, "ultimas_temporadas": 1 + i % 5}, None
+        elif tipo == 2:
+            yield "GET", "/perfil-time", {"time": a, "temporadas": [2015 + i % 9]}, None
+        else:
+            yield "GET", "/confronto", {"time_a": a, "time_b": b, "ano_inicio": 2003 + i % 20}, None
+
+
+def subir_api(porta: int, workers: int, executor: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "IA_FUTEBOL_EXECUTOR": executor,
+        "IA_FUTEBOL_EXECUTOR_WORKERS": str(workers),
+        "IA_FUTEBOL_ADMIN_TOKEN": TOKEN,
+    }
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{porta}/health/ready"
+    limite = time.monotonic() + 120
+    while time.monotonic() < limite:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return processo
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    processo.terminate()
+    raise SystemExit("A API não ficou pronta em 120 s.")
+
+
+async def disparar(base: str, concorrencia: int, duracao: float) -> Dict:
+    async with httpx.AsyncClient(base_url=base, timeout=30) as cliente:
+        times = (await cliente.get("/times")).json()["times"]
+        fila = requisicoes(times)
+        latencias: List[float] = []
+        erros = 0
+        fim = time.perf_counter() + duracao
+
+        async def usuario():
+            nonlocal erros
+            while time.perf_counter() < fim:
+                metodo, caminho, params, corpo = next(fila)
+                inicio = time.perf_counter()
+                resposta = await cliente.request(metodo, caminho, params=params, json=corpo)
+                latencias.append(time.perf_counter() - inicio)
+                if resposta.status_code >= 500:
+                    erros += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(usuario() for _ in range(concorrencia)))
+        total_s = time.perf_counter() - inicio
+        situacao = (await cliente.get("/admin/concorrencia", headers={"X-Admin-Token": TOKEN})).json()
+
+    tempos_ms = np.array(latencias) * 1000
+    return {
+        "req_s": len(latencias) / total_s,
+        "p50_ms": float(np.percentile(tempos_ms, 50)),
+        "p99_ms": float(np.percentile(tempos_ms, 99)),
+        "erros_5xx": erros,
+        "fila_pico": max(g["fila_pico"] for g in situacao["grupos"].values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,2,4", help="lista de workers do executor, separada por vírgula")
+    parser.add_argument("--executor", choices=["thread", "processo"], default="thread")
+    parser.add_argument("--concorrencia", type=int, default=32, help="clientes simultâneos")
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos de carga por rodada")
+    parser.add_argument("--porta", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs | executor {args.executor} | {args.concorrencia} clientes | {args.duracao:.0f} s por rodada\n")
+    linhas = []
+    for workers in (int(w) for w in args.workers.split(",")):
+        processo = subir_api(args.porta, workers, args.executor)
+        try:
+            resultado = asyncio.run(disparar(f"http://127.0.0.1:{args.porta}", args.concorrencia, args.duracao))
+        finally:
+            processo.terminate()
+            processo.wait()
+        linhas.append({"workers": workers, **resultado})
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Pico de memória e tempo do ETL do Brasileirão: leitura completa
+(etl/etl_futebol.py) contra leitura em blocos (etl/etl_streaming.py).
+
+O arquivo bruto sintético repete o original `--escala` vezes (padrão 50x),
+deslocando ano_campeonato a cada cópia. Cada modo roda em um processo
+separado, para que o pico de RSS de um não contamine o outro, e as duas
+saídas precisam ser idênticas byte a byte.
+
+Uso: python benchmarks/bench_etl_streaming.py [--escala 50] [--memoria-max-mb 64]
+"""
+
+import argparse
+import filecmp
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import _comum
+from _comum import imprimir_tabela
+
+import pandas as pd
+
+from etl.etl_futebol import COMPETICOES, RAW_DIR
+
+FILHO = r"""
+import json, resource, sys, time
+from pathlib import Path
+import etl.etl_futebol as etl_futebol
+import etl.etl_streaming as etl_streaming
+modo, raw_dir, saida_dir, memoria_max_mb = sys.argv[1], Path(sys.argv[2]), Path(sys.argv[3]), int(sys.argv[4])
+for modulo in (etl_futebol, etl_streaming):
+    modulo.RAW_DIR, modulo.PROCESSED_DIR = raw_dir, saida_dir
+spec = etl_futebol.COMPETICOES["brasileirao"]
+inicio = time.perf_counter()
+if modo == "completo":
+    etl_futebol.etl_competicao(spec)
+else:
+    etl_streaming.etl_competicao_streaming(spec, memoria_max_mb)
+segundos = time.perf_counter() - inicio
+print(json.dumps({"tempo_s": segundos, "pico_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def gerar_raw(destino: Path, escala: int) -> int:
+    spec = COMPETICOES["brasileirao"]
+    base = pd.read_csv(RAW_DIR / spec.arquivo_raw, compression="gzip")
+    copias = []
+    for i in range(escala):
+        copia = base.copy()
+        copia["ano_campeonato"] = copia["ano_campeonato"] + 100 * i
+        copias.append(copia)
+    df = pd.concat(copias, ignore_index=True)
+    df.to_csv(destino / spec.arquivo_raw, index=False, compression="gzip")
+    return len(df)
+
+
+def rodar(modo: str, raw_dir: Path, saida_dir: Path, memoria_max_mb: int) -> dict:
+    saida_dir.mkdir()
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    filho = subprocess.run(
+        [sys.executable, "-c", FILHO, modo, str(raw_dir), str(saida_dir), str(memoria_max_mb)],
+        cwd=_comum.ROOT_DIR, env=env, stdout=subprocess.PIPE, text=True,
+    )
+    if filho.returncode != 0:
+        raise SystemExit(f"Falha no ETL {modo}")
+    return json.loads(filho.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escala", type=int, default=50)
+    parser.add_argument("--memoria-max-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    arquivo = COMPETICOES["brasileirao"].arquivo_processado
+    with tempfile.TemporaryDirectory(prefix="bench_etl_") as tmp:
+        tmp = Path(tmp)
+        (tmp / "raw").mkdir()
+        n = gerar_raw(tmp / "raw", args.escala)
+
+        linhas = []
+        for modo in ["completo", "streaming"]:
+            r = rodar(modo, tmp / "raw", tmp / modo, args.memoria_max_mb)
+            linhas.append({"modo": modo, "linhas": n, "tempo_s": r["tempo_s"], "pico_rss_mb": r["pico_rss_mb"]})
+
+        if not filecmp.cmp(tmp / "completo" / arquivo, tmp / "streaming" / arquivo, shallow=False):
+            raise SystemExit("Saídas diferentes entre o ETL completo e o streaming")
+
+    imprimir_tabela(linhas)
+    print("Saídas idênticas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Tempo de carga e memória de carregar_df_brasileirao em CSV e em Feather.
+
+Para cada formato sobe N processos ao mesmo tempo (simulando workers do
+uvicorn); cada um carrega a base, percorre as colunas numéricas e informa o
+tempo de carga, o RSS e a memória privada (USS). Com o Feather mapeado em
+memória as páginas da base ficam no page cache e não contam no USS.
+
+Gere o Feather antes com: python -m etl.etl_colunar
+
+Uso: python benchmarks/bench_formato_dados.py [--processos 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import _comum
+from _comum import imprimir_tabela
+
+FILHO = r"""
+import json, resource, time
+from app.utils.data_loader import carregar_df_brasileirao
+inicio = time.perf_counter()
+df = carregar_df_brasileirao()
+segundos = time.perf_counter() - inicio
+df.select_dtypes("number").sum()
+resultado = {"carga_s": segundos, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "uss_mb": None}
+try:
+    import psutil
+    resultado["uss_mb"] = psutil.Process().memory_full_info().uss / 2**20
+except ImportError:
+    pass
+print(json.dumps(resultado))
+"""
+
+
+def rodar(formato: str, processos: int):
+    env = dict(os.environ, IA_FUTEBOL_FORMATO_DADOS=formato, PYTHONWARNINGS="ignore")
+    filhos = [
+        subprocess.Popen([sys.executable, "-c", FILHO], cwd=_comum.BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(processos)
+    ]
+    resultados = []
+    for filho in filhos:
+        saida, _ = filho.communicate()
+        if filho.returncode != 0:
+            raise SystemExit(f"Falha ao carregar no formato {formato}")
+        resultados.append(json.loads(saida.strip().splitlines()[-1]))
+    return resultados
+
+
+def media(valores):
+    valores = [v for v in valores if v is not None]
+    return sum(valores) / len(valores) if valores else float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processos", type=int, default=4)
+    args = parser.parse_args()
+
+    linhas = []
+    for formato in ["csv", "feather"]:
+        resultados = rodar(formato, args.processos)
+        linhas.append({
+            "formato": formato,
+            "processos": args.processos,
+            "carga_ms": media([r["carga_s"] for r in resultados]) * 1000,
+            "rss_mb": media([r["rss_mb"] for r in resultados]),
+            "uss_mb": media([r["uss_mb"] for r in resultados]),
+        })
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compara o caminho original de previsão (DataFrame de uma linha + predict_proba)
+com o MotorLogistico do predict_service.
+
+Antes de medir, confere a paridade das probabilidades em todas as partidas da
+base final; o script aborta se a diferença passar da tolerância.
+
+Uso: python benchmarks/bench_inferencia.py [--repeticoes 5000]
+"""
+
+import argparse
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import imprimir_tabela, medir_latencias, resumo_latencias
+
+import numpy as np
+import pandas as pd
+
+from app.services.motor_inferencia import MotorLogistico
+from app.utils.data_loader import carregar_df_brasileirao
+from app.utils.load_model import carregar_modelo
+
+TOLERANCIA = 1e-9
+
+
+def montar_entradas(features) -> pd.DataFrame:
+    # mesmo preenchimento de NaN usado no notebook 06
+    X = carregar_df_brasileirao()[features].copy()
+    for col in features:
+        X[col] = X[col].fillna(X[col].median())
+    return X
+
+
+def verificar_paridade(modelo, motor: MotorLogistico, X: pd.DataFrame) -> float:
+    esperado = modelo.predict_proba(X)
+    obtido = motor.prever_proba(X.to_numpy(dtype=np.float64))
+    diferenca = float(np.abs(esperado - obtido).max())
+
+    # uma partida por vez, como no /prever
+    for dados in X.head(200).to_dict("records"):
+        unico = motor.prever_proba(motor.vetor(dados))
+        referencia = modelo.predict_proba(pd.DataFrame([dados]))[0]
+        diferenca = max(diferenca, float(np.abs(unico - referencia).max()))
+
+    if diferenca > TOLERANCIA:
+        raise SystemExit(f"Paridade falhou: diferença máxima {diferenca:.3e}")
+    return diferenca
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=5000)
+    args = parser.parse_args()
+
+    modelo = carregar_modelo()
+    motor = MotorLogistico.de_pipeline(modelo)
+    X = montar_entradas(motor.features)
+
+    diferenca = verificar_paridade(modelo, motor, X)
+    print(f"Paridade OK em {len(X)} partidas (diferença máxima {diferenca:.3e})\n")
+
+    dados = X.iloc[0].to_dict()
+
+    def caminho_pandas():
+        return modelo.predict_proba(pd.DataFrame([dados]))[0]
+
+    def caminho_motor():
+        return motor.prever_proba(motor.vetor(dados))
+
+    linhas = []
+    for nome, func in [("pipeline (DataFrame)", caminho_pandas), ("motor NumPy", caminho_motor)]:
+        linhas.append({"caminho": nome, **resumo_latencias(medir_latencias(func, args.repeticoes))})
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main()
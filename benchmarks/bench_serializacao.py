@@ -0,0 +1,127 @@
+"""
+Tempo de serialização da resposta de cada endpoint: antes e depois dos
+response models e da RespostaJSON.
+
+- antes: o caminho do FastAPI sem response_model (jsonable_encoder + json.dumps
+  do JSONResponse), com os arrays convertidos por .tolist() como nas rotas antigas.
+- depois: o que a rota faz hoje. Rotas com response_model: validação e JSON
+  gerado pelo pydantic (TypeAdapter.validate_python + dump_json, o mesmo
+  caminho do FastAPI). Rotas de lote: RespostaJSON (orjson lendo os arrays).
+
+Os payloads vêm dos services, fora do tempo medido; antes de medir, o script
+confere que as duas saídas decodificam para o mesmo JSON.
+
+Uso: python benchmarks/bench_serializacao.py [--lote 1000] [--repeticoes 300]
+"""
+
+import argparse
+import json
+from typing import Callable, List, Tuple
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import imprimir_tabela, medir_latencias, resumo_latencias
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.partida_model import PlacarResposta, PrevisaoResposta
+from app.models.simulacao_model import SimulacaoResposta
+from app.models.times_model import ComparacaoResposta, ConfrontoResposta, PerfilTimeResposta, TimesResposta
+from app.services.gols_service import prever_placar, prever_placares_lote
+from app.services.predict_service import obter_motor, prever_lote, prever_partida
+from app.services.simulacao_service import simular_temporada
+from app.services.times_service import comparar_times, confronto, listar_times, perfil_time
+from app.utils.resposta_json import RespostaJSON
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+MAX_GOLS = 6
+
+
+def antes(conteudo) -> bytes:
+    return JSONResponse(jsonable_encoder(conteudo)).body
+
+
+def com_modelo(modelo, conteudo, exclude_none: bool = False) -> Callable[[], bytes]:
+    adaptador = TypeAdapter(modelo)
+    return lambda: adaptador.dump_json(adaptador.validate_python(conteudo), exclude_none=exclude_none)
+
+
+def montar_casos(lote: int) -> List[Tuple[str, Callable[[], bytes], Callable[[], bytes]]]:
+    """(endpoint, serialização antiga, serialização atual) de cada rota."""
+    time_a, time_b = "Flamengo", "Palmeiras"
+    partidas = [{**PARTIDA, "rodada": 1 + i % 38} for i in range(lote)]
+    motor = obter_motor()
+    probs = prever_lote(partidas, motor)
+    lambdas, placares = prever_placares_lote(partidas)
+    placares = placares[:, :MAX_GOLS + 1, :MAX_GOLS + 1]
+
+    previsao = {"probabilidades": prever_partida(PARTIDA)}
+    placar = prever_placar(PARTIDA, MAX_GOLS)
+    times = {"times": listar_times()}
+    comparacao = comparar_times(time_a, time_b)
+    retrospecto = confronto(time_a, time_b)
+    perfil = perfil_time(time_a)
+    simulacao = simular_temporada(2024, simulacoes=1000, semente=1)
+
+    return [
+        ("POST /prever", lambda: antes(previsao), com_modelo(PrevisaoResposta, previsao, exclude_none=True)),
+        ("POST /prever/placar", lambda: antes(placar), com_modelo(PlacarResposta, placar)),
+        ("GET /times", lambda: antes(times), com_modelo(TimesResposta, times)),
+        ("GET /comparar-times", lambda: antes(comparacao),
+         com_modelo(ComparacaoResposta, comparacao, exclude_none=True)),
+        ("GET /confronto", lambda: antes(retrospecto), com_modelo(ConfrontoResposta, retrospecto)),
+        # antes, o service convertia cada valor do perfil com float()
+        ("GET /perfil-time", lambda: antes({"time": time_a, "perfil": {k: float(v) for k, v in perfil.items()}}),
+         com_modelo(PerfilTimeResposta, {"time": time_a, "perfil": perfil})),
+        ("POST /simular-temporada", lambda: antes(simulacao), com_modelo(SimulacaoResposta, simulacao)),
+        # nas rotas de lote o .tolist() fazia parte da serialização antiga
+        (f"POST /prever/lote ({lote})",
+         lambda: antes({"classes": list(motor.classes), "probabilidades": probs.tolist()}),
+         lambda: RespostaJSON({"classes": list(motor.classes), "probabilidades": probs}).body),
+        (f"POST /prever/placar/lote ({lote})",
+         lambda: antes({"gols_esperados": lambdas.tolist(), "placares": placares.tolist()}),
+         lambda: RespostaJSON({"gols_esperados": lambdas, "placares": placares}).body),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lote", type=int, default=1000, help="partidas nos endpoints de lote")
+    parser.add_argument("--repeticoes", type=int, default=300)
+    args = parser.parse_args()
+
+    linhas = []
+    for endpoint, serializar_antes, serializar_depois in montar_casos(args.lote):
+        corpo_depois = serializar_depois()
+        if json.loads(serializar_antes()) != json.loads(corpo_depois):
+            raise SystemExit(f"Paridade falhou em {endpoint}")
+
+        t_antes = resumo_latencias(medir_latencias(serializar_antes, args.repeticoes, aquecimento=5))
+        t_depois = resumo_latencias(medir_latencias(serializar_depois, args.repeticoes, aquecimento=5))
+        linhas.append({
+            "endpoint": endpoint,
+            "bytes": len(corpo_depois),
+            "antes_p50_us": t_antes["p50_us"],
+            "depois_p50_us": t_depois["p50_us"],
+            "antes_p99_us": t_antes["p99_us"],
+            "depois_p99_us": t_depois["p99_us"],
+            "ganho": t_antes["p50_us"] / t_depois["p50_us"],
+        })
+
+    print("Paridade OK: as duas serializações decodificam para o mesmo JSON\n")
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main()
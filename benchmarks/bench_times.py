@@ -0,0 +1,92 @@
+"""
+Vazão de /comparar-times e /times antes e depois do índice de times.
+
+"Antes" é a implementação original de comparar_times/listar_times, que filtra
+o DataFrame de times a cada requisição; "depois" é o times_service atual,
+baseado em IndiceTimes. As duas são servidas pelo mesmo app via TestClient.
+
+Uso: python benchmarks/bench_times.py [--requisicoes 2000]
+"""
+
+import argparse
+import itertools
+import time
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import imprimir_tabela
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.services import times_service
+from app.utils.data_loader import carregar_df_times, carregar_indice_times
+
+
+def listar_times_original():
+    return sorted(carregar_df_times()["time"].unique())
+
+
+def comparar_times_original(time_a, time_b):
+    df_times = carregar_df_times()
+    subset = df_times[df_times["time"].isin([time_a, time_b])]
+    if subset.empty:
+        raise ValueError("Nenhum dado encontrado para esses times.")
+    stats = {}
+    for t in [time_a, time_b]:
+        jogos_time = subset[subset["time"] == t]
+        stats[t] = {
+            "jogos": int(jogos_time.shape[0]),
+            "gols_pro": float(jogos_time["gols_pro"].mean()),
+            "gols_contra": float(jogos_time["gols_contra"].mean()),
+            "vitorias": int(jogos_time["vitoria"].sum()),
+            "empates": int(jogos_time["empate"].sum()),
+            "derrotas": int(jogos_time["derrota"].sum()),
+        }
+    return {
+        "time_a": time_a,
+        "time_b": time_b,
+        "estatisticas": stats,
+        "empates_totais": int(subset["empate"].sum()),
+    }
+
+
+def vazao(cliente: TestClient, rota: str, parametros, requisicoes: int) -> float:
+    inicio = time.perf_counter()
+    for params in itertools.islice(itertools.cycle(parametros), requisicoes):
+        resposta = cliente.get(rota, params=params)
+        resposta.raise_for_status()
+    return requisicoes / (time.perf_counter() - inicio)
+
+
+def main_bench() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    nomes = list(carregar_indice_times().nomes)
+    pares = [{"time_a": a, "time_b": b} for a, b in zip(nomes, nomes[1:] + nomes[:1])]
+
+    # as duas versões precisam responder as mesmas estatísticas por time
+    # (empates_totais mudou de significado: agora conta só os confrontos diretos)
+    for par in pares:
+        original = comparar_times_original(**par)["estatisticas"]
+        assert original == times_service.comparar_times(**par)["estatisticas"], par
+    assert listar_times_original() == times_service.listar_times()
+
+    cliente = TestClient(main.app)
+    linhas = []
+    for versao, comparar, listar in [
+        ("original (DataFrame)", comparar_times_original, listar_times_original),
+        ("índice", times_service.comparar_times, times_service.listar_times),
+    ]:
+        main.comparar_times, main.listar_times = comparar, listar
+        linhas.append({
+            "versao": versao,
+            "comparar_req_s": vazao(cliente, "/comparar-times", pares, args.requisicoes),
+            "times_req_s": vazao(cliente, "/times", [{}], args.requisicoes),
+        })
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,91 @@
+"""
+Tratamento de nulos: regras originais (groupby + transform com lambda)
+contra as regras vetorizadas de etl/etl_tratamento_nulos.py.
+
+A base sintética repete o Brasileirão tratado `--escala` vezes (padrão 100x),
+deslocando ano_campeonato a cada cópia para multiplicar também o número de
+temporadas, e apaga datas/públicos aleatoriamente para ter o que preencher.
+As duas versões precisam produzir o mesmo DataFrame.
+
+Uso: python benchmarks/bench_tratamento_nulos.py [--escala 100]
+"""
+
+import argparse
+import time
+from typing import Dict
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import imprimir_tabela
+
+import numpy as np
+import pandas as pd
+
+from etl.etl_tratamento_nulos import BR_PATH, fill_brasileirao
+
+COLS_ESTAT = [
+    "escanteios_mandante", "escanteios_visitante", "faltas_mandante", "faltas_visitante",
+    "chutes_bola_parada_mandante", "chutes_bola_parada_visitante", "defesas_mandante",
+    "defesas_visitante", "impedimentos_mandante", "impedimentos_visitante",
+    "chutes_mandante", "chutes_visitante", "chutes_fora_mandante", "chutes_fora_visitante"
+]
+
+
+def fill_brasileirao_original(df: pd.DataFrame, tempos: Dict[str, float]) -> pd.DataFrame:
+    # regras como estavam antes da vetorização (fillna(method=...) trocado
+    # por ffill/bfill, que é o mesmo callback por grupo)
+    inicio = time.perf_counter()
+    df["data"] = pd.to_datetime(df["data"], errors="coerce")
+    df["data"] = df.groupby("ano_campeonato")["data"].transform(lambda x: x.ffill().bfill())
+    tempos["datas_ffill_bfill"] = time.perf_counter() - inicio
+
+    for col in ["publico", "publico_max"]:
+        inicio = time.perf_counter()
+        df[col] = df.groupby("ano_campeonato")[col].transform(lambda x: x.fillna(x.median()))
+        tempos[f"{col}_mediana_ano"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    df[COLS_ESTAT] = df[COLS_ESTAT].fillna(0)
+    tempos["estatisticas_zero"] = time.perf_counter() - inicio
+    return df
+
+
+def base_sintetica(escala: int, semente: int = 42) -> pd.DataFrame:
+    base = pd.read_csv(BR_PATH)
+    copias = []
+    for i in range(escala):
+        copia = base.copy()
+        copia["ano_campeonato"] = copia["ano_campeonato"] + 100 * i
+        copias.append(copia)
+    df = pd.concat(copias, ignore_index=True)
+
+    rng = np.random.default_rng(semente)
+    for col, fracao in [("data", 0.05), ("publico", 0.1), ("publico_max", 0.1)]:
+        df.loc[rng.random(len(df)) < fracao, col] = np.nan
+    return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escala", type=int, default=100)
+    args = parser.parse_args()
+
+    df = base_sintetica(args.escala)
+    print(f"Base sintética: {len(df)} partidas, {df['ano_campeonato'].nunique()} temporadas\n")
+
+    tempos_original: Dict[str, float] = {}
+    tempos_vetorizado: Dict[str, float] = {}
+    original = fill_brasileirao_original(df.copy(), tempos_original)
+    vetorizado = fill_brasileirao(df.copy(), tempos_vetorizado)
+    pd.testing.assert_frame_equal(original, vetorizado)
+
+    linhas = []
+    for regra in tempos_original:
+        antes, depois = tempos_original[regra] * 1000, tempos_vetorizado[regra] * 1000
+        linhas.append({"regra": regra, "original_ms": antes, "vetorizado_ms": depois, "ganho": f"{antes / depois:.1f}x"})
+    antes, depois = sum(tempos_original.values()) * 1000, sum(tempos_vetorizado.values()) * 1000
+    linhas.append({"regra": "total", "original_ms": antes, "vetorizado_ms": depois, "ganho": f"{antes / depois:.1f}x"})
+    imprimir_tabela(linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compara dois resultados da suíte (benchmarks/suite.py) e aponta regressões.
+
+Para cada escala e medição presentes nos dois arquivos, mostra o p50 de
+antes e depois e a razão depois / antes. A medição é regressão quando a
+razão passa de 1 + --limite; nesse caso o script termina com código 1
+(útil num job de CI).
+
+Uso: python benchmarks/comparar.py <antes.json> <depois.json> [--limite 0.10]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import _comum  # noqa: F401  (ajusta o sys.path)
+from _comum import imprimir_tabela
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("antes", type=Path)
+    parser.add_argument("depois", type=Path)
+    parser.add_argument("--limite", type=float, default=0.10, help="aumento relativo do p50 tolerado")
+    args = parser.parse_args()
+
+    antes = json.loads(args.antes.read_text(encoding="utf-8"))
+    depois = json.loads(args.depois.read_text(encoding="utf-8"))
+    print(f"{antes['commit']} -> {depois['commit']} (limite +{args.limite:.0%} no p50)\n")
+
+    linhas, regressoes = [], 0
+    for escala, dados in depois["escalas"].items():
+        anteriores = antes["escalas"].get(escala, {}).get("medicoes", {})
+        for nome, valores in dados["medicoes"].items():
+            if nome not in anteriores:
+                continue
+            p50_antes, p50_depois = anteriores[nome]["p50_us"], valores["p50_us"]
+            razao = p50_depois / p50_antes
+            regressao = razao > 1 + args.limite
+            regressoes += regressao
+            linhas.append({
+                "escala": f"{escala}x",
+                "medicao": nome,
+                "p50_antes_us": p50_antes,
+                "p50_depois_us": p50_depois,
+                "razao": razao,
+                "situacao": "REGRESSÃO" if regressao else "ok",
+            })
+
+    imprimir_tabela(linhas)
+    print(f"\n{regressoes} regressão(ões) em {len(linhas)} medições")
+    sys.exit(1 if regressoes else 0)
+
+
+if __name__ == "__main__":
+    main()
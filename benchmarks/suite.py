@@ -0,0 +1,249 @@
+"""
+Suíte de benchmarks do ETL, dos loaders, dos services e dos endpoints, em
+bases sintéticas de 1x, 10x e 100x a tabela de partidas.
+
+Para cada escala, o gerador grava numa pasta temporária uma cópia de data/
+(brutos das duas competições e brasileirao_final.csv) com as partidas
+repetidas N vezes, deslocando ano_campeonato a cada cópia. A escala é medida
+num processo separado, com os caminhos do ETL e do data_loader apontando
+para essa pasta, para que os lru_cache e a memória de uma escala não
+contaminem a outra. O cache de previsões fica desligado, para medir a
+inferência e não o acerto do cache.
+
+Medições:
+- etl: run_all_etl e fill_brasileirao
+- carga: carregar_df_brasileirao, _construir_base_times e
+  carregar_metricas_times, com os caches limpos a cada chamada
+- services: comparar_times, perfil_time e prever_partida com os caches quentes
+- http: endpoints pelo TestClient, em processo (inclui validação e serialização)
+
+O resultado (p50, p99 e média em µs de cada medição, por escala) é gravado em
+JSON com o commit atual, para comparar com benchmarks/comparar.py.
+
+Uso: python benchmarks/suite.py [--escalas 1,10,100] [--repeticoes 200]
+                                [--repeticoes-etl 3] [--saida benchmarks/resultados]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import _comum
+from _comum import imprimir_tabela, resumo_latencias
+
+import numpy as np
+import pandas as pd
+
+from etl.etl_futebol import COMPETICOES, RAW_DIR
+
+FINAL_CSV = _comum.ROOT_DIR / "data" / "final" / "brasileirao_final.csv"
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+
+
+def _replicar(df: pd.DataFrame, escala: int) -> pd.DataFrame:
+    # cada cópia vira outras temporadas (mesmos times, anos + 100 * i)
+    copias = []
+    for i in range(escala):
+        copia = df.copy()
+        copia["ano_campeonato"] = copia["ano_campeonato"] + 100 * i
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def gerar_base(raiz: Path, escala: int) -> int:
+    """
+    Grava em raiz/data os brutos e a base final multiplicados por `escala`.
+    Retorna o número de partidas da base final.
+    """
+    raw_dir, final_dir = raiz / "data" / "raw", raiz / "data" / "final"
+    raw_dir.mkdir(parents=True)
+    final_dir.mkdir(parents=True)
+    for spec in COMPETICOES.values():
+        bruto = pd.read_csv(RAW_DIR / spec.arquivo_raw, compression="gzip")
+        _replicar(bruto, escala).to_csv(raw_dir / spec.arquivo_raw, index=False, compression="gzip")
+    final = _replicar(pd.read_csv(FINAL_CSV), escala)
+    final.to_csv(final_dir / FINAL_CSV.name, index=False)
+    return len(final)
+
+
+def cronometrar(func: Callable[[], object], repeticoes: int, preparo: Optional[Callable[[], None]] = None,
+                aquecimento: int = 0) -> Dict[str, float]:
+    """
+    Como _comum.medir_latencias, mas com um preparo fora do tempo medido
+    (limpar caches, copiar a entrada) antes de cada chamada.
+    """
+    for _ in range(aquecimento):
+        func()
+    tempos = np.empty(repeticoes)
+    for i in range(repeticoes):
+        if preparo is not None:
+            preparo()
+        inicio = time.perf_counter_ns()
+        func()
+        tempos[i] = time.perf_counter_ns() - inicio
+    return {**resumo_latencias(tempos / 1_000), "repeticoes": repeticoes}
+
+
+def medir_escala(raiz: Path, repeticoes: int, repeticoes_etl: int) -> Dict[str, Dict]:
+    """Roda no processo filho: mede tudo sobre a base gerada em `raiz`."""
+    import etl.etl_futebol as etl_futebol
+    import etl.etl_tratamento_nulos as etl_tratamento_nulos
+    from app.utils import data_loader
+
+    dados = raiz / "data"
+    etl_futebol.RAW_DIR, etl_futebol.PROCESSED_DIR = dados / "raw", dados / "processed"
+    data_loader._get_root_dir = lambda: raiz
+
+    from fastapi.testclient import TestClient
+    import app.main as main
+    from app.services.predict_service import prever_partida
+    from app.services.times_service import comparar_times, perfil_time
+
+    medicoes: Dict[str, Dict] = {}
+
+    # ETL (a saída do print vai para o lixo; só o tempo interessa)
+    with contextlib.redirect_stdout(io.StringIO()):
+        medicoes["etl.run_all_etl"] = cronometrar(etl_futebol.run_all_etl, repeticoes_etl)
+    processado = pd.read_csv(dados / "processed" / etl_futebol.BRASILEIRAO_PROCESSED)
+    entrada: Dict[str, pd.DataFrame] = {}
+    medicoes["etl.fill_brasileirao"] = cronometrar(
+        lambda: etl_tratamento_nulos.fill_brasileirao(entrada["df"]), repeticoes_etl,
+        preparo=lambda: entrada.update(df=processado.copy()),
+    )
+
+    # carga a frio
+    carregar_df = data_loader.carregar_df_brasileirao
+    medicoes["carga.carregar_df_brasileirao"] = cronometrar(
+        carregar_df, repeticoes_etl, preparo=carregar_df.cache_clear
+    )
+    df = carregar_df()
+    medicoes["carga._construir_base_times"] = cronometrar(
+        lambda: data_loader._construir_base_times(df), repeticoes_etl
+    )
+
+    def limpar_metricas():
+        data_loader.carregar_df_times.cache_clear()
+        data_loader.carregar_metricas_times.cache_clear()
+
+    medicoes["carga.carregar_metricas_times"] = cronometrar(
+        data_loader.carregar_metricas_times, repeticoes_etl, preparo=limpar_metricas
+    )
+
+    # services e endpoints com os caches quentes
+    time_a, time_b = df["time_mandante"].value_counts().index[:2]
+    medicoes["service.comparar_times"] = cronometrar(
+        lambda: comparar_times(time_a, time_b), repeticoes, aquecimento=10
+    )
+    medicoes["service.perfil_time"] = cronometrar(lambda: perfil_time(time_a), repeticoes, aquecimento=10)
+    medicoes["service.prever_partida"] = cronometrar(lambda: prever_partida(PARTIDA), repeticoes, aquecimento=10)
+
+    rotas = {
+        "GET /times": ("GET", "/times", None, None),
+        "GET /comparar-times": ("GET", "/comparar-times", {"time_a": time_a, "time_b": time_b}, None),
+        "GET /perfil-time": ("GET", "/perfil-time", {"time": time_a}, None),
+        "GET /confronto": ("GET", "/confronto", {"time_a": time_a, "time_b": time_b}, None),
+        "POST /prever": ("POST", "/prever", None, PARTIDA),
+        "POST /prever/placar": ("POST", "/prever/placar", None, PARTIDA),
+    }
+    with TestClient(main.app) as cliente:
+        for nome, (metodo, caminho, params, corpo) in rotas.items():
+            def requisitar():
+                cliente.request(metodo, caminho, params=params, json=corpo).raise_for_status()
+            medicoes[f"http.{nome}"] = cronometrar(requisitar, repeticoes, aquecimento=10)
+
+    return medicoes
+
+
+def rodar_escala(escala: int, repeticoes: int, repeticoes_etl: int) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp:
+        raiz = Path(tmp)
+        partidas = gerar_base(raiz, escala)
+        env = dict(
+            os.environ,
+            PYTHONWARNINGS="ignore",
+            IA_FUTEBOL_FORMATO_DADOS="csv",
+            IA_FUTEBOL_PREVISAO_CACHE="0",
+        )
+        filho = subprocess.run(
+            [sys.executable, __file__, "--filho", str(raiz),
+             "--repeticoes", str(repeticoes), "--repeticoes-etl", str(repeticoes_etl)],
+            cwd=_comum.ROOT_DIR, env=env, stdout=subprocess.PIPE, text=True,
+        )
+        if filho.returncode != 0:
+            raise SystemExit(f"Falha na escala {escala}x")
+        medicoes = json.loads(filho.stdout.strip().splitlines()[-1])
+    return {"partidas": partidas, "medicoes": medicoes}
+
+
+def commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_comum.ROOT_DIR,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--escalas", default="1,10,100", help="multiplicadores da tabela de partidas")
+    parser.add_argument("--repeticoes", type=int, default=200, help="chamadas por medição de services e endpoints")
+    parser.add_argument("--repeticoes-etl", type=int, default=3, help="chamadas por medição de ETL e carga")
+    parser.add_argument("--saida", type=Path, default=_comum.ROOT_DIR / "benchmarks" / "resultados")
+    parser.add_argument("--filho", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho is not None:
+        print(json.dumps(medir_escala(args.filho, args.repeticoes, args.repeticoes_etl)))
+        return
+
+    commit = commit_atual()
+    resultado = {
+        "commit": commit,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "escalas": {},
+    }
+    for escala in (int(e) for e in args.escalas.split(",")):
+        print(f"Escala {escala}x...", flush=True)
+        resultado["escalas"][str(escala)] = rodar_escala(escala, args.repeticoes, args.repeticoes_etl)
+
+    linhas = [
+        {"escala": f"{escala}x", "medicao": nome, **{k: v for k, v in valores.items() if k != "repeticoes"}}
+        for escala, dados in resultado["escalas"].items()
+        for nome, valores in dados["medicoes"].items()
+    ]
+    print()
+    imprimir_tabela(linhas)
+
+    args.saida.mkdir(parents=True, exist_ok=True)
+    caminho = args.saida / f"{commit}.json"
+    caminho.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultado gravado em {caminho}")
+
+
+if __name__ == "__main__":
+    main()
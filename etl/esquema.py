@@ -0,0 +1,132 @@
+# etl/esquema.py
+
+"""
+Esquema de tipos da base final do Brasileirão, compartilhado entre o ETL
+(Feather e partições) e o backend (leitura do CSV e base por time).
+
+- Nomes (times, técnicos, estádio, árbitro, resultado): categorias, com o
+  mesmo conjunto de categorias para mandante e visitante
+- Rodada, temporada, pontos: inteiros estreitos; gols e colocação podem ter
+  nulos e usam os inteiros anuláveis do pandas (Int8)
+- Estatísticas de jogo e público: float32 (são contagens, exatas em float32)
+- Flags de resultado: bool
+
+Valores de elenco, idades e público máximo continuam float64: são features
+do modelo e não podem perder precisão.
+
+assinatura_arquivo identifica o CSV de origem do Feather e das partições,
+para o backend conferir se foram gerados a partir do CSV atual.
+
+Este módulo só depende do pandas, para poder ser importado pelo backend.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+import pandas as pd
+
+
+# Colunas que compartilham o mesmo conjunto de categorias
+CATEGORIAS_COMPARTILHADAS: List[List[str]] = [
+    ["time_mandante", "time_visitante"],
+    ["tecnico_mandante", "tecnico_visitante"],
+    ["estadio"],
+    ["arbitro"],
+    ["resultado"],
+]
+
+# Inteiros sem nulos na base
+COLUNAS_INTEIRAS: Dict[str, str] = {
+    "ano_campeonato": "int16",
+    "rodada": "int8",
+    "pontos_mandante": "int8",
+    "pontos_visitante": "int8",
+}
+
+# Inteiros que podem ter nulos (jogo sem placar, colocação desconhecida)
+COLUNAS_INTEIRAS_NULAVEIS: Dict[str, str] = {
+    "gols_mandante": "Int8",
+    "gols_visitante": "Int8",
+    "gols_1_tempo_mandante": "Int8",
+    "gols_1_tempo_visitante": "Int8",
+    "colocacao_mandante": "Int8",
+    "colocacao_visitante": "Int8",
+}
+
+COLUNAS_FLOAT32: List[str] = [
+    "publico",
+    "escanteios_mandante", "escanteios_visitante",
+    "faltas_mandante", "faltas_visitante",
+    "chutes_bola_parada_mandante", "chutes_bola_parada_visitante",
+    "defesas_mandante", "defesas_visitante",
+    "impedimentos_mandante", "impedimentos_visitante",
+    "chutes_mandante", "chutes_visitante",
+    "chutes_fora_mandante", "chutes_fora_visitante",
+]
+
+COLUNAS_BOOL: List[str] = ["mandante_venceu", "visitante_venceu", "empate_flag"]
+
+
+def _tipo_inteiro(serie: pd.Series, dtype: str) -> str:
+    # nulo inesperado numa coluna "sem nulos": usa o inteiro anulável em vez de falhar
+    return dtype.capitalize() if serie.isna().any() else dtype
+
+
+def aplicar_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas de `df` para os tipos do esquema.
+
+    Colunas que já estão no tipo certo não são copiadas (importante para o
+    Feather aberto via memory-map); se nada mudar, devolve o próprio `df`.
+    """
+    convertidas = {}
+
+    if "data" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["data"]):
+        convertidas["data"] = pd.to_datetime(df["data"], errors="coerce")
+
+    for grupo in CATEGORIAS_COMPARTILHADAS:
+        colunas = [c for c in grupo if c in df.columns]
+        if not colunas:
+            continue
+        dtypes = {df[c].dtype for c in colunas}
+        if len(dtypes) == 1 and isinstance(next(iter(dtypes)), pd.CategoricalDtype):
+            continue
+        valores = pd.unique(pd.concat([df[c].astype(object) for c in colunas]).dropna())
+        dtype = pd.CategoricalDtype(sorted(valores))
+        for col in colunas:
+            convertidas[col] = df[col].astype(dtype)
+
+    tipos = {col: _tipo_inteiro(df[col], dtype) for col, dtype in COLUNAS_INTEIRAS.items() if col in df.columns}
+    tipos.update({col: dtype for col, dtype in COLUNAS_INTEIRAS_NULAVEIS.items() if col in df.columns})
+    tipos.update({col: "float32" for col in COLUNAS_FLOAT32 if col in df.columns})
+    tipos.update({col: "bool" for col in COLUNAS_BOOL if col in df.columns and df[col].notna().all()})
+
+    for col, dtype in tipos.items():
+        if df[col].dtype != dtype:
+            convertidas[col] = df[col].astype(dtype)
+
+    if not convertidas:
+        return df
+    df = df.copy(deep=False)
+    for col, serie in convertidas.items():
+        df[col] = serie
+    return df
+
+
+def memoria_bytes(df: pd.DataFrame) -> int:
+    """
+    Memória ocupada por `df`, contando o conteúdo das strings.
+    """
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def assinatura_arquivo(path: Path) -> Dict:
+    """
+    Tamanho e SHA-1 do conteúdo de `path`. Diferente da data de modificação,
+    não muda com git checkout ou cópia do arquivo.
+    """
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha1.update(bloco)
+    return {"bytes": Path(path).stat().st_size, "sha1": sha1.hexdigest()}
@@ -0,0 +1,71 @@
+# etl/etl_colunar.py
+
+"""
+Exportação da base final do Brasileirão em formato binário colunar.
+
+Fluxo:
+- Leitura de data/final/brasileirao_final.csv (gerado no notebook 04)
+- Tipagem explícita pelo esquema de etl/esquema.py: nomes como categorias,
+  inteiros estreitos, estatísticas em float32, flags em bool e data como datetime
+- Gravação em Feather (Arrow IPC) sem compressão, para que o backend possa
+  abrir o arquivo via memory-map e os workers compartilhem as páginas pelo
+  cache do sistema operacional
+- Tamanho e SHA-1 do CSV lido gravados nos metadados do Feather (chave "origem")
+
+O CSV continua sendo a fonte oficial; o backend volta para ele se o Feather
+não existir, tiver sido gerado de outro CSV ou se o pyarrow não estiver instalado.
+"""
+
+import json
+from pathlib import Path
+import pandas as pd
+
+from etl.esquema import aplicar_esquema, assinatura_arquivo
+
+
+# Caminhos base
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+FINAL_DIR = DATA_DIR / "final"
+
+BRASILEIRAO_FINAL_CSV = FINAL_DIR / "brasileirao_final.csv"
+BRASILEIRAO_FINAL_FEATHER = FINAL_DIR / "brasileirao_final.feather"
+
+# metadado do Feather com a assinatura do CSV de origem
+METADADO_ORIGEM = b"origem"
+
+
+def tipar_brasileirao_final(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica os tipos do formato colunar à base final (ver etl/esquema.py).
+    """
+    return aplicar_esquema(df)
+
+
+def exportar_brasileirao_final(
+    origem: Path = BRASILEIRAO_FINAL_CSV,
+    destino: Path = BRASILEIRAO_FINAL_FEATHER,
+) -> Path:
+    """
+    Lê a base final em CSV e grava a versão Feather tipada.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    print(f"Lendo base final de {origem}...")
+    df = tipar_brasileirao_final(pd.read_csv(origem))
+
+    tabela = pa.Table.from_pandas(df, preserve_index=None)
+    metadados = {
+        **(tabela.schema.metadata or {}),
+        METADADO_ORIGEM: json.dumps(assinatura_arquivo(origem)).encode("utf-8"),
+    }
+    # sem compressão: é o que permite memory-map no backend
+    feather.write_feather(tabela.replace_schema_metadata(metadados), destino, compression="uncompressed")
+    print(f"Base final colunar salva em {destino}")
+
+    return destino
+
+
+if __name__ == "__main__":
+    exportar_brasileirao_final()
@@ -8,10 +8,18 @@ Fluxo geral:
 - Limpeza e padronização de tipos
 - Criação de colunas derivadas básicas (resultado, pontos, flags)
 - Gravação de arquivos tratados em data/processed
+
+As competições ficam no registro COMPETICOES. Com --workers N as temporadas
+de todas as competições são tratadas em paralelo num pool de processos.
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
 
 # Caminhos base
@@ -25,6 +33,10 @@ PROCESSED_DIR = DATA_DIR / "processed"
 BRASILEIRAO_RAW = "mundo_transfermarkt_competicoes_brasileirao_serie_a.csv.gz"
 COPA_RAW = "mundo_transfermarkt_competicoes_copa_brasil.csv.gz"
 
+# Nomes dos arquivos tratados
+BRASILEIRAO_PROCESSED = "brasileirao_serie_a_clean.csv"
+COPA_PROCESSED = "copa_brasil_clean.csv"
+
 
 def to_numeric_safe(df: pd.DataFrame, columns: list) -> pd.DataFrame:
     """
@@ -73,15 +85,35 @@ def add_resultado_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def clean_common_columns(df: pd.DataFrame) -> pd.DataFrame:
+def formato_data(df: pd.DataFrame) -> Optional[str]:
+    """
+    Formato que pd.to_datetime(dayfirst=True) infere para a coluna data.
+
+    O pandas adivinha o formato pelo primeiro valor não nulo e aplica esse
+    formato a todas as linhas (as que não encaixam viram NaT). Quem trata só
+    uma parte das linhas precisa fixar o formato inferido do arquivo inteiro
+    para chegar ao mesmo resultado.
+    """
+    if "data" not in df.columns:
+        return None
+    validos = df["data"].dropna()
+    if validos.empty or not isinstance(validos.iloc[0], str):
+        return None
+    return guess_datetime_format(validos.iloc[0], dayfirst=True)
+
+
+def clean_common_columns(df: pd.DataFrame, formato: Optional[str] = None) -> pd.DataFrame:
     """
     Limpeza comum para ambos os campeonatos:
-    - data em formato datetime
+    - data em formato datetime (formato inferido, ou `formato` se informado)
     - ano_campeonato numérico
     - conversão de colunas numéricas básicas
     """
     if "data" in df.columns:
-        df["data"] = pd.to_datetime(df["data"], errors="coerce", dayfirst=True)
+        if formato:
+            df["data"] = pd.to_datetime(df["data"], errors="coerce", format=formato)
+        else:
+            df["data"] = pd.to_datetime(df["data"], errors="coerce", dayfirst=True)
 
     if "ano_campeonato" in df.columns:
         df["ano_campeonato"] = pd.to_numeric(df["ano_campeonato"], errors="coerce").astype("Int64")
@@ -119,92 +151,171 @@ def clean_common_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def etl_brasileirao() -> pd.DataFrame:
+@dataclass(frozen=True)
+class CompeticaoSpec:
     """
-    Faz o ETL específico do Brasileirão Série A.
-    Retorna o DataFrame tratado.
+    Descrição de uma competição para o ETL: arquivos de entrada e saída,
+    colunas numéricas próprias e ordenação da saída.
+    """
+    nome: str
+    descricao: str
+    arquivo_raw: str
+    arquivo_processado: str
+    colunas_numericas: Tuple[str, ...]
+    ordenacao: Tuple[str, ...]
+
+
+# Registro das competições tratadas pelo ETL (novas competições entram aqui)
+COMPETICOES: Dict[str, CompeticaoSpec] = {
+    "brasileirao": CompeticaoSpec(
+        nome="brasileirao",
+        descricao="Brasileirão Série A",
+        arquivo_raw=BRASILEIRAO_RAW,
+        arquivo_processado=BRASILEIRAO_PROCESSED,
+        colunas_numericas=("rodada", "colocacao_mandante", "colocacao_visitante"),
+        # Ordenação básica por ano, rodada, data
+        ordenacao=("ano_campeonato", "rodada", "data"),
+    ),
+    "copa_brasil": CompeticaoSpec(
+        nome="copa_brasil",
+        descricao="Copa do Brasil",
+        arquivo_raw=COPA_RAW,
+        arquivo_processado=COPA_PROCESSED,
+        colunas_numericas=("penalti", "gols_penalti_mandante", "gols_penalti_visitante"),
+        # Ordenação básica por ano, fase, data
+        ordenacao=("ano_campeonato", "fase", "data"),
+    ),
+}
+
+COLUNA_PARTICAO = "ano_campeonato"
+
+
+def ordenar(df: pd.DataFrame, colunas) -> pd.DataFrame:
+    """
+    Ordena pelas colunas que existirem no DataFrame (ordenação estável).
     """
-    path = RAW_DIR / BRASILEIRAO_RAW
-    print(f"Lendo Brasileirão de {path}...")
-    df = pd.read_csv(path, compression="gzip")
+    sort_cols = [c for c in colunas if c in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols).reset_index(drop=True)
+    return df
 
+
+def transformar(spec: CompeticaoSpec, df: pd.DataFrame, formato: Optional[str] = None) -> pd.DataFrame:
+    """
+    Limpeza, tipagem e colunas derivadas de uma competição.
+    Todas as etapas são linha a linha, exceto a ordenação final.
+    """
     # Limpeza comum
-    df = clean_common_columns(df)
+    df = clean_common_columns(df, formato)
 
-    # Colunas numéricas específicas do Brasileirão
-    numeric_brasileirao = [
-        "rodada",
-        "colocacao_mandante",
-        "colocacao_visitante",
-    ]
-    df = to_numeric_safe(df, numeric_brasileirao)
+    # Colunas numéricas específicas da competição
+    df = to_numeric_safe(df, list(spec.colunas_numericas))
 
     # Resultado e pontos
     df = add_resultado_columns(df)
 
-    # Ordenação básica por ano, rodada, data
-    sort_cols = [c for c in ["ano_campeonato", "rodada", "data"] if c in df.columns]
-    if sort_cols:
-        df = df.sort_values(sort_cols).reset_index(drop=True)
+    return ordenar(df, spec.ordenacao)
+
+
+def ler_raw(spec: CompeticaoSpec) -> pd.DataFrame:
+    path = RAW_DIR / spec.arquivo_raw
+    print(f"Lendo {spec.descricao} de {path}...")
+    return pd.read_csv(path, compression="gzip")
 
-    # Salva versão tratada
-    out_path = PROCESSED_DIR / "brasileirao_serie_a_clean.csv"
+
+def salvar_processado(spec: CompeticaoSpec, df: pd.DataFrame) -> None:
+    out_path = PROCESSED_DIR / spec.arquivo_processado
     df.to_csv(out_path, index=False)
-    print(f"Brasileirão tratado salvo em {out_path}")
+    print(f"{spec.descricao}: dados tratados salvos em {out_path}")
+
 
+def etl_competicao(spec: CompeticaoSpec) -> pd.DataFrame:
+    """
+    Faz o ETL de uma competição em um único processo.
+    Retorna o DataFrame tratado.
+    """
+    df = transformar(spec, ler_raw(spec))
+    salvar_processado(spec, df)
     return df
 
 
+def etl_brasileirao() -> pd.DataFrame:
+    """
+    Faz o ETL específico do Brasileirão Série A.
+    Retorna o DataFrame tratado.
+    """
+    return etl_competicao(COMPETICOES["brasileirao"])
+
+
 def etl_copa_brasil() -> pd.DataFrame:
     """
     Faz o ETL específico da Copa do Brasil.
     Retorna o DataFrame tratado.
     """
-    path = RAW_DIR / COPA_RAW
-    print(f"Lendo Copa do Brasil de {path}...")
-    df = pd.read_csv(path, compression="gzip")
+    return etl_competicao(COMPETICOES["copa_brasil"])
 
-    # Limpeza comum
-    df = clean_common_columns(df)
 
-    # Colunas numéricas específicas da Copa do Brasil
-    numeric_copa = [
-        "penalti",
-        "gols_penalti_mandante",
-        "gols_penalti_visitante",
-    ]
-    df = to_numeric_safe(df, numeric_copa)
+def _transformar_particao(nome: str, df: pd.DataFrame, formato: Optional[str]) -> pd.DataFrame:
+    # executado nos processos do pool: recebe só o nome, a spec vem do registro
+    return transformar(COMPETICOES[nome], df, formato)
 
-    # Resultado e pontos
-    df = add_resultado_columns(df)
 
-    # Ordenação básica por ano, fase, data
-    sort_cols = [c for c in ["ano_campeonato", "fase", "data"] if c in df.columns]
-    if sort_cols:
-        df = df.sort_values(sort_cols).reset_index(drop=True)
+def _particoes(df: pd.DataFrame) -> Dict[float, pd.DataFrame]:
+    # temporadas em ordem crescente; linhas sem ano ficam numa partição própria
+    grupos = df.groupby(pd.to_numeric(df[COLUNA_PARTICAO], errors="coerce"), dropna=False, sort=True).indices
+    return {chave: df.iloc[posicoes] for chave, posicoes in grupos.items()}
 
-    # Salva versão tratada
-    out_path = PROCESSED_DIR / "copa_brasil_clean.csv"
-    df.to_csv(out_path, index=False)
-    print(f"Copa do Brasil tratada salva em {out_path}")
-
-    return df
 
+def etl_paralelo(specs: List[CompeticaoSpec], workers: int) -> Dict[str, pd.DataFrame]:
+    """
+    Distribui as temporadas de todas as competições num pool de processos e
+    junta o resultado de cada competição em ordem de temporada.
 
-def run_all_etl() -> None:
+    As etapas são linha a linha e a ordenação final é estável, então a saída
+    é igual à do ETL sequencial, qualquer que seja a ordem de conclusão.
+    """
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {}
+        for spec in specs:
+            df_raw = ler_raw(spec)
+            # o formato da data é inferido no arquivo inteiro, como no ETL sequencial
+            formato = formato_data(df_raw)
+            futuros[spec.nome] = [
+                pool.submit(_transformar_particao, spec.nome, parte, formato)
+                for parte in _particoes(df_raw).values()
+            ]
+
+        for spec in specs:
+            partes = [futuro.result() for futuro in futuros[spec.nome]]
+            df = ordenar(pd.concat(partes, ignore_index=True), spec.ordenacao)
+            salvar_processado(spec, df)
+            resultados[spec.nome] = df
+
+    return resultados
+
+
+def run_all_etl(workers: int = 1) -> None:
     """
-    Executa o ETL para todos os campeonatos.
+    Executa o ETL para todos os campeonatos do registro.
+    Com workers > 1, usa um pool de processos (ver etl_paralelo).
     """
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
-    df_brasileirao = etl_brasileirao()
-    df_copa = etl_copa_brasil()
+    specs = list(COMPETICOES.values())
+    if workers > 1:
+        resultados = etl_paralelo(specs, workers)
+    else:
+        resultados = {spec.nome: etl_competicao(spec) for spec in specs}
 
     print()
     print("Resumo rápido:")
-    print(f"Brasileirão Série A: {len(df_brasileirao)} partidas tratadas")
-    print(f"Copa do Brasil: {len(df_copa)} partidas tratadas")
+    for spec in specs:
+        print(f"{spec.descricao}: {len(resultados[spec.nome])} partidas tratadas")
 
 
 if __name__ == "__main__":
-    run_all_etl()
+    parser = argparse.ArgumentParser(description="ETL dos dados de futebol.")
+    parser.add_argument("--workers", type=int, default=1, help="processos em paralelo (padrão: 1, sequencial)")
+    args = parser.parse_args()
+    run_all_etl(workers=args.workers)
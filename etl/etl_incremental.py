@@ -0,0 +1,218 @@
+# etl/etl_incremental.py
+
+"""
+ETL incremental dos dados de futebol.
+
+Em vez de reprocessar 20 anos de histórico a cada rodada nova, o ETL é
+particionado por temporada (ano_campeonato):
+- Para cada temporada dos arquivos brutos calculamos um hash do conteúdo
+- Hashes e marca d'água (último ano/rodada/data) ficam em data/processed/_etl_estado.json
+- Só as temporadas novas ou alteradas passam pela transformação e pelo
+  preenchimento de nulos; o resultado substitui essas temporadas nos arquivos
+  de data/processed e data/processed_refined e nas partições de data/partitioned
+
+Todas as etapas do ETL são linha a linha ou por temporada, então o resultado
+é idêntico ao de um reprocessamento completo. Sem estado salvo (primeira
+execução) ou com --completo, roda o ETL completo.
+
+Uso (a partir da raiz do repositório):
+    python -m etl.etl_incremental [--completo]
+"""
+
+import argparse
+import hashlib
+import json
+from typing import Dict
+import pandas as pd
+
+from etl.etl_futebol import (
+    COLUNA_PARTICAO,
+    COMPETICOES as REGISTRO_COMPETICOES,
+    PROCESSED_DIR,
+    RAW_DIR,
+    formato_data,
+    ordenar,
+    transformar,
+)
+from etl.etl_particionamento import particionar
+from etl.etl_tratamento_nulos import (
+    BR_REFINED_PATH,
+    CB_REFINED_PATH,
+    REFINED_DIR,
+    fill_brasileirao,
+    fill_copa,
+)
+
+
+ESTADO_PATH = PROCESSED_DIR / "_etl_estado.json"
+
+# Complemento do registro de competições do etl_futebol com as etapas de
+# tratamento de nulos e particionamento
+REFINAMENTO = {
+    "brasileirao": {
+        "refinado": BR_REFINED_PATH,
+        "preencher": fill_brasileirao,
+        "base_processada": "brasileirao_serie_a_clean",
+        "base_refinada": "brasileirao_refinado",
+    },
+    "copa_brasil": {
+        "refinado": CB_REFINED_PATH,
+        "preencher": fill_copa,
+        "base_processada": "copa_brasil_clean",
+        "base_refinada": "copa_brasil_refinado",
+    },
+}
+
+COMPETICOES = {
+    nome: {
+        "spec": competicao,
+        "raw": RAW_DIR / competicao.arquivo_raw,
+        "processado": PROCESSED_DIR / competicao.arquivo_processado,
+        "ordenacao": competicao.ordenacao,
+        **REFINAMENTO[nome],
+    }
+    for nome, competicao in REGISTRO_COMPETICOES.items()
+}
+
+
+def chave_particao(valor) -> str:
+    """
+    Nome da partição de uma linha: o ano como texto, ou "nulo".
+    """
+    numero = pd.to_numeric(valor, errors="coerce")
+    return "nulo" if pd.isna(numero) else str(int(numero))
+
+
+def chaves_particao(df: pd.DataFrame) -> pd.Series:
+    return df[COLUNA_PARTICAO].map(chave_particao)
+
+
+def hash_particoes(df_raw: pd.DataFrame) -> Dict[str, str]:
+    """
+    Hash do conteúdo bruto de cada temporada (sensível à ordem das linhas).
+    """
+    hashes = pd.util.hash_pandas_object(df_raw, index=False).to_numpy()
+    grupos = df_raw.groupby(chaves_particao(df_raw), sort=True).indices
+    return {
+        chave: hashlib.sha1(hashes[posicoes].tobytes()).hexdigest()
+        for chave, posicoes in grupos.items()
+    }
+
+
+def marca_dagua(df: pd.DataFrame) -> Dict:
+    """
+    Último ano, última rodada desse ano e última data presentes na saída.
+    """
+    if df.empty or df[COLUNA_PARTICAO].isna().all():
+        return {}
+    ultimo_ano = int(df[COLUNA_PARTICAO].max())
+    temporada = df[df[COLUNA_PARTICAO] == ultimo_ano]
+    marca = {COLUNA_PARTICAO: ultimo_ano}
+    if "rodada" in temporada.columns and temporada["rodada"].notna().any():
+        marca["rodada"] = int(temporada["rodada"].max())
+    if "data" in temporada.columns and temporada["data"].notna().any():
+        marca["data"] = str(pd.to_datetime(temporada["data"]).max().date())
+    return marca
+
+
+def carregar_estado() -> Dict:
+    if not ESTADO_PATH.exists():
+        return {}
+    return json.loads(ESTADO_PATH.read_text(encoding="utf-8"))
+
+
+def salvar_estado(estado: Dict) -> None:
+    ESTADO_PATH.write_text(json.dumps(estado, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _mesclar(existente: pd.DataFrame, novas: pd.DataFrame, trocadas: set, ordenacao: list) -> pd.DataFrame:
+    # remove as temporadas reprocessadas e recoloca na ordem da execução completa
+    manter = ~chaves_particao(existente).isin(trocadas)
+    df = pd.concat([existente[manter], novas], ignore_index=True)
+    return ordenar(df, ordenacao)
+
+
+def etl_competicao_incremental(nome: str, estado_anterior: Dict, completo: bool = False) -> Dict:
+    """
+    Atualiza os arquivos tratado e refinado de uma competição reprocessando
+    apenas as temporadas novas ou alteradas. Retorna o novo estado dela.
+    """
+    spec = COMPETICOES[nome]
+    print(f"Lendo {nome} de {spec['raw']}...")
+    df_raw = pd.read_csv(spec["raw"], compression="gzip")
+
+    hashes = hash_particoes(df_raw)
+    anteriores = estado_anterior.get("particoes", {})
+
+    saidas_existem = spec["processado"].exists() and spec["refinado"].exists()
+    if completo or not anteriores or not saidas_existem:
+        trocadas = set(hashes)
+    else:
+        trocadas = {p for p, h in hashes.items() if anteriores.get(p) != h}
+    removidas = set(anteriores) - set(hashes)
+    reprocessar_tudo = trocadas == set(hashes)
+
+    if not trocadas and not removidas:
+        print(f"{nome}: nenhuma temporada nova ou alterada")
+        return estado_anterior
+
+    print(f"{nome}: reprocessando {sorted(trocadas) if not reprocessar_tudo else 'todas as temporadas'}"
+          + (f", removendo {sorted(removidas)}" if removidas else ""))
+
+    # Etapa 1: dados tratados (data/processed)
+    df_raw_novo = df_raw[chaves_particao(df_raw).isin(trocadas)].reset_index(drop=True)
+    novas = transformar(spec["spec"], df_raw_novo, formato_data(df_raw))
+
+    if reprocessar_tudo:
+        processado = novas
+    else:
+        existente = pd.read_csv(spec["processado"], parse_dates=["data"])
+        processado = _mesclar(existente, novas, trocadas | removidas, spec["ordenacao"])
+    processado.to_csv(spec["processado"], index=False)
+    print(f"{nome}: tratado salvo em {spec['processado']} ({len(processado)} partidas)")
+
+    # Etapa 2: nulos (data/processed_refined), lendo o tratado como no ETL completo
+    df_tratado = pd.read_csv(spec["processado"])
+    if reprocessar_tudo:
+        # preencher altera o DataFrame recebido; df_tratado ainda vai ser particionado
+        refinado = spec["preencher"](df_tratado.copy())
+    else:
+        alvo = df_tratado[chaves_particao(df_tratado).isin(trocadas)].reset_index(drop=True)
+        novas_refinadas = spec["preencher"](alvo)
+        existente = pd.read_csv(spec["refinado"], parse_dates=["data"])
+        refinado = _mesclar(existente, novas_refinadas, trocadas | removidas, spec["ordenacao"])
+    refinado.to_csv(spec["refinado"], index=False)
+    print(f"{nome}: refinado salvo em {spec['refinado']}")
+
+    # Etapa 3: partições por temporada (só as reprocessadas)
+    anos = None if reprocessar_tudo else {int(p) for p in trocadas | removidas if p != "nulo"}
+    particionar(df_tratado, spec["base_processada"], anos, origem=spec["processado"])
+    particionar(pd.read_csv(spec["refinado"]), spec["base_refinada"], anos, origem=spec["refinado"])
+
+    return {"particoes": hashes, "marca_dagua": marca_dagua(processado)}
+
+
+def run_incremental_etl(completo: bool = False) -> None:
+    """
+    Executa o ETL incremental para todas as competições.
+    """
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    REFINED_DIR.mkdir(exist_ok=True)
+
+    estado = carregar_estado()
+    for nome in COMPETICOES:
+        estado[nome] = etl_competicao_incremental(nome, estado.get(nome, {}), completo)
+        # salva a cada competição: uma falha na seguinte não perde o progresso
+        salvar_estado(estado)
+
+    print()
+    print("Marca d'água:")
+    for nome in COMPETICOES:
+        print(f"{nome}: {estado[nome].get('marca_dagua')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL incremental por temporada.")
+    parser.add_argument("--completo", action="store_true", help="ignora o estado salvo e reprocessa tudo")
+    args = parser.parse_args()
+    run_incremental_etl(completo=args.completo)
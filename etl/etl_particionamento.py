@@ -0,0 +1,141 @@
+# etl/etl_particionamento.py
+
+"""
+Particionamento das saídas do ETL por temporada (ano_campeonato).
+
+Cada base vira um diretório em data/partitioned/<base>/ com um arquivo por
+temporada (ano_campeonato=<ano>.feather, ou .csv sem pyarrow) e um
+_manifesto.json com as temporadas, o número de partidas de cada uma, o
+formato e a assinatura (tamanho e SHA-1) do arquivo de origem. O backend lê o
+manifesto e carrega só as temporadas que a consulta pede; se a assinatura não
+bate com o CSV atual, as partições são ignoradas.
+
+As categorias da base final são definidas no DataFrame inteiro antes do
+corte, então todas as partições compartilham o mesmo dicionário e podem ser
+concatenadas sem perder o tipo categórico.
+
+Uso (a partir da raiz do repositório):
+    python -m etl.etl_particionamento
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import pandas as pd
+
+from etl.esquema import assinatura_arquivo
+from etl.etl_colunar import BRASILEIRAO_FINAL_CSV, tipar_brasileirao_final
+from etl.etl_futebol import BRASILEIRAO_PROCESSED, COLUNA_PARTICAO, COPA_PROCESSED, DATA_DIR, PROCESSED_DIR
+from etl.etl_tratamento_nulos import BR_REFINED_PATH, CB_REFINED_PATH
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # sem pyarrow as partições são gravadas em CSV
+    feather = None
+
+
+PARTITIONED_DIR = DATA_DIR / "partitioned"
+MANIFESTO = "_manifesto.json"
+
+# base particionada -> arquivo de origem
+BASES = {
+    "brasileirao_serie_a_clean": PROCESSED_DIR / BRASILEIRAO_PROCESSED,
+    "copa_brasil_clean": PROCESSED_DIR / COPA_PROCESSED,
+    "brasileirao_refinado": BR_REFINED_PATH,
+    "copa_brasil_refinado": CB_REFINED_PATH,
+    "brasileirao_final": BRASILEIRAO_FINAL_CSV,
+}
+
+
+def formato_particoes() -> str:
+    return "feather" if feather is not None else "csv"
+
+
+def caminho_particao(nome: str, ano: int, formato: str) -> Path:
+    return PARTITIONED_DIR / nome / f"{COLUNA_PARTICAO}={ano}.{formato}"
+
+
+def _ler_manifesto(diretorio: Path) -> Dict:
+    path = diretorio / MANIFESTO
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def particionar(
+    df: pd.DataFrame,
+    nome: str,
+    anos: Optional[Iterable[int]] = None,
+    origem: Optional[Path] = None,
+) -> Dict:
+    """
+    Grava as partições de `df` em data/partitioned/<nome>/.
+
+    Com `anos`, reescreve só essas temporadas (as que não tiverem mais linhas
+    em `df` são apagadas); sem `anos`, reescreve a base inteira. `origem` é o
+    arquivo de onde `df` foi lido; a assinatura dele vai para o manifesto.
+    Retorna o manifesto atualizado.
+    """
+    formato = formato_particoes()
+    diretorio = PARTITIONED_DIR / nome
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    manifesto = _ler_manifesto(diretorio)
+    if anos is None or manifesto.get("formato") != formato:
+        for antigo in diretorio.glob(f"{COLUNA_PARTICAO}=*"):
+            antigo.unlink()
+        manifesto = {"formato": formato, "coluna": COLUNA_PARTICAO, "particoes": {}}
+        anos = None
+
+    if "data" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["data"]):
+        df = df.assign(data=pd.to_datetime(df["data"], errors="coerce"))
+
+    grupos = df.groupby(COLUNA_PARTICAO, sort=True).indices
+    alvo = set(int(a) for a in grupos) if anos is None else set(int(a) for a in anos)
+
+    for ano in sorted(alvo):
+        path = caminho_particao(nome, ano, formato)
+        posicoes = grupos.get(ano)
+        if posicoes is None:
+            # temporada removida da base
+            path.unlink(missing_ok=True)
+            manifesto["particoes"].pop(str(ano), None)
+            continue
+
+        parte = df.iloc[posicoes].reset_index(drop=True)
+        if formato == "feather":
+            feather.write_feather(parte, path, compression="uncompressed")
+        else:
+            parte.to_csv(path, index=False)
+        manifesto["particoes"][str(ano)] = {"arquivo": path.name, "partidas": len(parte)}
+
+    manifesto["particoes"] = dict(sorted(manifesto["particoes"].items()))
+    manifesto["origem"] = assinatura_arquivo(origem) if origem is not None else None
+    (diretorio / MANIFESTO).write_text(json.dumps(manifesto, indent=2), encoding="utf-8")
+    return manifesto
+
+
+def ler_base(nome: str) -> pd.DataFrame:
+    """
+    Lê o arquivo de origem de uma base já com os tipos usados nas partições.
+    """
+    df = pd.read_csv(BASES[nome])
+    if nome == "brasileirao_final":
+        df = tipar_brasileirao_final(df)
+    return df
+
+
+def run_particionamento() -> None:
+    """
+    Particiona todas as bases que existirem em disco.
+    """
+    for nome, origem in BASES.items():
+        if not origem.exists():
+            print(f"{nome}: {origem} não encontrado, ignorando")
+            continue
+        manifesto = particionar(ler_base(nome), nome, origem=origem)
+        print(f"{nome}: {len(manifesto['particoes'])} temporadas em {PARTITIONED_DIR / nome}")
+
+
+if __name__ == "__main__":
+    run_particionamento()
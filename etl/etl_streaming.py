@@ -0,0 +1,180 @@
+# etl/etl_streaming.py
+
+"""
+ETL em streaming, com memória limitada, para arquivos brutos grandes.
+
+Em vez de carregar o .csv.gz inteiro, o arquivo é lido em blocos de linhas:
+- Cada bloco passa pela mesma transformação do ETL completo (limpeza, tipos,
+  resultado e pontos) e é gravado em arquivos temporários por temporada
+- No fim, cada temporada é lida, ordenada e anexada ao CSV de saída, em ordem
+  de temporada
+
+O tamanho dos blocos é calculado a partir de um teto de memória
+(--memoria-max-mb). A memória de trabalho fica limitada a um bloco ou a uma
+temporada, o que for maior.
+
+A saída é idêntica à do ETL completo: o formato da data é o inferido no
+início do arquivo, os tipos de cada coluna são unificados entre os blocos
+(ex.: int em um bloco e float em outro vira float, como na leitura do
+arquivo inteiro) e a ordenação estável dentro da temporada preserva a
+ordem original dos empates.
+
+Uso (a partir da raiz do repositório):
+    python -m etl.etl_streaming [--memoria-max-mb 256]
+"""
+
+import argparse
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+import pandas as pd
+
+from etl.etl_futebol import (
+    COLUNA_PARTICAO,
+    COMPETICOES,
+    PROCESSED_DIR,
+    RAW_DIR,
+    CompeticaoSpec,
+    formato_data,
+    ordenar,
+    transformar,
+)
+
+try:
+    import resource
+except ImportError:  # Windows: sem medição de pico de memória
+    resource = None
+
+
+MEMORIA_MAX_MB_PADRAO = 256
+
+# temporários criados pela transformação (cópias, máscaras, colunas novas)
+FATOR_TEMPORARIOS = 4
+AMOSTRA_LINHAS = 1000
+
+
+def pico_rss_mb() -> Optional[float]:
+    """
+    Pico de memória residente do processo atual (MB), quando disponível.
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / 2**20 if pico > 2**32 else pico / 1024
+
+
+def linhas_por_bloco(spec: CompeticaoSpec, memoria_max_mb: int) -> int:
+    """
+    Estima quantas linhas cabem no teto de memória a partir de uma amostra
+    do início do arquivo.
+    """
+    amostra = pd.read_csv(RAW_DIR / spec.arquivo_raw, compression="gzip", nrows=AMOSTRA_LINHAS)
+    if amostra.empty:
+        return AMOSTRA_LINHAS
+    tratada = transformar(spec, amostra.copy(), formato_data(amostra))
+    bytes_por_linha = (
+        amostra.memory_usage(deep=True).sum() + tratada.memory_usage(deep=True).sum()
+    ) / len(amostra)
+    return max(AMOSTRA_LINHAS, int(memoria_max_mb * 2**20 / (bytes_por_linha * FATOR_TEMPORARIOS)))
+
+
+def _tipo_unificado(tipos: List) -> object:
+    # mesma promoção que a leitura do arquivo inteiro faria
+    unicos = list(dict.fromkeys(tipos))
+    if len(unicos) == 1:
+        return unicos[0]
+    if all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in unicos):
+        return "float64"
+    return "object"
+
+
+def _formato_data_saida(sem_horario: bool) -> str:
+    # o to_csv do arquivo inteiro omite o horário só se todas as datas forem meia-noite
+    return "%Y-%m-%d" if sem_horario else "%Y-%m-%d %H:%M:%S"
+
+
+def etl_competicao_streaming(spec: CompeticaoSpec, memoria_max_mb: int = MEMORIA_MAX_MB_PADRAO) -> int:
+    """
+    Faz o ETL de uma competição em blocos. Retorna o número de partidas tratadas.
+    """
+    path = RAW_DIR / spec.arquivo_raw
+    bloco = linhas_por_bloco(spec, memoria_max_mb)
+    print(f"Lendo {spec.descricao} de {path} em blocos de {bloco} linhas...")
+
+    out_path = PROCESSED_DIR / spec.arquivo_processado
+    tmp_path = out_path.with_suffix(".csv.tmp")
+
+    with tempfile.TemporaryDirectory(prefix=f"etl_{spec.nome}_") as spill_dir:
+        spill_dir = Path(spill_dir)
+        pedacos: Dict[float, List[Path]] = defaultdict(list)
+        tipos: Dict[str, list] = defaultdict(list)
+        colunas: List[str] = []
+        formato = None
+        sem_horario = True
+
+        # Etapa 1: transforma bloco a bloco e separa por temporada
+        leitor = pd.read_csv(path, compression="gzip", chunksize=bloco)
+        for i, df in enumerate(leitor):
+            if formato is None:
+                formato = formato_data(df)
+            df = transformar(spec, df, formato)
+
+            if not colunas:
+                colunas = list(df.columns)
+            for col, tipo in df.dtypes.items():
+                tipos[col].append(tipo)
+            if "data" in df.columns:
+                datas = df["data"].dropna()
+                sem_horario = sem_horario and bool((datas == datas.dt.normalize()).all())
+
+            anos = pd.to_numeric(df[COLUNA_PARTICAO], errors="coerce")
+            for ano, posicoes in df.groupby(anos, dropna=False, sort=False).indices.items():
+                pedaco = spill_dir / f"{ano}_{i:06d}.pkl"
+                df.iloc[posicoes].to_pickle(pedaco)
+                pedacos[ano].append(pedaco)
+
+        tipos_saida = {col: _tipo_unificado(t) for col, t in tipos.items()}
+        formato_saida = _formato_data_saida(sem_horario)
+
+        # Etapa 2: uma temporada por vez, em ordem (sem ano por último, como no sort_values)
+        total = 0
+        anos_ordenados = sorted((a for a in pedacos if not pd.isna(a))) + [a for a in pedacos if pd.isna(a)]
+        with open(tmp_path, "w", encoding="utf-8", newline="") as saida:
+            pd.DataFrame(columns=colunas).to_csv(saida, index=False)
+            for ano in anos_ordenados:
+                df = pd.concat([pd.read_pickle(p) for p in pedacos[ano]], ignore_index=True)
+                df = df.astype(tipos_saida)
+                df = ordenar(df, spec.ordenacao)
+                df.to_csv(saida, index=False, header=False, date_format=formato_saida)
+                total += len(df)
+
+    tmp_path.replace(out_path)
+    print(f"{spec.descricao}: dados tratados salvos em {out_path}")
+    return total
+
+
+def run_streaming_etl(memoria_max_mb: int = MEMORIA_MAX_MB_PADRAO) -> None:
+    """
+    Executa o ETL em streaming para todas as competições do registro.
+    """
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+
+    totais = {nome: etl_competicao_streaming(spec, memoria_max_mb) for nome, spec in COMPETICOES.items()}
+
+    print()
+    print("Resumo rápido:")
+    for nome, spec in COMPETICOES.items():
+        print(f"{spec.descricao}: {totais[nome]} partidas tratadas")
+    pico = pico_rss_mb()
+    if pico is not None:
+        print(f"Pico de memória (RSS): {pico:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL em streaming com memória limitada.")
+    parser.add_argument("--memoria-max-mb", type=int, default=MEMORIA_MAX_MB_PADRAO,
+                        help="teto de memória para os blocos em processamento (MB)")
+    args = parser.parse_args()
+    run_streaming_etl(args.memoria_max_mb)
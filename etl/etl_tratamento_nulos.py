@@ -9,36 +9,65 @@ Objetivos:
 - Gerar uma versão refinada dos datasets em data/processed_refined
 """
 
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Optional
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 PROCESSED_DIR = DATA_DIR / "processed"
 REFINED_DIR = DATA_DIR / "processed_refined"
-REFINED_DIR.mkdir(exist_ok=True)
 
 # Caminhos
 BR_PATH = PROCESSED_DIR / "brasileirao_serie_a_clean.csv"
 CB_PATH = PROCESSED_DIR / "copa_brasil_clean.csv"
+BR_REFINED_PATH = REFINED_DIR / "brasileirao_refinado.csv"
+CB_REFINED_PATH = REFINED_DIR / "copa_brasil_refinado.csv"
 
-# Carregar
-df_brasileirao = pd.read_csv(BR_PATH)
-df_copa = pd.read_csv(CB_PATH)
 
+@contextmanager
+def _medir(tempos: Optional[Dict[str, float]], regra: str):
+    """
+    Acumula em tempos[regra] o tempo (s) gasto no bloco, se `tempos` for informado.
+    """
+    inicio = time.perf_counter()
+    yield
+    if tempos is not None:
+        tempos[regra] = tempos.get(regra, 0.0) + time.perf_counter() - inicio
 
-def fill_brasileirao(df: pd.DataFrame) -> pd.DataFrame:
+
+def preencher_datas_por_ano(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Datas faltantes recebem a data anterior (ou a seguinte) da mesma temporada.
+    """
+    df["data"] = pd.to_datetime(df["data"], errors="coerce")
+    anos = df["ano_campeonato"]
+    df["data"] = df["data"].groupby(anos).ffill().groupby(anos).bfill()
+    return df
+
+
+def preencher_mediana_por_ano(df: pd.DataFrame, col: str) -> pd.DataFrame:
+    """
+    Nulos de `col` recebem a mediana da temporada.
+    """
+    mediana = df.groupby("ano_campeonato")[col].transform("median")
+    df[col] = df[col].fillna(mediana)
+    return df
+
+
+def fill_brasileirao(df: pd.DataFrame, tempos: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     """Preenche valores ausentes do Brasileirão com base em lógicas simples."""
 
     # 1. Datas: preenche datas faltantes aproximando pela rodada
-    df["data"] = pd.to_datetime(df["data"], errors="coerce")
-    df["data"] = df.groupby("ano_campeonato")["data"].transform(
-        lambda x: x.fillna(method="ffill").fillna(method="bfill")
-    )
+    with _medir(tempos, "datas_ffill_bfill"):
+        df = preencher_datas_por_ano(df)
 
     # 2. Públicos: substitui nulos por mediana do ano
     for col in ["publico", "publico_max"]:
-        df[col] = df.groupby("ano_campeonato")[col].transform(lambda x: x.fillna(x.median()))
+        with _medir(tempos, f"{col}_mediana_ano"):
+            df = preencher_mediana_por_ano(df, col)
 
     # 3. Técnicos e árbitros: mantém nulos (não interfere na IA)
     # 4. Estatísticas técnicas: substitui por 0 (jogo sem registro, não significa zero real)
@@ -48,38 +77,66 @@ def fill_brasileirao(df: pd.DataFrame) -> pd.DataFrame:
         "defesas_visitante", "impedimentos_mandante", "impedimentos_visitante",
         "chutes_mandante", "chutes_visitante", "chutes_fora_mandante", "chutes_fora_visitante"
     ]
-    df[cols_estat] = df[cols_estat].fillna(0)
+    with _medir(tempos, "estatisticas_zero"):
+        df[cols_estat] = df[cols_estat].fillna(0)
 
     return df
 
 
-def fill_copa(df: pd.DataFrame) -> pd.DataFrame:
+def fill_copa(df: pd.DataFrame, tempos: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     """Preenche valores ausentes da Copa do Brasil."""
-    df["data"] = pd.to_datetime(df["data"], errors="coerce")
-    df["data"] = df.groupby("ano_campeonato")["data"].transform(
-        lambda x: x.fillna(method="ffill").fillna(method="bfill")
-    )
+    with _medir(tempos, "datas_ffill_bfill"):
+        df = preencher_datas_por_ano(df)
 
     for col in ["publico", "publico_max"]:
-        df[col] = df.groupby("ano_campeonato")[col].transform(lambda x: x.fillna(x.median()))
+        with _medir(tempos, f"{col}_mediana_ano"):
+            df = preencher_mediana_por_ano(df, col)
 
     estat = [
         "escanteios_mandante", "escanteios_visitante", "faltas_mandante", "faltas_visitante",
         "defesas_mandante", "defesas_visitante", "chutes_mandante", "chutes_visitante"
     ]
-    df[estat] = df[estat].fillna(0)
+    with _medir(tempos, "estatisticas_zero"):
+        df[estat] = df[estat].fillna(0)
 
     return df
 
 
-# Executar tratamento
-df_brasileirao_ref = fill_brasileirao(df_brasileirao)
-df_copa_ref = fill_copa(df_copa)
+def imprimir_relatorio_tempos(nome: str, tempos: Dict[str, float]) -> None:
+    total = sum(tempos.values())
+    print(f"{nome}: {total * 1000:.1f} ms")
+    for regra, segundos in tempos.items():
+        print(f"  {regra:<24} {segundos * 1000:8.2f} ms")
+
+
+def run_tratamento_nulos(salvar: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Lê os arquivos tratados, preenche os nulos e (opcionalmente) grava as
+    versões refinadas. Imprime o tempo de cada regra de preenchimento e
+    retorna os DataFrames refinados.
+    """
+    etapas = {
+        "brasileirao": (BR_PATH, BR_REFINED_PATH, fill_brasileirao),
+        "copa_brasil": (CB_PATH, CB_REFINED_PATH, fill_copa),
+    }
+
+    refinados = {}
+    for nome, (origem, destino, preencher) in etapas.items():
+        tempos: Dict[str, float] = {}
+        refinados[nome] = preencher(pd.read_csv(origem), tempos)
+        imprimir_relatorio_tempos(nome, tempos)
+
+    if salvar:
+        REFINED_DIR.mkdir(exist_ok=True)
+        for nome, (_, destino, _) in etapas.items():
+            refinados[nome].to_csv(destino, index=False)
+
+        print("Tratamento concluído!")
+        print(f"→ {BR_REFINED_PATH}")
+        print(f"→ {CB_REFINED_PATH}")
+
+    return refinados
 
-# Salvar versões refinadas
-df_brasileirao_ref.to_csv(REFINED_DIR / "brasileirao_refinado.csv", index=False)
-df_copa_ref.to_csv(REFINED_DIR / "copa_brasil_refinado.csv", index=False)
 
-print("Tratamento concluído!")
-print(f"→ {REFINED_DIR / 'brasileirao_refinado.csv'}")
-print(f"→ {REFINED_DIR / 'copa_brasil_refinado.csv'}")
+if __name__ == "__main__":
+    run_tratamento_nulos()
@@ -0,0 +1,16 @@
+"""
+Configuração dos testes (python -m pytest, a partir da raiz do repositório).
+
+backend/ entra no sys.path para que `import app...` funcione como no uvicorn,
+e a raiz para os pacotes etl e training.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+
+for caminho in (str(BACKEND_DIR), str(ROOT_DIR)):
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
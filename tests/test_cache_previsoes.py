@@ -0,0 +1,101 @@
+import pytest
+
+from app.config import MODELO
+from app.services.motor_inferencia import criar_motor
+from app.services.predict_service import cache_previsoes, prever_partida
+from app.services.registro_modelos import registro
+from app.utils.cache_lru import CacheLRU
+from app.utils.load_model import carregar_modelo
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+
+pytestmark = pytest.mark.skipif(not cache_previsoes.habilitado, reason="cache do /prever desligado")
+
+
+@pytest.fixture
+def motor():
+    motor = registro.ativo(MODELO).motor
+    cache_previsoes.limpar()
+    return motor
+
+
+def _contadores():
+    estatisticas = cache_previsoes.estatisticas()
+    return estatisticas["acertos"], estatisticas["falhas"]
+
+
+def test_entradas_equivalentes_usam_a_mesma_entrada(motor):
+    acertos, falhas = _contadores()
+    primeira = prever_partida(PARTIDA, motor)
+    # mesmo vetor de features: inteiro x float e campos que o modelo não usa
+    assert prever_partida({**PARTIDA, "rodada": 10.0, "publico_max": 40000.0}, motor) == primeira
+    assert prever_partida({**PARTIDA, "campo_extra": 1}, motor) == primeira
+    assert _contadores() == (acertos + 2, falhas + 1)
+
+
+def test_features_diferentes_nao_colidem(motor):
+    acertos, falhas = _contadores()
+    a = prever_partida(PARTIDA, motor)
+    b = prever_partida({**PARTIDA, "colocacao_mandante": 15}, motor)
+    assert a != b
+    assert _contadores() == (acertos, falhas + 2)
+
+
+def test_resultado_do_cache_nao_e_compartilhado(motor):
+    classe = motor.classes[0]
+    prever_partida(PARTIDA, motor)[classe] = -1.0
+    assert prever_partida(PARTIDA, motor)[classe] != -1.0
+
+
+def test_troca_de_modelo_invalida(motor):
+    prever_partida(PARTIDA, motor)
+    assert cache_previsoes.estatisticas()["itens"] == 1
+
+    novo = registro.carregar(MODELO).motor
+    assert novo.versao != motor.versao
+    assert cache_previsoes.estatisticas()["itens"] == 0
+
+    acertos, falhas = _contadores()
+    prever_partida(PARTIDA, novo)
+    assert _contadores() == (acertos, falhas + 1)
+
+
+def test_motor_sem_versao_nao_usa_cache(motor):
+    fora_do_registro = criar_motor(carregar_modelo(MODELO))
+    antes = cache_previsoes.estatisticas()
+    prever_partida(PARTIDA, fora_do_registro)
+    depois = cache_previsoes.estatisticas()
+    assert (depois["acertos"], depois["falhas"], depois["itens"]) == (antes["acertos"], antes["falhas"], antes["itens"])
+
+
+def test_previsao_sem_cache(motor):
+    # o modelo sombra prevê com usar_cache=False: não ocupa nem conta no cache
+    antes = cache_previsoes.estatisticas()
+    assert prever_partida(PARTIDA, motor, usar_cache=False) == prever_partida(PARTIDA, motor)
+    depois = cache_previsoes.estatisticas()
+    assert (depois["acertos"], depois["falhas"], depois["itens"]) == (antes["acertos"], antes["falhas"] + 1, antes["itens"] + 1)
+
+
+def test_lru_e_ttl(monkeypatch):
+    cache = CacheLRU(tamanho_max=2, ttl_s=10)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obter("a")
+    cache.guardar("c", 3)
+    # "b" era o menos usado
+    assert cache.obter("b") is None and cache.obter("a") == 1
+    assert cache.estatisticas()["remocoes"] == 1
+
+    monkeypatch.setattr("app.utils.cache_lru.time.monotonic", lambda: 1e12)
+    assert cache.obter("a") is None
+    assert cache.estatisticas()["expirados"] == 1
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.concorrencia import limites
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+
+
+def test_prever_ocupa_uma_vaga_por_requisicao():
+    # escolher o modelo não passa pelo limite do grupo: só a previsão conta
+    with TestClient(app) as cliente:
+        antes = limites["previsao"].concluidas
+        assert cliente.post("/prever", json=PARTIDA).status_code == 200
+        assert cliente.post("/prever/lote", json={"partidas": [PARTIDA] * 3}).status_code == 200
+        assert limites["previsao"].concluidas - antes == 2
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from app.utils import data_loader
+from etl import etl_particionamento
+from etl.etl_colunar import exportar_brasileirao_final
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def raiz(tmp_path, monkeypatch):
+    """Cópia reduzida de data/final numa pasta temporária, vista pelo data_loader."""
+    final_dir = tmp_path / "data" / "final"
+    final_dir.mkdir(parents=True)
+    df = pd.read_csv(data_loader._get_root_dir() / "data" / "final" / "brasileirao_final.csv")
+    df[df["ano_campeonato"] >= 2022].to_csv(final_dir / "brasileirao_final.csv", index=False)
+
+    monkeypatch.setattr(data_loader, "_get_root_dir", lambda: tmp_path)
+    monkeypatch.setattr(data_loader, "FORMATO_DADOS", "auto")
+    monkeypatch.setattr(etl_particionamento, "PARTITIONED_DIR", tmp_path / "data" / "partitioned")
+    data_loader._assinatura_base_final.cache_clear()
+    data_loader._manifesto_particoes.cache_clear()
+    yield tmp_path
+    data_loader._assinatura_base_final.cache_clear()
+    data_loader._manifesto_particoes.cache_clear()
+
+
+def _alterar_csv(csv_path):
+    # CSV regerado com a data de modificação antiga (como depois de um git checkout)
+    estado = os.stat(csv_path)
+    df = pd.read_csv(csv_path)
+    df[df["ano_campeonato"] == 2022].to_csv(csv_path, index=False)
+    os.utime(csv_path, (estado.st_atime - 3600, estado.st_mtime - 3600))
+    data_loader._assinatura_base_final.cache_clear()
+    data_loader._manifesto_particoes.cache_clear()
+
+
+def test_feather_so_e_usado_se_veio_do_csv_atual(raiz):
+    csv_path = data_loader._csv_base_final()
+    feather_path = exportar_brasileirao_final(csv_path, csv_path.with_suffix(".feather"))
+    assert data_loader._usar_feather(csv_path, feather_path)
+
+    _alterar_csv(csv_path)
+    assert not data_loader._usar_feather(csv_path, feather_path)
+
+
+def test_particoes_so_sao_usadas_se_vieram_do_csv_atual(raiz):
+    csv_path = data_loader._csv_base_final()
+    etl_particionamento.particionar(etl_particionamento.tipar_brasileirao_final(pd.read_csv(csv_path)),
+                                    "brasileirao_final", origem=csv_path)
+    manifesto = data_loader._manifesto_particoes()
+    assert manifesto is not None
+    assert sorted(manifesto["particoes"]) == ["2022", "2023", "2024"]
+
+    _alterar_csv(csv_path)
+    assert data_loader._manifesto_particoes() is None
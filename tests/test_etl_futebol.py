@@ -0,0 +1,87 @@
+import contextlib
+import io
+import shutil
+
+import pandas as pd
+import pytest
+
+from etl import etl_futebol, etl_incremental, etl_particionamento
+from etl.etl_futebol import COMPETICOES, run_all_etl
+from etl.etl_incremental import run_incremental_etl
+
+PROCESSADOS = etl_futebol.PROCESSED_DIR
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_saida_igual_aos_processados_versionados(workers, tmp_path, monkeypatch):
+    # com workers > 1 as temporadas vão para um pool de processos; a junção
+    # tem de reproduzir byte a byte a saída do ETL sequencial
+    monkeypatch.setattr(etl_futebol, "PROCESSED_DIR", tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_all_etl(workers=workers)
+
+    for spec in COMPETICOES.values():
+        obtido = (tmp_path / spec.arquivo_processado).read_bytes()
+        assert obtido == (PROCESSADOS / spec.arquivo_processado).read_bytes(), spec.nome
+
+
+def _apontar_incremental(raiz, raw, monkeypatch):
+    # todas as saídas do ETL incremental (tratado, refinado, partições, estado) dentro de `raiz`
+    processados, refinados = raiz / "processed", raiz / "processed_refined"
+    monkeypatch.setattr(etl_incremental, "PROCESSED_DIR", processados)
+    monkeypatch.setattr(etl_incremental, "REFINED_DIR", refinados)
+    monkeypatch.setattr(etl_incremental, "ESTADO_PATH", processados / "_etl_estado.json")
+    monkeypatch.setattr(etl_particionamento, "PARTITIONED_DIR", raiz / "partitioned")
+    for nome, spec in etl_incremental.COMPETICOES.items():
+        monkeypatch.setitem(etl_incremental.COMPETICOES, nome, {
+            **spec,
+            "raw": raw / spec["raw"].name,
+            "processado": processados / spec["processado"].name,
+            "refinado": refinados / spec["refinado"].name,
+        })
+
+
+def _arquivos(raiz):
+    return {
+        str(path.relative_to(raiz)): path.read_bytes()
+        for path in sorted(raiz.rglob("*"))
+        if path.is_file() and path.name != "_etl_estado.json"
+    }
+
+
+def test_incremental_igual_ao_completo(tmp_path, monkeypatch):
+    # temporada alterada e temporada removida: o incremental reprocessa só
+    # as duas e tem de chegar aos mesmos arquivos que o --completo
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for spec in etl_incremental.COMPETICOES.values():
+        shutil.copy(spec["raw"], raw / spec["raw"].name)
+
+    incremental, completo = tmp_path / "incremental", tmp_path / "completo"
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        with monkeypatch.context() as contexto:
+            _apontar_incremental(incremental, raw, contexto)
+            run_incremental_etl()
+
+            arquivo = raw / etl_incremental.COMPETICOES["brasileirao"]["raw"].name
+            df = pd.read_csv(arquivo, compression="gzip")
+            alterada = df.index[df["ano_campeonato"] == 2015][0]
+            df.loc[alterada, "publico"] = df.loc[alterada, "publico"] + 1
+            df[df["ano_campeonato"] != 2010].to_csv(arquivo, index=False, compression="gzip")
+
+            saida.truncate(0)
+            run_incremental_etl()
+            estado = etl_incremental.carregar_estado()
+        log_incremental = saida.getvalue()
+
+        with monkeypatch.context() as contexto:
+            _apontar_incremental(completo, raw, contexto)
+            run_incremental_etl(completo=True)
+
+    assert "brasileirao: reprocessando ['2015'], removendo ['2010']" in log_incremental
+    assert "copa_brasil: nenhuma temporada nova ou alterada" in log_incremental
+    assert "2010" not in estado["brasileirao"]["particoes"]
+    arquivos = _arquivos(incremental)
+    assert any(nome.startswith("partitioned") for nome in arquivos)
+    assert arquivos == _arquivos(completo)
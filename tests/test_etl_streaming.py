@@ -0,0 +1,23 @@
+import contextlib
+import io
+
+import pandas as pd
+
+from etl import etl_streaming
+from etl.etl_futebol import COMPETICOES, PROCESSED_DIR
+
+
+def test_saida_em_blocos_igual_ao_etl_completo(tmp_path, monkeypatch):
+    monkeypatch.setattr(etl_streaming, "PROCESSED_DIR", tmp_path)
+    # blocos pequenos, para que cada temporada fique espalhada em vários blocos
+    monkeypatch.setattr(etl_streaming, "AMOSTRA_LINHAS", 100)
+
+    for spec in COMPETICOES.values():
+        bloco = etl_streaming.linhas_por_bloco(spec, memoria_max_mb=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            total = etl_streaming.etl_competicao_streaming(spec, memoria_max_mb=1)
+
+        esperado = PROCESSED_DIR / spec.arquivo_processado
+        assert total > bloco
+        assert total == len(pd.read_csv(esperado))
+        assert (tmp_path / spec.arquivo_processado).read_bytes() == esperado.read_bytes(), spec.nome
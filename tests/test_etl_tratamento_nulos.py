@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from etl.etl_tratamento_nulos import (
+    BR_PATH,
+    BR_REFINED_PATH,
+    CB_PATH,
+    CB_REFINED_PATH,
+    fill_brasileirao,
+    fill_copa,
+    preencher_datas_por_ano,
+    preencher_mediana_por_ano,
+)
+
+
+def test_datas_preenchidas_dentro_da_temporada():
+    df = pd.DataFrame({
+        "ano_campeonato": [2020, 2020, 2020, 2021, 2021],
+        "data": [None, "2020-08-09", None, None, "2021-05-30"],
+    })
+    df = preencher_datas_por_ano(df)
+    # 2020: primeira linha pelo bfill, última pelo ffill; 2021 não herda de 2020
+    assert df["data"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2020-08-09", "2020-08-09", "2020-08-09", "2021-05-30", "2021-05-30",
+    ]
+
+
+def test_mediana_da_propria_temporada():
+    df = pd.DataFrame({
+        "ano_campeonato": [2020, 2020, 2020, 2021, 2021],
+        "publico": [10.0, np.nan, 30.0, 1000.0, np.nan],
+    })
+    df = preencher_mediana_por_ano(df, "publico")
+    assert df["publico"].tolist() == [10.0, 20.0, 30.0, 1000.0, 1000.0]
+
+
+def test_saida_igual_aos_refinados_versionados(tmp_path):
+    # as bases refinadas em data/processed_refined foram geradas pela versão
+    # anterior (groupby + transform com lambdas); a saída tem de ser a mesma
+    for origem, refinado, preencher in [
+        (BR_PATH, BR_REFINED_PATH, fill_brasileirao),
+        (CB_PATH, CB_REFINED_PATH, fill_copa),
+    ]:
+        tempos = {}
+        saida = tmp_path / refinado.name
+        preencher(pd.read_csv(origem), tempos).to_csv(saida, index=False)
+        assert saida.read_bytes() == refinado.read_bytes()
+        assert "datas_ffill_bfill" in tempos
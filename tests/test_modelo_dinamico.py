@@ -0,0 +1,115 @@
+"""
+API servindo um modelo treinado com as features dinâmicas (Elo, forma e gols
+recentes), como o gerado por `python -m training.treinar --dinamicas`.
+"""
+
+import json
+
+import joblib
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.config import FEATURES_JANELA, MODELO
+from app.main import app
+from app.services import aquecimento, registro_modelos
+from app.services.predict_service import EntradaIncompleta, prever_lote
+from app.services.registro_modelos import _carregar
+from app.services.registro_modelos import registro
+from app.utils import load_model
+from app.utils.data_loader import carregar_df_brasileirao
+from training.matriz import montar_matriz
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+TIMES = {"time_mandante": "Flamengo", "time_visitante": "Palmeiras", "data": "2024-06-01"}
+
+
+@pytest.fixture(scope="module")
+def modelo_dinamico(tmp_path_factory):
+    X, y = montar_matriz(carregar_df_brasileirao(), dinamicas=True)
+    modelo = Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression(max_iter=1000))]).fit(X, y)
+    diretorio = tmp_path_factory.mktemp("modelos")
+    # mesmos artefatos que training/treinar.py --dinamicas grava
+    metadados = {"entrada_obrigatoria": ["time_mandante", "time_visitante", "data"], "janela": FEATURES_JANELA}
+    for nome, janela in [("modelo_din", FEATURES_JANELA), ("modelo_outra_janela", FEATURES_JANELA + 1)]:
+        joblib.dump(modelo, diretorio / f"{nome}.pkl")
+        (diretorio / f"{nome}.json").write_text(json.dumps({**metadados, "janela": janela}), encoding="utf-8")
+    return diretorio
+
+
+@pytest.fixture
+def cliente(modelo_dinamico, monkeypatch):
+    monkeypatch.setattr(load_model, "MODELOS_DIR", modelo_dinamico)
+    monkeypatch.setattr(registro_modelos, "MODELOS_DIR", modelo_dinamico)
+    registro.ativar("modelo_din")
+    try:
+        # o aquecimento roda na subida, já com o modelo dinâmico ativo
+        with TestClient(app) as cliente:
+            yield cliente
+    finally:
+        monkeypatch.undo()
+        registro.ativar(MODELO)
+        registro.descarregar("modelo_din")
+
+
+def test_metadados_conferidos_na_carga(cliente):
+    assert registro.ativo(MODELO).motor.entrada_obrigatoria == ("time_mandante", "time_visitante", "data")
+    with pytest.raises(ValueError, match="janela"):
+        _carregar("modelo_outra_janela")
+
+
+def test_aquecimento_com_modelo_dinamico(cliente):
+    assert aquecimento.aquecer()["pronto"], aquecimento.estado["erro"]
+    assert cliente.get("/health/ready").status_code == 200
+
+
+def test_prever_exige_times_e_data(cliente):
+    resposta = cliente.post("/prever", json=PARTIDA)
+    assert resposta.status_code == 422
+    assert "time_mandante" in resposta.json()["detail"]
+
+    resposta = cliente.post("/prever", json={**PARTIDA, **TIMES})
+    assert resposta.status_code == 200
+    assert "elo_mandante" in resposta.json()["features"]
+
+    sem_data = {**PARTIDA, **TIMES, "data": None}
+    assert cliente.post("/prever", json=sem_data).status_code == 422
+
+
+def test_lote_exige_times_e_data(cliente):
+    completas = [{**PARTIDA, **TIMES}] * 3
+    resposta = cliente.post("/prever/lote", json={"partidas": completas + [PARTIDA]})
+    assert resposta.status_code == 422
+    assert resposta.json()["detail"].startswith("Partida 3")
+
+    resposta = cliente.post("/prever/lote", json={"partidas": completas})
+    assert resposta.status_code == 200
+    assert len(resposta.json()["probabilidades"]) == 3
+
+
+def test_lote_no_service(cliente):
+    motor = registro.ativo(MODELO).motor
+    with pytest.raises(EntradaIncompleta):
+        prever_lote([PARTIDA], motor)
+
+
+def test_time_desconhecido(cliente):
+    # com o modelo dinâmico o time desconhecido é erro; com o básico as features só informam
+    desconhecido = {**PARTIDA, **TIMES, "time_visitante": "Time Inexistente"}
+    assert cliente.post("/prever", json=desconhecido).status_code == 404
+    registro.ativar(MODELO)
+    resposta = cliente.post("/prever", json=desconhecido)
+    assert resposta.status_code == 200
+    assert "features" not in resposta.json()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from app.services.motor_inferencia import MotorLogistico, MotorPipeline, criar_motor
+from app.utils.data_loader import carregar_df_brasileirao
+from app.utils.load_model import carregar_modelo
+
+
+def _entradas(features) -> pd.DataFrame:
+    # mesmo preenchimento de NaN usado no notebook 06
+    X = carregar_df_brasileirao()[features].copy()
+    return X.fillna(X.median())
+
+
+def test_paridade_modelo_salvo():
+    modelo = carregar_modelo()
+    motor = MotorLogistico.de_pipeline(modelo)
+    X = _entradas(motor.features)
+
+    esperado = modelo.predict_proba(X)
+    np.testing.assert_allclose(motor.prever_proba(X.to_numpy(dtype=np.float64)), esperado, rtol=0, atol=1e-9)
+    assert motor.classes == [str(c) for c in modelo.classes_]
+
+
+def test_paridade_uma_partida():
+    modelo = carregar_modelo()
+    motor = MotorLogistico.de_pipeline(modelo)
+    for dados in _entradas(motor.features).head(50).to_dict("records"):
+        esperado = modelo.predict_proba(pd.DataFrame([dados]))[0]
+        np.testing.assert_allclose(motor.prever_proba(motor.vetor(dados)), esperado, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_paridade_pipeline_sintetico(n_classes):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(5, 3, size=(300, 4)), columns=list("abcd"))
+    y = rng.integers(0, n_classes, size=300)
+    modelo = Pipeline([("scaler", StandardScaler()), ("clf", LogisticRegression())]).fit(X, y)
+
+    motor = MotorLogistico.de_pipeline(modelo)
+    np.testing.assert_allclose(motor.prever_proba(X.to_numpy()), modelo.predict_proba(X), rtol=0, atol=1e-9)
+
+
+def test_modelo_sem_scaler_usa_pipeline():
+    X = pd.DataFrame({"a": [0.0, 1.0, 2.0, 3.0], "b": [1.0, 0.0, 1.0, 0.0]})
+    modelo = Pipeline([("clf", LogisticRegression())]).fit(X, [0, 0, 1, 1])
+    assert isinstance(criar_motor(modelo), MotorPipeline)
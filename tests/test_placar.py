@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.main import app
+
+PARTIDA = {
+    "ano_campeonato": 2024,
+    "rodada": 10,
+    "colocacao_mandante": 3,
+    "colocacao_visitante": 4,
+    "valor_equipe_titular_mandante": 100,
+    "valor_equipe_titular_visitante": 80,
+    "idade_media_titular_mandante": 27.5,
+    "idade_media_titular_visitante": 27.5,
+    "publico_max": 40000,
+}
+
+
+def _falhar(*args, **kwargs):
+    raise ValueError("Time não encontrado: Time Inexistente.")
+
+
+def test_erros_de_entrada_viram_404(monkeypatch):
+    monkeypatch.setattr(main, "prever_placar", _falhar)
+    monkeypatch.setattr(main, "prever_placares_lote", _falhar)
+    with TestClient(app) as cliente:
+        assert cliente.post("/prever/placar", json=PARTIDA).status_code == 404
+        assert cliente.post("/prever/placar/lote", json={"partidas": [PARTIDA]}).status_code == 404
+
+
+def test_lote_de_placares_acima_do_maximo(monkeypatch):
+    monkeypatch.setattr(main, "LOTE_TAMANHO_MAX", 2)
+    with TestClient(app) as cliente:
+        assert cliente.post("/prever/placar/lote", json={"partidas": [PARTIDA] * 3}).status_code == 413
+        resposta = cliente.post("/prever/placar/lote", json={"partidas": [PARTIDA] * 2})
+        assert resposta.status_code == 200
+        assert len(resposta.json()["gols_esperados"]) == 2
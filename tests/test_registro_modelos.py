@@ -0,0 +1,49 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.services import registro_modelos
+from app.services.motor_inferencia import MotorLogistico, MotorPipeline
+from app.services.registro_modelos import RegistroModelos
+from app.utils import load_model
+
+
+@pytest.fixture
+def registro():
+    registro = RegistroModelos()
+    avisos = []
+    registro.ao_mudar(lambda: avisos.append(1))
+    registro.avisos = avisos
+    return registro
+
+
+def test_ativar_avisa_uma_vez(registro):
+    registro.ativar("modelo_basico")
+    assert len(registro.avisos) == 1
+
+    registro.carregar("modelo_basico")
+    registro.ativar("modelo_basico")
+    assert len(registro.avisos) == 3
+
+
+def test_memoria_sao_os_arrays_do_motor(registro):
+    carregado = registro.carregar("modelo_basico")
+    motor = carregado.motor
+    assert isinstance(motor, MotorLogistico)
+    assert carregado.memoria_bytes == motor.pesos.nbytes + motor.intercepto.nbytes
+
+
+def test_memoria_do_motor_pipeline_inclui_o_modelo(registro, tmp_path, monkeypatch):
+    X = pd.DataFrame(np.random.default_rng(0).normal(size=(200, 3)), columns=list("abc"))
+    modelo = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, X["a"] > 0)
+    joblib.dump(modelo, tmp_path / "modelo_floresta.pkl")
+    monkeypatch.setattr(load_model, "MODELOS_DIR", tmp_path)
+    monkeypatch.setattr(registro_modelos, "MODELOS_DIR", tmp_path)
+
+    carregado = registro.carregar("modelo_floresta")
+    assert isinstance(carregado.motor, MotorPipeline)
+    # pelo menos os nós de cada árvore
+    nos = sum(arvore.tree_.__getstate__()["nodes"].nbytes for arvore in modelo.estimators_)
+    assert carregado.memoria_bytes >= nos > 0
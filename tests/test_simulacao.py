@@ -0,0 +1,34 @@
+import pytest
+
+from app.services import simulacao_service
+from app.services.simulacao_service import encerrar_pool, simular_temporada
+
+ANO = 2024
+SIMULACOES = 2000
+
+
+@pytest.fixture
+def blocos_pequenos(monkeypatch):
+    # blocos de 500 simulações: quatro blocos para dividir entre os processos
+    monkeypatch.setattr(simulacao_service, "SIMULACAO_BLOCO", 500)
+    monkeypatch.setattr(simulacao_service, "SIMULACAO_PROCESSOS_MAX", 2)
+    encerrar_pool()
+    yield
+    encerrar_pool()
+
+
+def _sem_tempo(resultado):
+    # o tempo e os processos usados são ecoados na resposta; o resto tem que bater
+    return {chave: valor for chave, valor in resultado.items() if chave not in ("tempo_ms", "processos")}
+
+
+def test_mesma_semente_mesmo_resultado(blocos_pequenos):
+    primeira = simular_temporada(ANO, ate_rodada=20, simulacoes=SIMULACOES, semente=7)
+    segunda = simular_temporada(ANO, ate_rodada=20, simulacoes=SIMULACOES, semente=7)
+    assert _sem_tempo(primeira) == _sem_tempo(segunda)
+
+
+def test_resultado_independe_do_numero_de_processos(blocos_pequenos):
+    sequencial = simular_temporada(ANO, ate_rodada=20, simulacoes=SIMULACOES, semente=7, processos=1)
+    paralela = simular_temporada(ANO, ate_rodada=20, simulacoes=SIMULACOES, semente=7, processos=2)
+    assert _sem_tempo(sequencial) == _sem_tempo(paralela)
@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.times_service import comparar_times, confronto
+from app.utils.data_loader import carregar_df_times
+
+TIME_A, TIME_B = "Flamengo", "Palmeiras"
+
+
+def test_estatisticas_iguais_ao_filtro_da_tabela():
+    df_times = carregar_df_times()
+    resposta = comparar_times(TIME_A, TIME_B)
+
+    for t in [TIME_A, TIME_B]:
+        jogos_time = df_times[df_times["time"] == t]
+        stats = resposta["estatisticas"][t]
+        assert stats["jogos"] == len(jogos_time)
+        assert stats["vitorias"] == int(jogos_time["vitoria"].sum())
+        assert stats["empates"] == int(jogos_time["empate"].sum())
+        assert stats["derrotas"] == int(jogos_time["derrota"].sum())
+        assert stats["gols_pro"] == pytest.approx(float(jogos_time["gols_pro"].mean()))
+
+
+def test_empates_totais_conta_so_os_confrontos_diretos():
+    df_times = carregar_df_times()
+    diretos = df_times[(df_times["time"] == TIME_A) & (df_times["adversario"] == TIME_B)]
+    resposta = comparar_times(TIME_A, TIME_B)
+
+    assert resposta["empates_totais"] == int(diretos["empate"].sum())
+    assert resposta["empates_totais"] == confronto(TIME_A, TIME_B)["totais"]["empates"]
+    # não é a soma dos empates de cada time contra todos os adversários
+    soma = sum(s["empates"] for s in resposta["estatisticas"].values())
+    assert resposta["empates_totais"] < soma
+
+
+def test_time_ausente():
+    with pytest.raises(ValueError, match="Time não encontrado"):
+        comparar_times(TIME_A, "Time Inexistente")
+    with pytest.raises(ValueError, match="Nenhum dado"):
+        comparar_times("Time Inexistente", "Outro Inexistente")